@@ -0,0 +1,79 @@
+import numpy as np
+
+from modules.global_data import JoystickCommand
+
+# curve 이름 → cubic 비율 k (expo 는 JSON 의 "expo" 값 사용)
+CURVE_EXPO = {
+    "linear": 0.0,
+    "cubic": 1.0,
+}
+DEFAULT_EXPO = 0.3
+
+
+class AxisProfile:
+    """Axis table of one controller, compiled into arrays indexed by axis number
+
+    Every mapped axis gets a command, deadzone, gain and response curve:
+
+        x = round(raw), 0 inside the deadzone
+        value = gain * ((1 - k) * x + k * x^3)
+
+    with k = 0 for "linear", 1 for "cubic" and the "expo" value (0 ~ 1) for
+    "expo". apply() evaluates all axes of a device in one NumPy pass.
+
+    Args:
+        controller: joystick_info.json["controllers"][model]
+        commands: Axis name → JoystickCommand (unlisted axes are ignored)
+        deadzone: Default deadzone, overridden by axis_profile.<axis>.deadzone
+        gain: Default gain, overridden by axis_profile.<axis>.gain
+        round_digit: Rounding of raw values (also the change threshold)
+    """
+
+    def __init__(self, controller, commands, deadzone, gain, round_digit=2):
+        axes = controller.get("axes", {})
+        profile = controller.get("axis_profile", {})
+        size = max(axes.values(), default=-1) + 1
+        self.round_digit = round_digit
+        self.commands = np.full(size, JoystickCommand.NONE, dtype=int)
+        self.deadzone = np.full(size, float(deadzone))
+        self.gain = np.full(size, float(gain))
+        self.expo = np.zeros(size)
+
+        for name, axis in axes.items():
+            command = commands.get(name)
+            if command is None:
+                continue
+            cfg = profile.get(name, {})
+            curve = cfg.get("curve", "linear")
+            if curve == "expo":
+                k = cfg.get("expo", DEFAULT_EXPO)
+            elif curve in CURVE_EXPO:
+                k = CURVE_EXPO[curve]
+            else:
+                raise ValueError(f"unknown curve '{curve}' for axis '{name}'")
+            if not 0.0 <= k <= 1.0:
+                raise ValueError(f"expo of axis '{name}' must be within 0 ~ 1 (got {k})")
+            self.commands[axis] = command
+            self.deadzone[axis] = cfg.get("deadzone", deadzone)
+            self.gain[axis] = cfg.get("gain", gain)
+            self.expo[axis] = k
+
+        self.mapped = self.commands != JoystickCommand.NONE
+
+    @property
+    def size(self):
+        return len(self.commands)
+
+    def axis_map(self):
+        """Axis number → command of the mapped axes"""
+        return {int(axis): int(self.commands[axis]) for axis in np.flatnonzero(self.mapped)}
+
+    def apply(self, raw):
+        """Apply deadzone, curve and gain to raw axis values (NaN: not reported yet)
+
+        Returns:
+            (x, value): rounded input after deadzone (for change detection) and command value
+        """
+        x = np.round(raw, self.round_digit)
+        x[np.abs(x) < self.deadzone] = 0.0
+        return x, self.gain * ((1.0 - self.expo) * x + self.expo * x ** 3)
@@ -0,0 +1,135 @@
+import bisect
+import threading
+import time
+from collections import Counter
+
+# latency histogram 구간 경계 [ms], 마지막 구간은 100 ms 초과
+LATENCY_BINS_MS = (0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 50, 100)
+
+# 이벤트 수신 시각 기준으로 측정하는 구간
+#   handle: worker 수신 → handle_event/dispatch_axes 처리 완료
+#   publish: 명령 입력 → snapshot 발행
+#   consume: 명령 입력 → 소비자가 get_snapshot() 으로 꺼냄
+LATENCY_STAGES = ("handle", "publish", "consume")
+
+
+class LatencyHistogram:
+    """Fixed-bin latency histogram (count, mean, max and bin-resolution percentiles)"""
+
+    def __init__(self, bins_ms=LATENCY_BINS_MS):
+        self.bins_ms = tuple(bins_ms)
+        self.counts = [0] * (len(self.bins_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, seconds):
+        ms = seconds * 1e3
+        self.counts[bisect.bisect_left(self.bins_ms, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, q):
+        """Upper bin edge [ms] below which q (0 ~ 1) of the samples fall (max for the last bin)"""
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n > 0:
+                return self.bins_ms[i] if i < len(self.bins_ms) else self.max_ms
+        return self.max_ms
+
+    def summary(self):
+        labels = [f"<={b}ms" for b in self.bins_ms] + [f">{self.bins_ms[-1]}ms"]
+        return {
+            'count': self.count,
+            'mean_ms': self.total_ms / self.count if self.count else None,
+            'max_ms': self.max_ms if self.count else None,
+            'p50_ms': self.percentile(0.5),
+            'p99_ms': self.percentile(0.99),
+            'hist': dict(zip(labels, self.counts)),
+        }
+
+
+class InputStats:
+    """Event rates, coalescing ratios and latency histograms of the joystick pipeline
+
+    Counting runs in the input worker, the consume latency in the consumer
+    thread; everything is guarded by one lock. Rates are per second since
+    the last reset().
+
+    Args:
+        log_interval: Period of the summary log [s] (None: no periodic log)
+    """
+
+    def __init__(self, log_interval=10.0):
+        self.log_interval = log_interval
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.t_start = time.perf_counter()
+            self._next_log = self.t_start + (self.log_interval or 0)
+            self.events = Counter()          # 이벤트 종류 → 수신 수
+            self.axis_events = Counter()     # axis 번호 → 수신한 motion 이벤트 수
+            self.axis_commands = Counter()   # axis 번호 → coalescing 후 나간 명령 수
+            self.snapshots = 0
+            self.snapshot_commands = 0
+            self.latency = {stage: LatencyHistogram() for stage in LATENCY_STAGES}
+
+    def count_event(self, kind, axis=None):
+        with self._lock:
+            self.events[kind] += 1
+            if axis is not None:
+                self.axis_events[axis] += 1
+
+    def count_axis_command(self, axis):
+        with self._lock:
+            self.axis_commands[axis] += 1
+
+    def count_snapshot(self, n_commands):
+        with self._lock:
+            self.snapshots += 1
+            self.snapshot_commands += n_commands
+
+    def add_latency(self, stage, seconds):
+        with self._lock:
+            self.latency[stage].add(seconds)
+
+    def summary(self):
+        """Snapshot of all counters as plain dicts (rates in 1/s, latencies in ms)"""
+        with self._lock:
+            elapsed = max(time.perf_counter() - self.t_start, 1e-9)
+            return {
+                'elapsed_s': elapsed,
+                'event_rate': {kind: n / elapsed for kind, n in self.events.items()},
+                'axis_event_rate': {axis: n / elapsed for axis, n in self.axis_events.items()},
+                # 명령 수 / 이벤트 수 (0.1 이면 이벤트 10개가 명령 1개로 합쳐짐)
+                'axis_coalescing': {axis: self.axis_commands[axis] / n for axis, n in self.axis_events.items()},
+                'snapshot_rate': self.snapshots / elapsed,
+                'commands_per_snapshot': self.snapshot_commands / self.snapshots if self.snapshots else 0.0,
+                'latency': {stage: hist.summary() for stage, hist in self.latency.items()},
+            }
+
+    def format_summary(self, summary=None):
+        s = summary or self.summary()
+        axes = ", ".join(f"{axis}: {rate:.1f}/s x{s['axis_coalescing'][axis]:.2f}"
+                         for axis, rate in sorted(s['axis_event_rate'].items()))
+        latency = ", ".join(f"{stage} p50 {h['p50_ms']} p99 {h['p99_ms']} max {h['max_ms']:.2f} ms (n={h['count']})"
+                            for stage, h in s['latency'].items() if h['count'])
+        return (f"[Joystick] {s['elapsed_s']:.0f}s: snapshot {s['snapshot_rate']:.1f}/s, "
+                f"axis [{axes}], latency [{latency}]")
+
+    def due(self, now=None):
+        """True once per log_interval (the periodic summary should be written)"""
+        if not self.log_interval:
+            return False
+        now = time.perf_counter() if now is None else now
+        if now < self._next_log:
+            return False
+        self._next_log = now + self.log_interval
+        return True
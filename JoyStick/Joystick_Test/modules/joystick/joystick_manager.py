@@ -2,29 +2,73 @@ import threading
 import pygame
 import time
 import os
+import numpy as np
 from modules.global_data import MODULE_PATH, JoystickCommand
 from modules.global_func import get_time
+from modules.joystick.axis_profile import AxisProfile
+from modules.joystick.input_stats import InputStats
 from pkg.utils.blackboard import GlobalBlackboard
 from pkg.utils.file_io import load_json
 from pkg.utils.logging import Logger
-from queue import Queue
+from queue import Queue, Empty, Full
+from typing import NamedTuple, Optional
 
 bb = GlobalBlackboard()
 
+
+class JoystickSnapshot(NamedTuple):
+    seq: int
+    timestamp: float    # 발행 시각 (time.perf_counter)
+    commands: list      # 이번 tick 의 (action, value): axis 는 action 별 마지막 값, button 은 edge 마다
+    axes: dict          # action → 현재 axis 값 (gain 적용)
+    buttons: dict       # action → 현재 눌림 여부
+    t_input: Optional[float] = None  # 이 snapshot 의 가장 오래된 명령을 worker 가 받은 시각 (명령 없으면 None)
+
+
 class JoystickManager():
     default_deadzone = 0.2 #0.18 
     default_gain = 0.2
-    POLL_INTERVAL= 1.0
     round_digit = 2
-    def __init__(self, *args, **kwargs):
+    target_model = "handheld"
+    # joystick_info.json 의 axis 이름 → command
+    AXIS_COMMANDS = {
+        "up_down": JoystickCommand.TILT_V,
+        "left_right": JoystickCommand.TILT_U,
+        "trigger": JoystickCommand.UPDATE_GAIN,
+    }
+    SNAPSHOT_RATE = 100.0       # snapshot 발행 주기 [Hz]
+    SNAPSHOT_QUEUE_SIZE = 8     # 소비자가 늦으면 오래된 snapshot 부터 버림
+    STATS_LOG_INTERVAL = 10.0   # 입력 통계 로그 주기 [s]
+    def __init__(self, snapshot_rate=None, queue_size=None, stats_log_interval=STATS_LOG_INTERVAL, *args, **kwargs):
         # 초기화
-        self.event_queue = Queue()  # FIFO 큐
-        self.event_list = []
-        self.connected = {}
+        self.stats = InputStats(stats_log_interval)
+        self.snapshot_rate = snapshot_rate
+        self.snapshot_queue = Queue(maxsize=queue_size or self.SNAPSHOT_QUEUE_SIZE)
+        self.latest_snapshot = None
+        self.snapshot_seq = 0
+        self.dropped_snapshots = 0
+        self.axis_values = {}       # action → 현재 axis 값 (gain 적용)
+        self.button_state = {}      # (instance_id, button) → 눌림 여부
+        self._pending_commands = [] # 다음 snapshot 에 들어갈 button/device 명령 (순서 유지)
+        self._pending_axes = {}     # 다음 snapshot 에 들어갈 axis 명령 (action 별 마지막 값)
+        self._next_publish = 0.0
+        self._pending_since = None  # pending 명령 중 가장 오래된 것의 입력 시각
+        self.connected = {}     # instance_id → pygame.joystick.Joystick
         self.dpad_map = {}
         self.thread = None
         self.axis_map = {}      # axis 번호 → action
-        self.prev_axis = {}     # axis 번호 → 이전 값 저장
+        self.profiles = {}      # controller 이름 → AxisProfile
+        self.axis_profile = None
+        self._raw_axes = {}     # instance_id → 마지막 raw axis 값 (NaN: 아직 안 들어옴)
+        self._prev_axes = {}    # instance_id → 마지막으로 보낸 axis 입력 (deadzone 적용 후)
+        self._dirty = set()     # 이번 poll 에 axis 가 움직인 instance_id
+        self._handlers = {
+            pygame.JOYDEVICEADDED: self._on_device_added,
+            pygame.JOYDEVICEREMOVED: self._on_device_removed,
+            pygame.JOYAXISMOTION: self._on_axis,
+            pygame.JOYBUTTONDOWN: self._on_button,
+            pygame.JOYBUTTONUP: self._on_button,
+        }
 
         self.load_model()
 
@@ -38,8 +82,6 @@ class JoystickManager():
                           pygame.JOYAXISMOTION,
                           pygame.JOYBUTTONDOWN,
                           pygame.JOYBUTTONUP])
-        
-        self.last_poll_time = time.time()
 
         self.scan_joysticks(initial=True)
         self.running = False
@@ -47,7 +89,7 @@ class JoystickManager():
 
     def load_model(self):
         joystick_info = load_json(os.path.join(MODULE_PATH, "joystick", "joystick_info.json"))
-        target_model = "handheld"
+        target_model = self.target_model
         self.joystick_deadzone = self.default_deadzone
         self.joystick_gain = self.default_gain
         max_delta = joystick_info.get("max_delta", {})
@@ -55,6 +97,8 @@ class JoystickManager():
         self.max_tilt_w_delta = max_delta.get("tilt_w")
         self.max_tilt_u_delta = max_delta.get("tilt_u")
         self.max_tilt_v_delta = max_delta.get("tilt_v")
+        if self.snapshot_rate is None:
+            self.snapshot_rate = joystick_info.get("snapshot_rate", self.SNAPSHOT_RATE)
         self.dpad_map = {
             joystick_info["controllers"][target_model]["buttons"]["R"]:JoystickCommand.VOICE_ON, # 3
             joystick_info["controllers"][target_model]["buttons"]["R_2"]:JoystickCommand.VOICE_ON, # 3
@@ -68,136 +112,292 @@ class JoystickManager():
             joystick_info["controllers"][target_model]["buttons"]["x5"]:JoystickCommand.ENABLE, # 3
             
         }
-        self.axis_map = {
-            joystick_info["controllers"][target_model]["axes"]["up_down"]: JoystickCommand.TILT_V, # 1
-            joystick_info["controllers"][target_model]["axes"]["left_right"]: JoystickCommand.TILT_U, # 0
-            joystick_info["controllers"][target_model]["axes"]["trigger"]: JoystickCommand.UPDATE_GAIN, # 0
+        # controller 마다 axis table 을 미리 배열로 만들어 두고 poll 마다 한 번에 적용
+        self.profiles = {
+            name: AxisProfile(controller, self.AXIS_COMMANDS, controller.get("deadzone", self.joystick_deadzone),
+                              controller.get("gain", self.joystick_gain), self.round_digit)
+            for name, controller in joystick_info["controllers"].items()
         }
+        self.axis_profile = self.profiles[target_model]
+        self.axis_map = self.axis_profile.axis_map()
 
 
     def scan_joysticks(self, initial=False):
-        """현재 연결된 조이스틱 스캔"""
+        """현재 연결된 조이스틱 스캔 (시작할 때와 개수가 어긋났을 때만)"""
         js_dict = {}
         for i in range(pygame.joystick.get_count()):
             js = pygame.joystick.Joystick(i)
             js.init()
-            js_dict[i] = js
+            js_dict[js.get_instance_id()] = js
 
         if initial:
             if js_dict:
                 print(f"초기 연결: {[js.get_name() for js in js_dict.values()]}")
             else:
                 print("초기 연결된 조이스틱 없음")
+            # 시작 직후 SDL 이 보내는 JOYDEVICEADDED 는 _connect() 에서 중복으로 걸러짐
+            for js in js_dict.values():
+                self._connect(js, "스캔")
 
         return js_dict
 
-
     def poll_joysticks(self):
-        if time.time() - self.last_poll_time > self.POLL_INTERVAL:
-            current = self.scan_joysticks()
-            # 새로 연결된 조이스틱
-            for jid, js in current.items():
-                if jid not in self.connected:
-                    self.connected[jid] = js
-                    Logger.debug(f"{get_time()}: [Joystick] 연결됨 (폴링): {js.get_name()}")
-                    bb.set("joystick/state/connect",True)
-                    
-            # 해제된 조이스틱
-            for jid, js in list(self.connected.items()):
-                if jid not in current:
-                    self.connected.pop(jid)
-                    Logger.debug(f"{get_time()}: [Joystick] 해제됨 (폴링): {js.get_name()}")
-                    bb.set("joystick/state/connect",False)
-            self.last_poll_time = time.time()
+        """Fallback for missed hot-plug events: rescan only when the device count changed
+
+        pygame.joystick.get_count() is cheap, so this runs on every poll;
+        normally JOYDEVICEADDED/REMOVED already keep the registry in sync.
+        """
+        if pygame.joystick.get_count() == len(self.connected):
+            return
+        current = self.scan_joysticks()
+        for instance_id, js in current.items():
+            if self._connect(js, "폴링"):
+                self._pending_commands.append((JoystickCommand.DISCONNECT, None))
+        for instance_id in [i for i in self.connected if i not in current]:
+            if self._disconnect(instance_id, "폴링"):
+                self._pending_commands.append((JoystickCommand.DISCONNECT, None))
+
+    def _connect(self, js, source):
+        """Register a joystick by instance_id (False if already registered)"""
+        instance_id = js.get_instance_id()
+        if instance_id in self.connected:
+            return False
+        self.connected[instance_id] = js
+        Logger.debug(f"{get_time()}: [Joystick] 연결됨 ({source}): {js.get_name()}")
+        bb.set("joystick/state/connect",True)
+        return True
+
+    def _disconnect(self, instance_id, source):
+        js = self.connected.pop(instance_id, None)
+        if js is None:
+            return False
+        Logger.debug(f"{get_time()}: [Joystick] 해제됨 ({source}): {js.get_name()}")
+        bb.set("joystick/state/connect",bool(self.connected))
+        self.release_device(instance_id)
+        return True
 
     def handle_event(self, event):
-        action, value = None, None
-        """이벤트별 처리 로직"""
-        if event.type == pygame.JOYDEVICEADDED:
-            js = pygame.joystick.Joystick(event.device_index)
-            js.init()
-            self.connected[event.device_index] = js
-            action = JoystickCommand.DISCONNECT
-            value = None
-            Logger.debug(f"{get_time()}: [Joystick] 연결됨 (이벤트): {js.get_name()}")
-
-            bb.set("joystick/state/connect",True)
-
-        elif event.type == pygame.JOYDEVICEREMOVED:
-            js = self.connected.pop(event.instance_id, None)
-            if js:
-                action = JoystickCommand.DISCONNECT
-                value = None
-                Logger.debug(f"{get_time()}: [Joystick] 해제됨 (이벤트): {js.get_name()}")
-                bb.set("joystick/state/connect",False)
-
-        elif event.type == pygame.JOYAXISMOTION:
-            event_axis = event.axis
-            action = self.axis_map.get(event_axis)
-            if action:
-                event_value = round(float(event.value), self.round_digit)
-                # print(event_value,self.joystick_deadzone)
-                if abs(event_value) < self.joystick_deadzone:
-                    event_value = 0.0
-
-                prev_value = self.prev_axis.get(event_axis, None)
-                if prev_value == None: # self.prev_axis[event_axis]
-                    prev_value = event_value
-                    value = 0
-                    action = None
-
-                elif prev_value != event_value:
-                    value = event_value * self.joystick_gain
-                else:
-                    value = 0
-                    action = None
-                self.prev_axis[event_axis]  = event_value
-
-        elif event.type == pygame.JOYBUTTONDOWN:
-            # print(event.button)
-            action = self.dpad_map.get(event.button)
-            if action:
-                value = True
-
-        elif event.type == pygame.JOYBUTTONUP:
-            action = self.dpad_map.get(event.button)
-            if action:
-                value = False
-
+        """이벤트별 처리 로직 (event.type → handler table)
+
+        Returns:
+            (action, value) of a device/button command, (None, None) otherwise;
+            axis motion is turned into commands by dispatch_axes()
+        """
+        self.stats.count_event(pygame.event.event_name(event.type),
+                               event.axis if event.type == pygame.JOYAXISMOTION else None)
+        handler = self._handlers.get(event.type)
+        action, value = handler(event) if handler is not None else (None, None)
         if action is not None:
-            # self.event_queue.put((action, value))
-            self.event_list.append((action, value))
-
-            #
+            self._pending_commands.append((action, value))
             return action,value
         else:
             return None, None
 
+    def _on_device_added(self, event):
+        # JOYDEVICEADDED 는 device_index, 이후 이벤트는 instance_id 로 구분
+        if not self._connect(pygame.joystick.Joystick(event.device_index), "이벤트"):
+            return None, None
+        return JoystickCommand.DISCONNECT, None
+
+    def _on_device_removed(self, event):
+        if not self._disconnect(event.instance_id, "이벤트"):
+            return None, None
+        return JoystickCommand.DISCONNECT, None
+
+    def _on_axis(self, event):
+        # 값만 기록, deadzone/curve/gain 은 dispatch_axes() 에서 한 번에 적용
+        if event.axis < self.axis_profile.size:
+            instance_id = getattr(event, "instance_id", 0)
+            raw = self._raw_axes.get(instance_id)
+            if raw is None:
+                raw = self._raw_axes[instance_id] = np.full(self.axis_profile.size, np.nan)
+                self._prev_axes[instance_id] = np.full(self.axis_profile.size, np.nan)
+            raw[event.axis] = event.value
+            self._dirty.add(instance_id)
+        return None, None
+
+    def _on_button(self, event):
+        action = self.dpad_map.get(event.button)
+        if not action:
+            return None, None
+        pressed = event.type == pygame.JOYBUTTONDOWN
+        key = (getattr(event, "instance_id", 0), event.button)
+        if self.button_state.get(key, False) == pressed:
+            return None, None # edge 가 아니면 (중복 DOWN/UP) 무시
+        self.button_state[key] = pressed
+        return action, pressed
+
+    def release_device(self, instance_id):
+        """분리된 조이스틱의 버튼은 떼고 그 axis 는 0 으로 (snapshot 에 남아 계속 움직이지 않도록)"""
+        for key in [key for key in self.button_state if key[0] == instance_id]:
+            if self.button_state.pop(key):
+                action = self.dpad_map.get(key[1])
+                self._pending_commands.append((action, False))
+        raw = self._raw_axes.pop(instance_id, None)
+        self._prev_axes.pop(instance_id, None)
+        self._dirty.discard(instance_id)
+        if raw is None:
+            return
+        # 이 조이스틱이 값을 보낸 axis 의 명령만 0 으로 (다른 조이스틱의 axis 는 유지)
+        profile = self.axis_profile
+        for command in np.unique(profile.commands[profile.mapped & ~np.isnan(raw)]):
+            action = int(command)
+            if self.axis_values.get(action, 0.0) != 0.0:
+                self.axis_values[action] = 0.0
+                self._pending_axes[action] = 0.0
+
+    def dispatch_axes(self):
+        """Turn the axis motion of this poll into commands, one vectorized pass per device
+
+        A command is emitted when the input (after rounding and deadzone)
+        differs from the last one sent; the first value of an axis only
+        initializes it.
+        """
+        profile = self.axis_profile
+        for instance_id in self._dirty:
+            x, values = profile.apply(self._raw_axes[instance_id])
+            prev = self._prev_axes[instance_id]
+            reported = profile.mapped & ~np.isnan(x)
+            changed = reported & ~np.isnan(prev) & (x != prev)
+
+            for axis in np.flatnonzero(reported):
+                self.axis_values[int(profile.commands[axis])] = float(values[axis])
+            for axis in np.flatnonzero(changed):
+                self._pending_axes[int(profile.commands[axis])] = float(values[axis])
+                self.stats.count_axis_command(int(axis))
+            prev[reported] = x[reported]
+        self._dirty.clear()
+
+    def process_events(self, events, t_input=None):
+        """Handle a batch of pygame events; axis motion is coalesced to the last value per axis
+
+        Args:
+            t_input: When the batch was received (time.perf_counter), for the latency stats
+        """
+        t_input = time.perf_counter() if t_input is None else t_input
+        for event in events:
+            self.handle_event(event)
+        self.poll_joysticks()
+        self.dispatch_axes()
+        if self._pending_since is None and (self._pending_commands or self._pending_axes):
+            self._pending_since = t_input
+
+    def button_actions(self):
+        buttons = {}
+        for (_, button), pressed in self.button_state.items():
+            action = self.dpad_map.get(button)
+            buttons[action] = buttons.get(action, False) or pressed
+        return buttons
+
+    def publish(self, now=None):
+        """Emit one snapshot once per snapshot period (call on every poll)
+
+        Returns:
+            The published JoystickSnapshot, None if the period has not passed yet
+        """
+        now = time.perf_counter() if now is None else now
+        if now < self._next_publish:
+            return None
+        self._next_publish += 1.0 / self.snapshot_rate
+        if self._next_publish < now:
+            self._next_publish = now + 1.0 / self.snapshot_rate # 밀린 tick 은 건너뜀
+
+        self.snapshot_seq += 1
+        commands = self._pending_commands + list(self._pending_axes.items())
+        t_input = self._pending_since if commands else None
+        self._pending_commands = []
+        self._pending_axes = {}
+        self._pending_since = None
+        snapshot = JoystickSnapshot(self.snapshot_seq, now, commands,
+                                    dict(self.axis_values), self.button_actions(), t_input)
+        self.latest_snapshot = snapshot
+        self.stats.count_snapshot(len(commands))
+        if t_input is not None:
+            self.stats.add_latency("publish", now - t_input)
+
+        while True:
+            try:
+                self.snapshot_queue.put_nowait(snapshot)
+                break
+            except Full:
+                try:
+                    self.snapshot_queue.get_nowait()
+                    self.dropped_snapshots += 1
+                except Empty:
+                    pass
+        return snapshot
+
+    def get_snapshot(self, timeout=None):
+        """Next snapshot in publish order (blocks up to timeout [s], None on timeout)"""
+        try:
+            snapshot = self.snapshot_queue.get(timeout is None or timeout > 0, timeout)
+        except Empty:
+            return None
+        if snapshot.t_input is not None:
+            self.stats.add_latency("consume", time.perf_counter() - snapshot.t_input)
+        return snapshot
+
+    def latest(self):
+        """Most recently published snapshot, without consuming the queue"""
+        return self.latest_snapshot
+
+    def get_stats(self):
+        """Event rates, coalescing ratios and latency histograms (see InputStats.summary)"""
+        summary = self.stats.summary()
+        summary['dropped_snapshots'] = self.dropped_snapshots
+        summary['queued_snapshots'] = self.snapshot_queue.qsize()
+        return summary
+
+    def reset_stats(self):
+        self.stats.reset()
+
     def start(self):
+        """Start the input worker (called from __init__; pygame events are read only by the worker)"""
         if not self.running:
             self.running = True
-            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread = threading.Thread(target=self.run, name="joystick", daemon=True)
             self.thread.start()
 
     def stop(self):
         if self.running:
             self.running = False
-            if self.thread:
+            if self.thread and self.thread is not threading.current_thread():
                 self.thread.join()
 
     def run(self):
+        """Worker: block on pygame events, coalesce them and publish one snapshot per period
+
+        The wait ends at the next publish deadline, so snapshots keep coming at
+        snapshot_rate while the stick is idle and an event is handled as soon
+        as SDL delivers it.
+        """
         while self.running:
             try:
-                time.sleep(100)                
+                timeout = max(1, int((self._next_publish - time.perf_counter()) * 1000))
+                event = pygame.event.wait(timeout)
+                t_input = time.perf_counter() # pygame 이벤트에는 시각이 없어서 worker 수신 시각을 입력 시각으로 사용
+                events = [] if event.type == pygame.NOEVENT else [event]
+                events.extend(pygame.event.get()) # 같이 쌓인 이벤트는 한 번에 처리
+                self.process_events(events, t_input)
+                if events:
+                    self.stats.add_latency("handle", time.perf_counter() - t_input)
+                self.publish()
+                if self.stats.due():
+                    Logger.info(self.stats.format_summary())
 
             except Exception as e:
-                self.stop()
+                Logger.error(f"{get_time()}: [Joystick] worker 종료: {e}")
+                self.running = False
+
 
-        
 if __name__ == "__main__":
     manager = JoystickManager()
-    manager.start()
     try:
-        manager.run()
+        while manager.running:
+            snapshot = manager.get_snapshot(timeout=0.5)
+            if snapshot is not None and snapshot.commands:
+                print(snapshot.seq, snapshot.commands)
     except KeyboardInterrupt:
-        manager.stop()
\ No newline at end of file
+        pass
+    finally:
+        manager.stop()
@@ -15,6 +15,7 @@ import time as _time
 from typing import Callable, Any, List, Dict
 
 from .logging import Logger
+from .rt_scheduler import DeadlineScheduler, CatchUp
 from .singleton import SingletonMeta
 
 class MyClass:
@@ -181,10 +182,14 @@ class TimeError:
         return str(self.error)
 
 
+##
+# @class PeriodicThread
+# @brief run a function periodically in a worker thread, paced by a DeadlineScheduler
 class PeriodicThread:
     __error_log: Dict[str, TimeError]
 
-    def __init__(self, function, *args, period: float = 0.01, stop_flag: Flagger = None, daemon=True, thread_name="", **kwargs):
+    def __init__(self, function, *args, period: float = 0.01, stop_flag: Flagger = None, daemon=True, thread_name="",
+                 spin_time: float = 0.0, catch_up: CatchUp = CatchUp.SKIP, **kwargs):
         self.function, self.args, self.kwargs = function, args, kwargs
         self.thread_name = thread_name
         self.period = period
@@ -192,15 +197,15 @@ class PeriodicThread:
         self.last_result = None
         self.__error_log = {}
 
-        self.__periodic_event = threading.Event()
+        self.scheduler = DeadlineScheduler(period, spin_time=spin_time, catch_up=catch_up)
         self.__thread_worker = threading.Thread(target=self.__worker, daemon=daemon)
-        self.__thread_periodic = threading.Thread(target=self.__periodic_event_loop, daemon=daemon)
 
     def __worker(self):
+        self.scheduler.start()
         while not self.stop_flag():
-            if not self.__periodic_event.wait(self.period):  # set timeout to prevent iternal lock
-                continue
-            self.__periodic_event.clear()
+            self.scheduler.wait()
+            if self.stop_flag():
+                break
             try:
                 self.last_result = self.function(*self.args, **self.kwargs)
             except Exception as e:
@@ -212,25 +217,20 @@ class PeriodicThread:
                 else:
                     self.__error_log[e_str].update_time()
 
-    def __periodic_event_loop(self):
-        periodic_waiter = threading.Event()
-        while not self.stop_flag():
-            periodic_waiter.wait(self.period)
-            self.__periodic_event.set()
-
     def start(self):
         self.__thread_worker.start()
-        self.__thread_periodic.start()
 
     def join(self):
         self.__thread_worker.join()
-        self.__thread_periodic.join()
 
     def stop(self):
         self.stop_flag.up()
 
     def is_alive(self):
-        return self.__thread_worker.is_alive() or self.__thread_periodic.is_alive()
+        return self.__thread_worker.is_alive()
+
+    def get_jitter_stats(self):
+        return self.scheduler.get_stats()
 
 
 ###############################
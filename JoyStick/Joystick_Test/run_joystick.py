@@ -1,29 +1,17 @@
-import time
-
-import pygame
-
-from modules.joystick.joystick_manager import JoystickManager  
+from modules.joystick.joystick_manager import JoystickManager
 
 if __name__ == '__main__':
- 
-    joystick_manager = JoystickManager()
-
-    joystick_manager.start()
-    
-    motion_events = {}
-
-    while True:
-        if True:
-            time.sleep(0.01)
-            for event in pygame.event.get():
-                print(event)
-                if event.type == pygame.JOYAXISMOTION:
-                    motion_events[event.axis] = event
-                else:
-                    action, value = joystick_manager.handle_event(event)
-
-            for axis, latest_event in motion_events.items():
-                action, value = joystick_manager.handle_event(latest_event)
 
+    # pygame 이벤트는 JoystickManager 의 worker 가 읽음 (생성 시 시작), main thread 는 snapshot 만 소비
+    joystick_manager = JoystickManager()
 
-            motion_events.clear()
+    try:
+        # timeout 으로 깨어나서 worker 종료 / Ctrl+C 를 확인 (Windows 에서는 blocking get 중 Ctrl+C 가 안 먹음)
+        while joystick_manager.running:
+            snapshot = joystick_manager.get_snapshot(timeout=0.5)
+            if snapshot is not None and snapshot.commands:
+                print(snapshot.seq, snapshot.commands, snapshot.axes)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        joystick_manager.stop()
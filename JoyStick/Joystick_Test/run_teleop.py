@@ -0,0 +1,110 @@
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+
+from modules.joystick.joystick_manager import JoystickManager
+
+# 손 제어 코드: Test_code (PCAN 직접) / test_gRPC (Hand gRPC 서버 경유)
+REPO_PATH = Path(__file__).resolve().parent.parent.parent
+GESTURE_FILE = REPO_PATH / "Test_code" / "gestures.json"
+
+
+def make_bridge(joystick_manager, args):
+    from gesture_library import GestureLibrary
+    from teleop_bridge import TeleopBridge, limits_from_gestures
+
+    # 관절 범위는 제스처 파일의 자세들이 쓰는 범위로 제한
+    lower, upper = limits_from_gestures(GestureLibrary(str(GESTURE_FILE)), margin=args.margin)
+    return TeleopBridge(joystick_manager, freq=args.freq, max_speed=args.max_speed,
+                        lower=lower, upper=upper, require_enable=args.enable)
+
+
+def run_pcan(joystick_manager, args):
+    sys.path.insert(0, str(REPO_PATH / "Test_code"))
+    from pcan_handler import PCANHandler, ServoStatus, ControlMode
+    from sim_hand import start_if_virtual
+    from estop import EmergencyStop
+
+    sim_hand = start_if_virtual() # PCAN_INTERFACE=virtual 이면 시뮬레이션 손 사용
+    pcan = PCANHandler()
+    if not pcan.is_connected():
+        print("Failed to connect to PCAN")
+        return
+    pcan.set_hand_status(ServoStatus.ON, ControlMode.POSITION)
+    time.sleep(0.5)
+    pcan.start_reader()
+
+    # Ctrl+C: 먼저 servo-off, 그 다음 KeyboardInterrupt 로 종료
+    estop = EmergencyStop([pcan])
+    estop.install_signal_handler(chain=True)
+    bridge = make_bridge(joystick_manager, args)
+    print(f"Teleop (PCAN) at {args.freq:.0f} Hz, Ctrl+C to stop")
+    try:
+        bridge.run(pcan, args.duration)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        estop.restore_signal_handler()
+        pcan.close()
+        if sim_hand is not None:
+            sim_hand.stop()
+
+
+def run_grpc(joystick_manager, args):
+    sys.path.insert(0, str(REPO_PATH / "test_gRPC"))
+    import grpc
+    import Hand_pb2
+    import Hand_pb2_grpc
+    from hand_msg import pack_joints, unpack_joints
+
+    bridge = make_bridge(joystick_manager, args)
+    start = [None]
+    started = threading.Event()
+
+    def commands():
+        # 서버의 첫 피드백 (측정 자세) 에서 시작
+        started.wait()
+        for cmd in bridge.setpoints(start[0], args.duration):
+            yield Hand_pb2.ControlCommand(setpoint=Hand_pb2.JointSetpoint(positions=pack_joints(cmd)))
+
+    print(f"Teleop (gRPC {args.grpc}, hand {args.hand}) at {args.freq:.0f} Hz, Ctrl+C to stop")
+    with grpc.insecure_channel(args.grpc) as channel:
+        stub = Hand_pb2_grpc.HandStub(channel)
+        try:
+            for feedback in stub.StreamControl(commands(), metadata=(('hand', str(args.hand)),)):
+                if start[0] is None:
+                    start[0] = unpack_joints(feedback.positions)
+                    started.set()
+        except KeyboardInterrupt:
+            pass # 서버는 마지막 setpoint 를 유지
+        finally:
+            bridge.stop()
+            started.set()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Joystick teleoperation of the hand")
+    parser.add_argument('--grpc', metavar='ADDRESS', help="stream through the Hand gRPC server (e.g. localhost:50051) "
+                                                          "instead of PCAN")
+    parser.add_argument('--hand', type=int, default=0, help="hand index on the gRPC server")
+    parser.add_argument('--freq', type=float, default=100.0, help="streaming rate [Hz]")
+    parser.add_argument('--max-speed', type=float, default=3000.0, help="joint speed at full deflection [units/s]")
+    parser.add_argument('--margin', type=float, default=0.0, help="extra joint range beyond the gesture poses")
+    parser.add_argument('--enable', action='store_true', help="move only while the ENABLE button is held")
+    parser.add_argument('--duration', type=float, default=None, help="stop after this many seconds")
+    args = parser.parse_args()
+
+    joystick_manager = JoystickManager()
+    try:
+        if args.grpc:
+            run_grpc(joystick_manager, args)
+        else:
+            run_pcan(joystick_manager, args)
+    finally:
+        joystick_manager.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,14 @@
 from enum import Enum, auto
 import time
 from pcan_handler import PCANHandler, ServoStatus, ControlMode
-import keyboard 
+from hand_filter import HandFilter, FilterMode, alpha_to_tau
+from trajectory import TrajectoryCompiler, TrajectoryPlayer, Profile
+from rt_scheduler import DeadlineScheduler, CatchUp
+from sim_hand import start_if_virtual
+from flight_recorder import FlightRecorder
+from operator_input import OperatorInput, OperatorEvent
+from gesture_library import GestureLibrary
+from estop import EmergencyStop
 
 # 1. 상태 정의
 class HandState(Enum):
@@ -13,124 +20,48 @@ class HandState(Enum):
     INITIAL = auto()    # 동작 완료 후 이니셜 자세로 복귀
     EMERGENCY = auto()  # 비상 정지
 
+# 상태별로 받는 조작 키 (ESC 와 메뉴 입력은 항상 받음)
+STATE_KEYS = {
+    HandState.READY: (OperatorEvent.ENTER,),
+    HandState.COMPLETED: (OperatorEvent.ENTER, OperatorEvent.RESET),
+}
+
 # prameter setting
-alpha           = 0.05 # alpha: 0.0 ~ 1.0 (1.0에 가까울수록 반응이 빠르고, 0에 가까울수록 부드러움)
+alpha           = 0.05 # alpha: 0.0 ~ 1.0 (1.0에 가까울수록 반응이 빠르고, 0에 가까울수록 부드러움), 50 Hz 기준
 threshold       = 50.0 # Convergence threshold
 Sampling_freq   = 50
-
-GESTURES = {
-    # 1. 원통형 물체 옆으로 잡기
-    'Side Grasp': {
-        'ready': {
-            2: [3758, -3723, 191, 1016],  3: [-192, 390, 527, 1200],
-            4: [-19, 675, 472, 749],     5: [509, 748, 498, 268]
-        },
-        'set': {
-            2: [3672, -3745, 1155, 2402], 3: [142, 1471, 2624, 1298],
-            4: [133, 2385, 1541, 2263],  5: [214, 2235, 2106, 1523]
-        }
-    },
-
-    # 2. 넓은 원통 물체 위에서 아래로 잡기
-    'Top Grasp': {
-        'ready': {
-            2: [3563, -2599, -1004, 811], 3: [-186, 1218, 174, 1074],
-            4: [76, 1008, 212, 1367],     5: [1824, 1313, 614, -348]
-        },
-        'set': {
-            2: [2405, -2683, 794, 2079],  3: [-156, 1232, 2101, 1191],
-            4: [81, 1288, 1601, 2054],    5: [1903, 3039, 1841, 893]
-        }
-    },
-
-    # 3. 2점 핀치 (준비자세는 Paper로 대체 가능하도록 0 설정)
-    'Pinch_2pt': {
-        'ready': {
-            2: [0, 0, 0, 0], 3: [0, 0, 0, 0], 4: [0, 0, 0, 0], 5: [0, 0, 0, 0]
-        },
-        'set': {
-            2: [2828, -3215, 1986, 1687], 3: [-92, 1925, 2768, 1286],
-            4: [82, -110, 765, 1843],     5: [78, -175, 1416, 816]
-        }
-    },
-
-    # 4. 3점 핀치
-    'Pinch_3pt': {
-        'ready': {
-            2: [0, 0, 0, 0], 3: [0, 0, 0, 0], 4: [0, 0, 0, 0], 5: [0, 0, 0, 0]
-        },
-        'set': {
-            2: [3532, -3110, 890, 3608],  3: [-594, 1971, 3615, 1200],
-            4: [900, 2162, 2650, 2028],   5: [1160, -678, 1229, 732]
-        }
-    },
-
-    # 5. 카드 잡기
-    'Card Grasp': {
-        'ready': {
-            2: [1998, -3882, 2696, 1579], 3: [882, 1197, 4129, 983],
-            4: [601, 3643, 4176, 2328],   5: [150, 4121, 4438, 633]
-        },
-        'set': {
-            2: [2501, -3774, 2720, 2235], 3: [867, 1335, 4699, 1094],
-            4: [600, 3680, 4190, 2352],   5: [149, 4148, 4500, 726]
-        }
-    },
-
-    # 10. Push 동작
-    'Push': {
-        'ready': { # push_start
-            2: [2036, -157, 4766, 2894],  3: [213, -1143, 2518, 1951],
-            4: [512, 3133, 4080, 2601],   5: [99, 2894, 3939, 2913]
-        },
-        'set': { # push_end
-            2: [2242, -191, 4766, 2898],  3: [382, 108, 545, 25],
-            4: [515, 3130, 4077, 2601],   5: [101, 2906, 3940, 2913]
-        }
-    },
-
-    # 11. Hook 동작
-    'Hook': {
-        'ready': { # hook_start
-            2: [1569, -281, 4778, 2896],  3: [267, -676, 736, 925],
-            4: [530, 3131, 4078, 2601],   5: [101, 2893, 3940, 2916]
-        },
-        'set': { # hook_end
-            2: [1574, -294, 4779, 2897],  3: [430, -532, 4639, 1733],
-            4: [535, 3132, 4079, 2601],   5: [102, 2896, 3941, 2915]
-        }
-    },
-
-    # 12. INITIAL 동작
-    'Initial': {
-        'set': { # hook_end
-            2: [0, 0, 0, 0], 3: [0, 0, 0, 0], 4: [0, 0, 0, 0], 5: [0, 0, 0, 0]
-        }
-    }
-}
+LPF_tau         = alpha_to_tau(alpha, 50) # alpha 를 시간상수[s]로 환산 → Sampling_freq 를 바꿔도 응답 속도 유지
+LPF_mode        = FilterMode.FIRST_ORDER  # FIRST_ORDER / SECOND_ORDER / RATE_LIMIT
+Use_trajectory  = True                    # True: 미리 계산한 궤적 테이블 재생, False: LPF로 목표 추종
+Traj_profile    = Profile.TRAPEZOID       # TRAPEZOID / MIN_JERK
+Traj_v_max      = 5000.0                  # 관절 최대 속도 [unit/s]
+Traj_a_max      = 20000.0                 # 관절 최대 가속도 [unit/s^2]
+Spin_time       = 0.0003                  # deadline 직전 busy-wait 구간 [s]
+Use_recorder    = False                   # True: 매 tick 명령/측정 위치를 LOG/hand_<date>.bin 에 기록 (flight_recorder.load_session 으로 분석)
+
+# 제스처 라이브러리 (gestures.json, 파일 수정 시 자동 reload) 와 궤적 compiler: 실행 시 __main__ 에서 생성
+# (import 만으로 파일 watch thread 가 생기지 않도록)
+gestures = None
+traj_compiler = None
 
 current_state = HandState.IDLE
-INITIAL_POS = GESTURES['Initial']['set']
-filtered_positions = {id: [0.0, 0.0, 0.0, 0.0] for id in range(2, 6)}
-gesture_map = list(GESTURES.keys())
+hand_filter = HandFilter(LPF_mode, dt=1/Sampling_freq, tau=LPF_tau)
+traj_player = TrajectoryPlayer()
 
 # for Emergency stop
-def emergency_reset(pcan, target_positions, filtered_positions):
+def emergency_reset(estop):
+    # servo-off 는 ESC hook / Ctrl+C 에서 이미 송신됨 (tick 대기 없음), 여기서는 결과만 출력
     print("\n!!! EMERGENCY STOP ACTIVATED !!!")
-    for can_id in range(2, 6):
-        current_pos_int = [int(p) for p in filtered_positions[can_id]]
-        target_positions[can_id] = current_pos_int
-        try:
-            pcan.set_target_values(can_id, current_pos_int)
-        except Exception as e:
-            print(f"Error setting target values for ID {can_id}: {e}")
-    
-    pcan.set_hand_status(ServoStatus.OFF, ControlMode.POSITION)
-    print("Torque disabled. Please restart the program to re-enable.")
+    if not estop.records:
+        estop.trigger('loop')
+    record = estop.last()
+    print(f"Torque disabled ({record.source}): sent {record.sent_us:.0f} us, confirmed {record.confirmed_us:.0f} us")
+    print("Please restart the program to re-enable.")
     return True
 
 # for Select Menu
 def show_menu():
+    gesture_map = gestures.names()
     print("\n" + "="*30)
     print(f"{' [ Gesture Menu ] ':-^30}") # 가운데 정렬 스타일
     for i, name in enumerate(gesture_map, 1):
@@ -141,19 +72,20 @@ def show_menu():
     result = input("Select Gesture: ").strip()
     return result
 
+# select next target pose (trajectory: 현재 명령 위치에서 시작하는 테이블 로드)
+def set_motion(name, pose, cmd):
+    if Use_trajectory:
+        traj_player.load(traj_compiler.compile(name, pose, cmd))
+    return gestures.get(name, pose)
+
 # for smooth moving
-def Set_position_LPF(filtered_positions, target_positions) : 
-    max_error = 0
-    for can_id in range(2, 6):
-        for i in range(4):
-            filtered_positions[can_id][i] = (alpha * target_positions[can_id][i]) + \
-                                            ((1 - alpha) * filtered_positions[can_id][i])
-            max_error += abs(target_positions[can_id][i] - filtered_positions[can_id][i])\
-            
-    return max_error
+def Set_position_LPF(hand_filter, target_positions) : 
+    result = hand_filter.step(target_positions)
+    return result.error_sum
 
 # Pcan initializing
 def Pcan_init(ServoStatus, Control_Mode):
+    start_if_virtual() # PCAN_INTERFACE=virtual 이면 시뮬레이션 손 사용
     pcan = PCANHandler()
     if not pcan.is_connected():
         print("Failed to connect to PCAN")
@@ -162,116 +94,153 @@ def Pcan_init(ServoStatus, Control_Mode):
     pcan.set_hand_status(ServoStatus, Control_Mode), time.sleep(0.5)
     # clear Receive buf
     while pcan.receive_frame(timeout=.01): pass
+    # 이후 피드백은 reader thread 가 CAN ID별 최신 프레임으로 저장
+    pcan.start_reader()
     return pcan
 
-
-def time_idling(t_start):
-    time_remain = (time.perf_counter() - t_start)
-    if time_remain > 1/Sampling_freq:
-        return
-    else:
-        dt = 1/Sampling_freq - time_remain
-        time.sleep(max(0, dt))
-
 def test_Hand_State_Machine():
     global current_state # 전역 변수 사용 시
     pcan = Pcan_init(ServoStatus.ON, ControlMode.POSITION)
     if not pcan: return
     
-    print(f"{INITIAL_POS}")
+    print(f"{gestures.get('Initial', 'set')}")
 
     # 초기 target_positions 설정 (Initial의 set 데이터)
-    target_positions = GESTURES['Initial']['set'] 
+    cmd = hand_filter.cmd
+    target_positions = set_motion('Initial', 'set', cmd)
     motion_selected = None
     max_error = 0 # 초기화
-    
-    while True:
-        t_start = time.perf_counter()
 
-        # 1. IDLE (Menu)
-        if current_state == HandState.IDLE:
-            choice = show_menu()
-            
-            if choice == '0': break
-            
-            if choice.isdigit():
-                idx = int(choice) - 1
-                if 0 <= idx < len(gesture_map):
-                    motion_selected = gesture_map[idx]
+    # 절대 deadline 기반 주기 실행 (drift 없음, 메뉴 대기 등으로 놓친 tick은 건너뜀)
+    scheduler = DeadlineScheduler(1/Sampling_freq, spin_time=Spin_time, catch_up=CatchUp.SKIP)
+    scheduler.start()
+    recorder = FlightRecorder() if Use_recorder else None
+    # E-stop fast path: ESC hook thread / Ctrl+C 에서 바로 servo-off
+    estop = EmergencyStop([pcan])
+    estop.install_signal_handler()
+    operator = OperatorInput(on_estop=lambda: estop.trigger('key')).start()
+    ready_notified = False
+    
+    try:
+        while True:
+            # 지금 상태가 처리하는 키만 받음 (READY 는 준비 자세 도착 후 Enter, 나머지 키는 무시)
+            if current_state == HandState.READY and max_error >= threshold:
+                operator.accept()
+            else:
+                operator.accept(*STATE_KEYS.get(current_state, ()))
+            # 조작 입력 (non-blocking, tick 당 최대 1개 이벤트 처리)
+            event, value = operator.poll()
+
+            # 1. IDLE (Menu) : 메뉴 입력은 별도 thread, 그동안 현재 자세 유지 명령 계속 송신
+            if current_state == HandState.IDLE:
+                if event == OperatorEvent.MENU_SELECT:
+                    choice = value.strip()
+                
+                    if choice == '0': break
+                
+                    gesture_map = gestures.names()
+                    idx = int(choice) - 1 if choice.isdigit() else -1
+                    if 0 <= idx < len(gesture_map):
+                        motion_selected = gesture_map[idx]
                     
-                    # 'ready'가 있는지 확인하고 없으면 바로 'set'으로
-                    if 'ready' in GESTURES[motion_selected]:
-                        target_positions = GESTURES[motion_selected]['ready']
-                        current_state = HandState.READY
-                        print(f"State: READY - Moving to pre-pose...")
+                        # 'ready'가 있는지 확인하고 없으면 바로 'set'으로
+                        if gestures.has_pose(motion_selected, 'ready'):
+                            target_positions = set_motion(motion_selected, 'ready', cmd)
+                            current_state = HandState.READY
+                            print(f"State: READY - Moving to pre-pose...")
+                        else:
+                            target_positions = set_motion(motion_selected, 'set', cmd)
+                            current_state = HandState.MOVING
+                            print(f"State: MOVING - No ready pose, direct start...")
+                        operator.clear()
                     else:
-                        target_positions = GESTURES[motion_selected]['set']
-                        current_state = HandState.MOVING
-                        print(f"State: MOVING - No ready pose, direct start...")
-
-        # 2. READY -> MOVING
-        elif current_state == HandState.READY and max_error < threshold:
-            print(f"\r[READY] Pre-pose reached. Press 'Enter' to start {motion_selected}...", end="")
-
-            if keyboard.is_pressed('enter'):
-                target_positions = GESTURES[motion_selected]['set']
-                current_state = HandState.MOVING
-                print(f"\nState: MOVING - Executing {motion_selected}...")
+                        operator.request_menu(show_menu)
+                else:
+                    operator.request_menu(show_menu) # 이미 메뉴 대기 중이면 무시됨
 
-        # 3. MOVING -> COMPLETED
-        elif current_state == HandState.MOVING and max_error < threshold:
-            current_state = HandState.COMPLETED
-            print(f"\n[COMPLETED] {motion_selected} finished.")
-            print(" - Repeat motion: Press 'Enter'")
-            print(" - Reset to Home: Press 'r'")
+            # 2. READY -> MOVING
+            elif current_state == HandState.READY and max_error < threshold:
+                if not ready_notified:
+                    print(f"\r[READY] Pre-pose reached. Press 'Enter' to start {motion_selected}...", end="")
+                    ready_notified = True
 
-        # 4. COMPLETED -> INITIAL
-        elif current_state == HandState.COMPLETED:
+                if event == OperatorEvent.ENTER:
+                    target_positions = set_motion(motion_selected, 'set', cmd)
+                    current_state = HandState.MOVING
+                    ready_notified = False
+                    print(f"\nState: MOVING - Executing {motion_selected}...")
+
+            # 3. MOVING -> COMPLETED
+            elif current_state == HandState.MOVING and max_error < threshold:
+                current_state = HandState.COMPLETED
+                operator.clear()
+                print(f"\n[COMPLETED] {motion_selected} finished.")
+                print(" - Repeat motion: Press 'Enter'")
+                print(" - Reset to Home: Press 'r'")
+
+            # 4. COMPLETED -> INITIAL
+            elif current_state == HandState.COMPLETED:
             
-            if keyboard.is_pressed('r'):
-                target_positions = GESTURES['Initial']['set']
-                current_state = HandState.INITIAL # 5번 단계인 INITIAL(RETURNING 역할을 함)로 이동
-                print("\rState: INITIAL - Returning to Home...", end="")
-                time.sleep(0.2) # 키 입력 중복 방지를 위한 짧은 대기
+                if event == OperatorEvent.RESET:
+                    target_positions = set_motion('Initial', 'set', cmd)
+                    current_state = HandState.INITIAL # 5번 단계인 INITIAL(RETURNING 역할을 함)로 이동
+                    print("\rState: INITIAL - Returning to Home...", end="")
             
-            elif keyboard.is_pressed('enter'):
-                print("State: Ready")
-                if 'ready' in GESTURES[motion_selected]:
-                    target_positions = GESTURES[motion_selected]['ready']
-                    current_state = HandState.READY
-                    print(f"\rState: READY - Moving to {motion_selected} pre-pose...")
-                else:
-                    target_positions = GESTURES[motion_selected]['set']
-                    current_state = HandState.MOVING
-                    print(f"\rState: MOVING - Re-executing {motion_selected}...", end="")
-                time.sleep(0.2)
-
-        # 5. INITIAL -> IDE
-        elif current_state == HandState.INITIAL and max_error < threshold:
-            current_state = HandState.IDLE
-            print("State: IDLE - Ready for next command.")
-
-
-        # LPF
-        max_error = Set_position_LPF(filtered_positions, target_positions)
-
-        # Set Position
-        if current_state != HandState.EMERGENCY:
-            for can_id in range(2, 6):
-                cmd = [int(p) for p in filtered_positions[can_id]]
-                # for Debug
-                # print(f"cmd = {cmd}") 
-                pcan.set_target_values(can_id, cmd)
-
-        # Emergency Stop
-        if keyboard.is_pressed('esc'):
-            current_state = HandState.EMERGENCY
-            emergency_reset(pcan, target_positions, filtered_positions)
-            break
-
-        time_idling(t_start)
-
+                elif event == OperatorEvent.ENTER:
+                    print("State: Ready")
+                    if gestures.has_pose(motion_selected, 'ready'):
+                        target_positions = set_motion(motion_selected, 'ready', cmd)
+                        current_state = HandState.READY
+                        print(f"\rState: READY - Moving to {motion_selected} pre-pose...")
+                    else:
+                        target_positions = set_motion(motion_selected, 'set', cmd)
+                        current_state = HandState.MOVING
+                        print(f"\rState: MOVING - Re-executing {motion_selected}...", end="")
+
+            # 5. INITIAL -> IDE
+            elif current_state == HandState.INITIAL and max_error < threshold:
+                current_state = HandState.IDLE
+                operator.clear()
+                print("State: IDLE - Ready for next command.")
+
+
+            # Trajectory (table lookup) or LPF
+            if Use_trajectory:
+                cmd, max_error = traj_player.step()
+            else:
+                max_error = Set_position_LPF(hand_filter, target_positions)
+                cmd = hand_filter.cmd
+
+            # Set Position
+            if current_state != HandState.EMERGENCY:
+                pcan.set_all_targets(cmd)
+
+            # for Debug (loop timing 에 영향 없이 매 tick 기록)
+            if recorder:
+                recorder.record(current_state.value, cmd, pcan.get_hand_positions())
+
+            # Emergency Stop (servo-off 는 이미 송신됨, loop 는 다음 tick 에 종료)
+            if event == OperatorEvent.ESTOP or operator.estop.is_set() or estop.triggered.is_set():
+                current_state = HandState.EMERGENCY
+                emergency_reset(estop)
+                break
+
+            scheduler.wait()
+    finally:
+        # 예외로 빠져나와도 key hook, signal handler, recorder, CAN 연결을 정리
+        operator.stop()
+        estop.restore_signal_handler()
+        if recorder:
+            recorder.close()
+        pcan.close()
+    print(f"Loop stats: {scheduler.get_stats()}")
     print("Program End")
 
 if __name__== "__main__":
-    test_Hand_State_Machine()
\ No newline at end of file
+    gestures = GestureLibrary(watch=True)
+    traj_compiler = TrajectoryCompiler(gestures, Sampling_freq, Traj_v_max, Traj_a_max, Traj_profile)
+    try:
+        # 대기 중인 메뉴 input() 은 daemon thread 라 종료를 막지 않음 (stdin 이 tty 가 아니면 thread 없이 읽음)
+        test_Hand_State_Machine()
+    finally:
+        gestures.stop_watch()
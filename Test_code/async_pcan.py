@@ -0,0 +1,265 @@
+import asyncio
+import time
+import can
+import numpy as np
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Union
+
+from hand_codec import HandCodec, HAND_IDS, to_array
+from hand_filter import HandFilter, FilterMode
+from pcan_handler import (PCAN_INTERFACE, CAN_FRAME_BITS, ServoStatus, ControlMode, FeedbackFrame,
+                          parse_frame)
+
+
+class AsyncPCANHandler:
+    """asyncio interface to one hand (no blocking call or sleep inside a coroutine)
+
+    Frames are received by a python-can Notifier thread and handed to the
+    event loop through an AsyncBufferedReader; a dispatch task parses them
+    into the latest-frame table and fans them out to feedback() iterators.
+
+        async with AsyncPCANHandler() as hand:
+            await hand.set_hand_status(ServoStatus.ON, ControlMode.POSITION)
+            await hand.move_to(target)
+            async for fb in hand.feedback():
+                ...
+
+    Args:
+        channel: PCAN channel name
+        bitrate: CAN bitrate
+        interface: python-can interface (default: PCAN_INTERFACE)
+        id_offset: Added to every CAN ID (see bus_manager)
+        queue_size: Frames buffered per feedback() iterator (oldest dropped)
+    """
+
+    def __init__(self, channel: str = 'PCAN_USBBUS1', bitrate: int = 1000000, interface: Optional[str] = None,
+                 id_offset: int = 0, queue_size: int = 256) -> None:
+        self.channel = channel
+        self.bitrate = bitrate
+        self.interface = interface or PCAN_INTERFACE
+        self.id_offset = id_offset
+        self.queue_size = queue_size
+        self.bus = None
+        self._notifier = None
+        self._reader = None
+        self._dispatcher = None
+        self._codec = HandCodec()
+        self._frame_time = CAN_FRAME_BITS / bitrate
+        self._latest = [None] * 6
+        self._seq = [0] * 6
+        self._subscribers: List[asyncio.Queue] = []
+        self._updated = None
+
+    async def open(self) -> bool:
+        """Connect to the bus and start receiving"""
+        if self.bus is not None:
+            return True
+        try:
+            self.bus = can.interface.Bus(interface=self.interface, channel=self.channel, bitrate=self.bitrate)
+        except Exception as e:
+            print(f"Failed to connect to PCAN: {e}")
+            return False
+        print(f"Connected to PCAN (async): interface={self.interface}, channel={self.channel}, bitrate={self.bitrate}")
+
+        loop = asyncio.get_running_loop()
+        self._updated = asyncio.Condition()
+        self._reader = can.AsyncBufferedReader()
+        self._notifier = can.Notifier(self.bus, [self._reader], timeout=0.1, loop=loop)
+        self._dispatcher = loop.create_task(self._dispatch())
+        return True
+
+    async def close(self) -> None:
+        if self.bus is None:
+            return
+        self._notifier.stop()
+        self._dispatcher.cancel()
+        try:
+            await self._dispatcher
+        except asyncio.CancelledError:
+            pass
+        self.bus.shutdown()
+        self.bus = None
+        print("PCAN bus closed")
+
+    async def __aenter__(self) -> "AsyncPCANHandler":
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    def is_connected(self) -> bool:
+        return self.bus is not None
+
+    # --- TX ---
+
+    def _send(self, can_id: int, data) -> bool:
+        # PCAN/virtual send 는 드라이버 큐에 넣고 바로 반환 (block 하지 않음)
+        try:
+            self.bus.send(can.Message(arbitration_id=can_id + self.id_offset, data=data, is_extended_id=False))
+            return True
+        except Exception as e:
+            print(f"Error sending frame: {e}")
+            return False
+
+    async def set_hand_status(self, status: ServoStatus, mode: ControlMode) -> bool:
+        """Set both servo status and control mode in a single message"""
+        if self.bus is None:
+            return False
+        data = bytearray(8)
+        data[0] = status.value & 0xFF
+        data[1] = mode.value & 0xFF
+        return self._send(1, data)
+
+    async def send_targets(self, targets: Union[Dict[int, list], np.ndarray], bus_load: Optional[float] = None) -> bool:
+        """Send target values for several fingers (see PCANHandler.set_all_targets)
+
+        Args:
+            targets: {CAN ID (2-5): List of 4 joint targets} or (4, 4) array for CAN ID 2-5
+            bus_load: Max bus load ratio (0.0 ~ 1.0); the coroutine then sleeps
+                      for the bus time of the batch, so back-to-back calls stay below it
+        """
+        if self.bus is None:
+            return False
+        if isinstance(targets, dict):
+            if not all(2 <= can_id <= 5 for can_id in targets):
+                return False
+            can_ids = list(targets)
+            targets = to_array(targets)
+        else:
+            can_ids = HAND_IDS
+
+        self._codec.encode(targets)
+        ok = all([self._send(can_id, self._codec.frame(can_id)) for can_id in can_ids])
+        if bus_load:
+            await asyncio.sleep(len(can_ids) * self._frame_time / bus_load)
+        return ok
+
+    # --- RX ---
+
+    async def _dispatch(self) -> None:
+        async for msg in self._reader:
+            can_id = msg.arbitration_id - self.id_offset
+            try:
+                frame = parse_frame(self._codec, can_id, msg.data)
+            except Exception as e:
+                # 깨진 프레임 하나로 dispatch task 가 끝나면 feedback()/wait_* 가 영원히 멈춤
+                print(f"Error parsing frame (ID {msg.arbitration_id}, {msg.data.hex()}): {e}")
+                continue
+            if frame is None:
+                continue
+            self._seq[can_id] += 1
+            feedback = FeedbackFrame(frame, time.perf_counter(), self._seq[can_id])
+            self._latest[can_id] = feedback
+
+            for q in self._subscribers:
+                if q.full():
+                    q.get_nowait()  # 느린 소비자는 오래된 프레임부터 버림
+                q.put_nowait(feedback)
+            async with self._updated:
+                self._updated.notify_all()
+
+    async def feedback(self, can_ids: Optional[Sequence[int]] = None) -> AsyncIterator[FeedbackFrame]:
+        """Iterate over parsed frames as they arrive (optionally only some CAN IDs)"""
+        q = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.append(q)
+        try:
+            while True:
+                feedback = await q.get()
+                if can_ids is None or feedback.frame['can_id'] in can_ids:
+                    yield feedback
+        finally:
+            self._subscribers.remove(q)
+
+    def get_latest(self, can_id: int) -> Optional[FeedbackFrame]:
+        """Latest frame received for a CAN ID (1: status, 2-5: positions)"""
+        if not 1 <= can_id <= 5:
+            return None
+        return self._latest[can_id]
+
+    def get_latest_positions(self, max_age: Optional[float] = None) -> Dict[int, list]:
+        """Latest joint positions of the fingers received within max_age [s] (see PCANHandler)"""
+        now = time.perf_counter()
+        positions = {}
+        for can_id in HAND_IDS:
+            latest = self._latest[can_id]
+            if latest is None:
+                continue
+            if max_age is not None and now - latest.timestamp > max_age:
+                continue
+            positions[can_id] = latest.frame['positions']
+        return positions
+
+    def get_hand_positions(self) -> np.ndarray:
+        """Last decoded positions of the whole hand as a (4, 4) int array (row i = CAN ID 2+i)"""
+        return self._codec.rx.astype(np.int32)
+
+    async def wait_frame(self, can_id: int, timeout: float = 0.1) -> Optional[FeedbackFrame]:
+        """Wait for the next frame of a CAN ID (e.g. 1 for the status echo), None on timeout"""
+        latest = self._latest[can_id]
+        seq = latest.seq if latest is not None else 0
+        try:
+            async with self._updated:
+                await asyncio.wait_for(self._updated.wait_for(
+                    lambda: self._latest[can_id] is not None and self._latest[can_id].seq > seq), timeout)
+        except asyncio.TimeoutError:
+            return None
+        return self._latest[can_id]
+
+    def _error_since(self, target: np.ndarray, since: float) -> Optional[float]:
+        """Max joint error to target, None until every finger has reported after `since`"""
+        for can_id in HAND_IDS:
+            latest = self._latest[can_id]
+            if latest is None or latest.timestamp < since:
+                return None
+        return float(np.abs(target - self._codec.rx).max())
+
+    async def wait_converged(self, target: np.ndarray, tolerance: float = 50.0, timeout: float = 5.0) -> float:
+        """Wait until fresh feedback of all fingers is within tolerance of target
+
+        Someone else has to keep sending targets (feedback answers target frames).
+
+        Returns:
+            Max joint error at convergence
+        Raises:
+            asyncio.TimeoutError
+        """
+        target = np.asarray(target, dtype=float)
+        since = time.perf_counter()
+        error = [None]
+
+        def converged():
+            error[0] = self._error_since(target, since)
+            return error[0] is not None and error[0] <= tolerance
+
+        async with self._updated:
+            await asyncio.wait_for(self._updated.wait_for(converged), timeout)
+        return error[0]
+
+    async def move_to(self, target: np.ndarray, freq: float = 100.0, max_speed: float = 5000.0,
+                      tolerance: float = 50.0, timeout: float = 5.0) -> float:
+        """Stream a speed-limited path to target at freq until the hand converges
+
+        Returns:
+            Max joint error at convergence
+        Raises:
+            asyncio.TimeoutError, or ConnectionError if a send fails
+        """
+        target = np.asarray(target, dtype=float)
+        hand_filter = HandFilter(FilterMode.RATE_LIMIT, dt=1/freq, max_rate=max_speed)
+        hand_filter.reset(self.get_hand_positions())
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        deadline = start
+
+        while True:
+            result = hand_filter.step(target)
+            if not await self.send_targets(result.cmd):
+                raise ConnectionError("failed to send targets")
+            if result.error_max == 0:
+                error = self._error_since(target, time.perf_counter() - 5/freq)
+                if error is not None and error <= tolerance:
+                    return error
+            deadline += 1/freq
+            if deadline - start > timeout:
+                raise asyncio.TimeoutError(f"not converged within {timeout} s")
+            await asyncio.sleep(max(0.0, deadline - loop.time()))
@@ -0,0 +1,230 @@
+import argparse
+import contextlib
+import io
+import json
+import platform
+import sys
+import time
+import can
+import numpy as np
+
+from hand_codec import HandCodec, HAND_IDS
+from pcan_handler import PCANHandler, ServoStatus, ControlMode
+from rt_scheduler import DeadlineScheduler, CatchUp
+from sim_hand import SimHand
+
+# 값이 클수록 좋은 항목 (나머지는 작을수록 좋음)
+HIGHER_IS_BETTER = ('_fps', '_hz')
+
+
+def percentiles(samples_s):
+    """Latency summary in microseconds"""
+    us = np.asarray(samples_s) * 1e6
+    return {
+        'mean_us': float(us.mean()),
+        'p50_us': float(np.percentile(us, 50)),
+        'p90_us': float(np.percentile(us, 90)),
+        'p99_us': float(np.percentile(us, 99)),
+        'max_us': float(us.max()),
+    }
+
+
+def bench_send(pcan, n):
+    targets = {can_id: [100, -200, 300, -400] for can_id in HAND_IDS}
+    arr = np.full((4, 4), 1234.0)
+    results = {}
+
+    t = time.perf_counter()
+    for i in range(n):
+        pcan.set_target_values(HAND_IDS[i % 4], targets[HAND_IDS[i % 4]])
+    results['set_target_values_fps'] = n / (time.perf_counter() - t)
+
+    t = time.perf_counter()
+    for _ in range(n // 4):
+        pcan.set_all_targets(targets)
+    results['set_all_targets_dict_fps'] = (n // 4 * 4) / (time.perf_counter() - t)
+
+    t = time.perf_counter()
+    for _ in range(n // 4):
+        pcan.set_all_targets(arr)
+    results['set_all_targets_array_fps'] = (n // 4 * 4) / (time.perf_counter() - t)
+
+    # set_hand_status 는 매 호출 print 하므로 출력을 버림
+    with contextlib.redirect_stdout(io.StringIO()):
+        t = time.perf_counter()
+        for _ in range(n // 10):
+            pcan.set_hand_status(ServoStatus.ON, ControlMode.POSITION)
+        results['set_hand_status_fps'] = (n // 10) / (time.perf_counter() - t)
+    return results
+
+
+def bench_receive(pcan, channel, n):
+    """Pre-queue n position frames from another node and drain them with receive_frame"""
+    flooder = can.interface.Bus(interface='virtual', channel=channel)
+    data = bytes([0x01, 0x02, 0xff, 0xfe, 0x10, 0x00, 0x80, 0x00])
+    for i in range(n):
+        flooder.send(can.Message(arbitration_id=HAND_IDS[i % 4], data=data, is_extended_id=False))
+
+    received = 0
+    t = t_last = time.perf_counter()
+    while pcan.receive_frame(timeout=0.05) is not None:
+        received += 1
+        t_last = time.perf_counter()
+    # 마지막 빈 receive_frame 의 timeout 대기는 제외
+    elapsed = max(t_last - t, 1e-9)
+    flooder.shutdown()
+    return {'receive_frame_fps': received / elapsed, 'receive_frame_count': received}
+
+
+def bench_codec(pcan, n):
+    codec = HandCodec()
+    arr = np.random.uniform(-5000, 5000, (4, 4))
+    frame = bytes(range(8))
+    msg = can.Message(arbitration_id=3, data=frame, is_extended_id=False)
+    results = {}
+
+    t = time.perf_counter()
+    for _ in range(n):
+        codec.encode(arr)
+    results['encode_hand_us'] = (time.perf_counter() - t) / n * 1e6
+
+    t = time.perf_counter()
+    for _ in range(n):
+        for can_id in HAND_IDS:
+            codec.decode(can_id, frame)
+    results['decode_hand_us'] = (time.perf_counter() - t) / n * 1e6
+
+    t = time.perf_counter()
+    for _ in range(n):
+        pcan._encode_targets(3, [100, -200, 300, -400])
+    results['encode_targets_us'] = (time.perf_counter() - t) / n * 1e6
+
+    t = time.perf_counter()
+    for _ in range(n):
+        pcan._parse_frame(msg)
+    results['parse_frame_us'] = (time.perf_counter() - t) / n * 1e6
+    return results
+
+
+def bench_latency(pcan, n):
+    """Command -> feedback round trip (target frame out, position reply of the same ID in)"""
+    samples = []
+    lost = 0
+    for i in range(n):
+        can_id = HAND_IDS[i % 4]
+        t = time.perf_counter()
+        pcan.set_all_targets({can_id: [i, -i, i, -i]})
+        while True:
+            frame = pcan.receive_frame(timeout=0.1)
+            if frame is None:
+                lost += 1
+                break
+            if frame['can_id'] == can_id:
+                samples.append(time.perf_counter() - t)
+                break
+    result = {'command_latency_' + k: v for k, v in percentiles(samples).items()}
+    result['command_latency_lost'] = lost
+    return result
+
+
+def bench_loop(pcan, freq, duration):
+    """Control loop: set_all_targets every tick, paced by DeadlineScheduler"""
+    scheduler = DeadlineScheduler(1 / freq, catch_up=CatchUp.SKIP)
+    pcan.start_reader()
+    cmd = np.zeros((4, 4))
+    work = []
+    scheduler.start()
+    t_end = time.perf_counter() + duration
+    while time.perf_counter() < t_end:
+        t = time.perf_counter()
+        cmd += 1
+        pcan.set_all_targets(cmd)
+        work.append(time.perf_counter() - t)
+        scheduler.wait()
+    pcan.stop_reader()
+
+    stats = scheduler.get_stats()
+    result = {'loop_' + k: v for k, v in stats.items()}
+    result['loop_rate_hz'] = stats['ticks'] / duration
+    result.update({'loop_work_' + k: v for k, v in percentiles(work).items()})
+    return result
+
+
+def compare(results, baseline, tolerance):
+    """Return regressions worse than baseline by more than tolerance (ratio)"""
+    regressions = {}
+    for key, base in baseline.get('results', {}).items():
+        value = results.get(key)
+        if not isinstance(value, (int, float)) or not isinstance(base, (int, float)) or base == 0:
+            continue
+        if key.endswith(HIGHER_IS_BETTER):
+            worse = value < base * (1 - tolerance)
+        elif key.endswith('_us'):
+            worse = value > base * (1 + tolerance)
+        else:
+            continue
+        if worse:
+            regressions[key] = {'baseline': base, 'value': value}
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PCANHandler throughput / latency benchmark (virtual bus)")
+    parser.add_argument('-n', type=int, default=2000, help="frames per throughput test")
+    parser.add_argument('--freq', type=float, default=500, help="control loop rate [Hz]")
+    parser.add_argument('--duration', type=float, default=2.0, help="control loop duration [s]")
+    parser.add_argument('--latency', type=float, default=0.0, help="simulated firmware reply latency [s]")
+    parser.add_argument('--out', help="write JSON results to this file")
+    parser.add_argument('--baseline', help="compare with a previous JSON result")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="allowed regression ratio")
+    args = parser.parse_args()
+
+    channel = 'bench'
+    with contextlib.redirect_stdout(io.StringIO()):
+        pcan = PCANHandler(channel=channel, interface='virtual')
+    if not pcan.is_connected():
+        print("Failed to open virtual bus")
+        return 1
+
+    results = {}
+    results.update(bench_codec(pcan, args.n))
+    results.update(bench_send(pcan, args.n))
+    while pcan.receive_frame(timeout=0.01): pass
+    results.update(bench_receive(pcan, channel, args.n))
+
+    sim = SimHand(channel, latency=args.latency)
+    with contextlib.redirect_stdout(io.StringIO()):
+        sim.start()
+        pcan.set_hand_status(ServoStatus.ON, ControlMode.POSITION)
+    time.sleep(0.05)
+    while pcan.receive_frame(timeout=0.01): pass
+    results.update(bench_latency(pcan, min(args.n, 1000)))
+    results.update(bench_loop(pcan, args.freq, args.duration))
+    sim.stop()
+
+    report = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'params': vars(args),
+        'results': results,
+    }
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            report['regressions'] = compare(results, json.load(f), args.tolerance)
+        exit_code = 1 if report['regressions'] else 0
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, 'w') as f:
+            f.write(text)
+    print(text)
+    with contextlib.redirect_stdout(io.StringIO()):
+        pcan.close()
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+import math
+import signal
+import threading
+import time
+from collections import deque
+from typing import List, NamedTuple, Optional
+
+from pcan_handler import ServoStatus
+
+
+class StopRecord(NamedTuple):
+    source: str          # 'key', 'signal', 'rpc', ...
+    t_trigger: float     # 요청 시각 (time.perf_counter)
+    sent_us: float       # 요청 → servo-off 프레임 송신 완료까지 [us]
+    confirmed_us: float  # 요청 → servo-off status 응답 수신까지 [us] (응답 없으면 nan)
+
+
+def wait_stop_confirm(hand, seq: int, t_trigger: float, timeout: float) -> float:
+    """Wait for a servo-off status frame newer than seq; latency [us] from t_trigger, nan on timeout"""
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        latest = hand.get_latest(1)
+        if latest is not None and latest.seq > seq and latest.frame['servo_status'] == ServoStatus.OFF.value:
+            return (latest.timestamp - t_trigger) * 1e6
+        time.sleep(0.0002)
+    return math.nan
+
+
+class EmergencyStop:
+    """E-stop fast path, independent of the control loop tick
+
+    trigger() runs in the caller's thread (keyboard hook, signal handler,
+    RPC worker) and calls emergency_stop() of every hand right away:
+    servo-off is sent first and target frames still waiting to be sent are
+    dropped. The measured latency of each stop is kept in `records`.
+
+    Args:
+        hands: PCANHandler / HandPort objects (anything with emergency_stop() and get_latest())
+        confirm_timeout: Max wait for the servo-off status reply [s] (0: don't wait)
+        history: Number of StopRecords kept
+    """
+
+    def __init__(self, hands: List, confirm_timeout: float = 0.05, history: int = 100) -> None:
+        self.hands = hands
+        self.confirm_timeout = confirm_timeout
+        self.triggered = threading.Event()
+        self.records = deque(maxlen=history)
+        self._lock = threading.RLock()  # signal handler 가 main thread 의 trigger 도중에 들어와도 deadlock 없음
+        self._prev_handlers = {}
+        self._chain = False
+
+    def trigger(self, source: str = 'api', hands: Optional[List] = None) -> List[StopRecord]:
+        """Stop every hand (or only `hands`) now and return one StopRecord per hand"""
+        t_trigger = time.perf_counter()
+        hands = self.hands if hands is None else hands
+        self.triggered.set()
+        with self._lock:  # 동시에 여러 경로에서 눌려도 한 번씩 순서대로
+            records = []
+            seqs = []
+            for hand in hands:
+                latest = hand.get_latest(1)
+                seqs.append(latest.seq if latest is not None else 0)
+                hand.emergency_stop()
+                records.append((time.perf_counter() - t_trigger) * 1e6)
+
+            for i, hand in enumerate(hands):
+                confirmed = (wait_stop_confirm(hand, seqs[i], t_trigger, self.confirm_timeout)
+                             if self.confirm_timeout > 0 else math.nan)
+                records[i] = StopRecord(source, t_trigger, records[i], confirmed)
+            self.records.extend(records)
+        return records
+
+    def clear(self, hands: Optional[List] = None) -> None:
+        """Accept commands again (servo stays off until set_hand_status ON)"""
+        for hand in self.hands if hands is None else hands:
+            hand.clear_stop()
+        if not any(hand.is_stopped() for hand in self.hands):
+            self.triggered.clear()
+
+    def install_signal_handler(self, signals=(signal.SIGINT,), chain: bool = False) -> None:
+        """E-stop on the given signals (Ctrl+C by default); main thread only
+
+        Args:
+            chain: Also run the previous handler afterwards (e.g. KeyboardInterrupt to exit)
+        """
+        self._chain = chain
+        for sig in signals:
+            self._prev_handlers[sig] = signal.signal(sig, self._on_signal)
+
+    def restore_signal_handler(self) -> None:
+        for sig, handler in self._prev_handlers.items():
+            signal.signal(sig, handler)
+        self._prev_handlers.clear()
+
+    def _on_signal(self, signum, frame) -> None:
+        self.trigger(f'signal {signal.Signals(signum).name}')
+        prev = self._prev_handlers.get(signum)
+        if self._chain and callable(prev):
+            prev(signum, frame)
+
+    def last(self) -> Optional[StopRecord]:
+        return self.records[-1] if self.records else None
@@ -0,0 +1,149 @@
+import os
+import threading
+import time
+import numpy as np
+from datetime import datetime
+from typing import Optional
+
+from hand_codec import NUM_FINGERS, NUM_JOINTS
+
+NUM_HAND_JOINTS = NUM_FINGERS * NUM_JOINTS
+
+# 1 tick = 1 record (80 bytes)
+RECORD_DTYPE = np.dtype([
+    ('t', '<f8'),                       # time.perf_counter() [s]
+    ('state', '<i4'),                   # HandState 값
+    ('seq', '<u4'),                     # tick 번호
+    ('cmd', '<i2', (NUM_HAND_JOINTS,)), # 명령 위치 (CAN ID 2~5 x 4)
+    ('meas', '<i2', (NUM_HAND_JOINTS,)),# 측정 위치 (CAN ID 2~5 x 4)
+])
+
+MAGIC = b'HANDREC1'
+HEADER_SIZE = 64
+HEADER_DTYPE = np.dtype([
+    ('magic', 'S8'),
+    ('record_size', '<u4'),
+    ('reserved', '<u4'),
+    ('capacity', '<u8'),   # 파일에 들어가는 record 수 (ring)
+    ('count', '<u8'),      # 지금까지 기록된 record 수 (capacity 초과 시 오래된 것부터 덮어씀)
+    ('dropped', '<u8'),    # staging buffer overflow 로 버려진 record 수
+])
+
+
+class FlightRecorder:
+    """Record every control tick into a memory-mapped ring file
+
+    record() only copies the tick into a preallocated in-memory ring;
+    a background thread moves new records into the file.
+
+    Args:
+        path: Output file (default: LOG/hand_<date>.bin)
+        capacity: Records kept in the file (ring, oldest overwritten), default 10 min at 50 Hz (2.4 MB)
+        staging: Records buffered in memory between flushes
+        flush_interval: Background flush period [s]
+    """
+
+    def __init__(self, path: Optional[str] = None, capacity: int = 30000, staging: int = 8192,
+                 flush_interval: float = 0.05) -> None:
+        if path is None:
+            os.makedirs('LOG', exist_ok=True)
+            path = os.path.join('LOG', f"hand_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.bin")
+        self.path = path
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+
+        self._file = np.memmap(path, dtype=np.uint8, mode='w+',
+                               shape=(HEADER_SIZE + capacity * RECORD_DTYPE.itemsize,))
+        self._header = self._file[:HEADER_DTYPE.itemsize].view(HEADER_DTYPE)
+        self._records = self._file[HEADER_SIZE:].view(RECORD_DTYPE)
+        self._header['magic'] = MAGIC
+        self._header['record_size'] = RECORD_DTYPE.itemsize
+        self._header['capacity'] = capacity
+
+        # staging ring: producer(control loop) 는 head, writer thread 는 tail 만 증가
+        self._staging = np.zeros(staging, dtype=RECORD_DTYPE)
+        self._st_t = self._staging['t']
+        self._st_state = self._staging['state']
+        self._st_seq = self._staging['seq']
+        self._st_cmd = self._staging['cmd']
+        self._st_meas = self._staging['meas']
+        self._head = 0
+        self._tail = 0
+        self._written = 0
+        self.dropped = 0
+
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="flight_recorder", daemon=True)
+        self._thread.start()
+
+    def record(self, state: int, cmd, meas, t: Optional[float] = None) -> None:
+        """Store one tick (cmd/meas: (4, 4) arrays)"""
+        head = self._head
+        i = head % len(self._staging)
+        self._st_t[i] = time.perf_counter() if t is None else t
+        self._st_state[i] = state
+        self._st_seq[i] = head
+        self._st_cmd[i] = np.reshape(cmd, NUM_HAND_JOINTS)
+        self._st_meas[i] = np.reshape(meas, NUM_HAND_JOINTS)
+        self._head = head + 1
+
+    def _flush(self) -> None:
+        head, tail = self._head, self._tail
+        size = len(self._staging)
+        if head - tail > size:
+            # writer 가 못 따라간 경우 덮어써진 record 는 버림
+            self.dropped += head - tail - size
+            tail = head - size
+
+        while tail < head:
+            i = tail % size
+            n = min(head - tail, size - i)                            # staging 끝에서 끊기
+            j = self._written % self.capacity
+            n = min(n, self.capacity - j)                             # 파일 끝에서 끊기
+            self._records[j:j + n] = self._staging[i:i + n]
+            tail += n
+            self._written += n
+
+        self._tail = tail
+        self._header['count'] = self._written
+        self._header['dropped'] = self.dropped
+
+    def _run(self) -> None:
+        while self._running:
+            time.sleep(self.flush_interval)
+            self._flush()
+
+    def close(self) -> None:
+        """Flush the remaining records and close the file"""
+        self._running = False
+        self._thread.join(timeout=1.0)
+        self._flush()
+        self._file.flush()
+        print(f"Flight recorder: {self._written} records ({self.dropped} dropped) -> {self.path}")
+
+
+def load_session(path: str) -> np.ndarray:
+    """Load a recorded session as a RECORD_DTYPE array in time order"""
+    raw = np.fromfile(path, dtype=np.uint8)
+    header = raw[:HEADER_DTYPE.itemsize].view(HEADER_DTYPE)[0]
+    if header['magic'] != MAGIC or header['record_size'] != RECORD_DTYPE.itemsize:
+        raise ValueError(f"not a hand flight record: {path}")
+
+    records = raw[HEADER_SIZE:].view(RECORD_DTYPE)
+    capacity, count = int(header['capacity']), int(header['count'])
+    if count <= capacity:
+        return records[:count].copy()
+    start = count % capacity
+    return np.concatenate([records[start:], records[:start]])
+
+
+def save_session(path: str, records: np.ndarray) -> None:
+    """Write a RECORD_DTYPE array as a session file (same format as FlightRecorder)"""
+    header = np.zeros(1, dtype=HEADER_DTYPE)
+    header['magic'] = MAGIC
+    header['record_size'] = RECORD_DTYPE.itemsize
+    header['capacity'] = len(records)
+    header['count'] = len(records)
+    with open(path, 'wb') as f:
+        f.write(header.tobytes().ljust(HEADER_SIZE, b'\0'))
+        f.write(np.ascontiguousarray(records, dtype=RECORD_DTYPE).tobytes())
@@ -0,0 +1,76 @@
+import numpy as np
+from typing import Union
+
+# CAN ID 2~5: Thumb, Index, Middle, Ring/Little (4 joints each)
+HAND_IDS = (2, 3, 4, 5)
+NUM_FINGERS = 4
+NUM_JOINTS = 4
+FRAME_SIZE = NUM_JOINTS * 2  # 2 bytes (big-endian int16) per joint
+
+INT16_MIN = -32768
+INT16_MAX = 32767
+
+
+class HandCodec:
+    """Pack/unpack the whole hand (4 IDs x 4 joints) as big-endian int16
+
+    The payload of all 4 fingers lives in one preallocated 32-byte buffer,
+    viewed as a (4, 4) '>i2' array, so encoding/decoding is a single
+    vectorized call without per-joint Python work.
+    Row i of the array is CAN ID HAND_IDS[i].
+    """
+
+    def __init__(self) -> None:
+        self._tx_buf = bytearray(NUM_FINGERS * FRAME_SIZE)
+        self._rx_buf = bytearray(NUM_FINGERS * FRAME_SIZE)
+        self.tx = np.frombuffer(self._tx_buf, dtype='>i2').reshape(NUM_FINGERS, NUM_JOINTS)
+        self.rx = np.frombuffer(self._rx_buf, dtype='>i2').reshape(NUM_FINGERS, NUM_JOINTS)
+        self._tx_view = memoryview(self._tx_buf)
+        self._rx_view = memoryview(self._rx_buf)
+
+    def encode(self, positions: Union[np.ndarray, list]) -> memoryview:
+        """Encode a (4, 4) position array into the TX buffer
+
+        Values are saturated to the int16 range and truncated toward zero (same as int()).
+
+        Args:
+            positions: (4, 4) array-like, row i = CAN ID HAND_IDS[i]
+
+        Returns:
+            32-byte view of the TX buffer (valid until the next encode)
+        """
+        np.clip(positions, INT16_MIN, INT16_MAX, out=self.tx, casting='unsafe')
+        return self._tx_view
+
+    def frame(self, can_id: int) -> memoryview:
+        """8-byte payload of one CAN ID from the last encode"""
+        i = can_id - HAND_IDS[0]
+        return self._tx_view[i*FRAME_SIZE:(i + 1)*FRAME_SIZE]
+
+    def decode(self, can_id: int, data: Union[bytes, bytearray]) -> np.ndarray:
+        """Decode one 8-byte position frame into the RX array
+
+        Returns:
+            Row view (4,) of the RX array for this CAN ID
+        """
+        i = can_id - HAND_IDS[0]
+        self._rx_view[i*FRAME_SIZE:(i + 1)*FRAME_SIZE] = data[:FRAME_SIZE]
+        return self.rx[i]
+
+    def decode_hand(self, payload: Union[bytes, bytearray]) -> np.ndarray:
+        """Decode a 32-byte payload (CAN ID 2~5 concatenated) into the RX array"""
+        self._rx_view[:] = payload
+        return self.rx
+
+
+def to_array(targets: dict) -> np.ndarray:
+    """Convert {CAN ID: [4 joints]} to a (4, 4) array (missing IDs are 0)"""
+    arr = np.zeros((NUM_FINGERS, NUM_JOINTS))
+    for can_id, values in targets.items():
+        arr[can_id - HAND_IDS[0], :len(values)] = values[:NUM_JOINTS]
+    return arr
+
+
+def to_dict(arr: np.ndarray) -> dict:
+    """Convert a (4, 4) array to {CAN ID: [4 joints]}"""
+    return {can_id: arr[i].tolist() for i, can_id in enumerate(HAND_IDS)}
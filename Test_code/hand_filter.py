@@ -0,0 +1,93 @@
+import math
+import numpy as np
+from enum import Enum, auto
+from typing import NamedTuple, Tuple
+
+from hand_codec import NUM_FINGERS, NUM_JOINTS
+
+
+class FilterMode(Enum):
+    FIRST_ORDER = auto()    # 1차 LPF: y += a * (target - y)
+    SECOND_ORDER = auto()   # 2차 critically damped (overshoot 없음, 속도 연속)
+    RATE_LIMIT = auto()     # 최대 속도 제한 (등속 이동)
+
+
+class FilterResult(NamedTuple):
+    cmd: np.ndarray       # 정수 명령값 (int() 와 같이 0 방향 절삭)
+    error_sum: float      # sum(|target - filtered|) (기존 max_error 와 동일한 의미)
+    error_max: float      # max(|target - filtered|)
+
+
+def alpha_to_tau(alpha: float, freq: float) -> float:
+    """Time constant [s] of a per-tick LPF gain alpha applied at freq [Hz]"""
+    return -1.0 / (freq * math.log(1.0 - alpha))
+
+
+class HandFilter:
+    """Whole-hand setpoint filter working on a (4, 4) array (row i = CAN ID 2+i)
+
+    Filter parameters are given in seconds so the response does not change
+    with the sampling frequency.
+
+    Args:
+        mode: FilterMode
+        dt: Control period [s]
+        tau: Time constant [s] (FIRST_ORDER, SECOND_ORDER)
+        max_rate: Max speed [units/s] (RATE_LIMIT)
+        shape: State shape, default (4, 4)
+    """
+
+    def __init__(self, mode: FilterMode = FilterMode.FIRST_ORDER, dt: float = 0.02, tau: float = 0.39,
+                 max_rate: float = 5000.0, shape: Tuple[int, ...] = (NUM_FINGERS, NUM_JOINTS)) -> None:
+        self.mode = mode
+        self.pos = np.zeros(shape)
+        self.vel = np.zeros(shape)
+        self.cmd = np.zeros(shape, dtype=np.int32)
+        self._err = np.zeros(shape)
+        self.configure(dt=dt, tau=tau, max_rate=max_rate)
+
+    def configure(self, dt: float = None, tau: float = None, max_rate: float = None) -> None:
+        """Update filter parameters (None keeps the current value)"""
+        if dt is not None:
+            self.dt = dt
+        if tau is not None:
+            self.tau = tau
+        if max_rate is not None:
+            self.max_rate = max_rate
+
+        # 매 tick 계산하지 않도록 계수 미리 계산
+        self._alpha = 1.0 - math.exp(-self.dt / self.tau)
+        self._omega = 1.0 / self.tau
+        self._decay = math.exp(-self._omega * self.dt)
+        self._max_step = self.max_rate * self.dt
+
+    def reset(self, pos=0.0) -> None:
+        """Reset the filter state to pos (scalar or array) with zero velocity"""
+        self.pos[...] = pos
+        self.vel[...] = 0.0
+        np.copyto(self.cmd, self.pos, casting='unsafe')
+
+    def step(self, target: np.ndarray) -> FilterResult:
+        """Advance the filter by one control period toward target
+
+        Returns:
+            FilterResult (cmd array is reused between calls)
+        """
+        pos, err = self.pos, self._err
+        np.subtract(pos, target, out=err)   # err = pos - target
+
+        if self.mode == FilterMode.FIRST_ORDER:
+            pos -= self._alpha * err
+        elif self.mode == FilterMode.SECOND_ORDER:
+            # Exact step of x'' = -w^2 e - 2w x' : e(t) = (e0 + (v0 + w e0) t) exp(-w t)
+            b = self.vel + self._omega * err
+            pos[...] = target + (err + b * self.dt) * self._decay
+            self.vel -= self._omega * b * self.dt
+            self.vel *= self._decay
+        elif self.mode == FilterMode.RATE_LIMIT:
+            pos -= np.clip(err, -self._max_step, self._max_step)
+
+        np.subtract(target, pos, out=err)
+        np.abs(err, out=err)
+        np.copyto(self.cmd, pos, casting='unsafe')
+        return FilterResult(self.cmd, float(err.sum()), float(err.max()))
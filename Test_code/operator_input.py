@@ -0,0 +1,137 @@
+import queue
+import sys
+import threading
+from enum import Enum, auto
+from typing import Callable, Optional, Tuple, Any
+
+import keyboard
+
+
+class OperatorEvent(Enum):
+    ENTER = auto()        # 다음 단계 진행 / 동작 반복
+    RESET = auto()        # 홈(Initial) 자세로 복귀
+    ESTOP = auto()        # 비상 정지
+    MENU_SELECT = auto()  # 메뉴 입력 문자열 (value)
+
+
+DEFAULT_KEYS = {
+    'enter': OperatorEvent.ENTER,
+    'r': OperatorEvent.RESET,
+    'esc': OperatorEvent.ESTOP,
+}
+
+
+class OperatorInput:
+    """Operator keys and menu input as events, so the control loop never blocks
+
+    Key presses come from keyboard hooks (keyboard's own thread) and the
+    menu runs input() in a separate thread; both push into a queue that
+    the control loop drains with poll() once per tick.
+    A held key gives one event (OS auto-repeat is dropped until it is released),
+    and keys the current state does not handle (see accept()) are dropped, not queued.
+    ESTOP calls on_estop right away in the hook thread (e.g. EmergencyStop.trigger,
+    so the hand stops without waiting for the tick) and sets the `estop` Event.
+
+    Args:
+        keys: {key name: OperatorEvent}
+        on_estop: Called from the key hook thread when ESTOP is pressed
+    """
+
+    def __init__(self, keys: dict = None, on_estop: Optional[Callable[[], Any]] = None) -> None:
+        self.keys = keys or DEFAULT_KEYS
+        self.on_estop = on_estop
+        self.events = queue.Queue()
+        self.estop = threading.Event()
+        self.menu_active = threading.Event()
+        self._accepted = frozenset(OperatorEvent)
+        self._held = set()
+        self._hooks = []
+
+    def start(self) -> "OperatorInput":
+        for key, event in self.keys.items():
+            self._hooks.append(keyboard.on_press_key(key, lambda _, k=key, ev=event: self._on_press(k, ev)))
+            self._hooks.append(keyboard.on_release_key(key, lambda _, k=key: self._held.discard(k)))
+        return self
+
+    def stop(self) -> None:
+        for hook in self._hooks:
+            keyboard.unhook(hook)
+        self._hooks = []
+        self._held.clear()
+
+    def accept(self, *events: OperatorEvent) -> None:
+        """Key events the current state handles; other keys are dropped (ESTOP and MENU_SELECT always pass)"""
+        self._accepted = frozenset(events)
+
+    def _handled(self, event: OperatorEvent) -> bool:
+        return event in (OperatorEvent.ESTOP, OperatorEvent.MENU_SELECT) or event in self._accepted
+
+    def _on_press(self, key: str, event: OperatorEvent) -> None:
+        # 누르고 있는 동안 OS auto-repeat 로 반복되는 press 는 무시 (ESTOP 은 항상 전달)
+        if key in self._held and event != OperatorEvent.ESTOP:
+            return
+        self._held.add(key)
+        self._push(event)
+
+    def _push(self, event: OperatorEvent, value: Any = None) -> None:
+        if event == OperatorEvent.ESTOP:
+            if self.on_estop is not None and not self.estop.is_set():
+                self.on_estop()
+            self.estop.set()
+            return
+        if self.menu_active.is_set() and event != OperatorEvent.MENU_SELECT:
+            return  # 메뉴 입력 중 타이핑한 키는 무시
+        if not self._handled(event):
+            return  # 지금 상태에서 쓰지 않는 키는 쌓지 않음
+        self.events.put((event, value))
+
+    def request_menu(self, menu_fn: Callable[[], str]) -> bool:
+        """Run menu_fn (prints + input()) in a thread; its result arrives as MENU_SELECT
+
+        If stdin is not a tty (pipe, file) menu_fn runs in the calling thread
+        instead: a daemon thread still blocked in input() on a non-tty stdin
+        aborts the interpreter at exit.
+
+        Returns:
+            False if a menu is already waiting for input
+        """
+        if self.menu_active.is_set():
+            return False
+        self.menu_active.set()
+
+        def worker():
+            try:
+                choice = menu_fn()
+            except EOFError:
+                choice = '0'
+            self._push(OperatorEvent.MENU_SELECT, choice)
+            self.menu_active.clear()
+
+        if not sys.stdin.isatty():
+            worker()
+            return True
+        threading.Thread(target=worker, name="operator_menu", daemon=True).start()
+        return True
+
+    def poll(self) -> Tuple[Optional[OperatorEvent], Any]:
+        """Return the oldest pending (event, value) without blocking, (None, None) if empty
+
+        ESTOP is returned first whenever it has been requested.
+        """
+        if self.estop.is_set():
+            return OperatorEvent.ESTOP, None
+        while True:
+            try:
+                event, value = self.events.get_nowait()
+            except queue.Empty:
+                return None, None
+            if self._handled(event):  # 큐에 있는 동안 상태가 바뀌어 더 이상 쓰지 않는 키는 버림
+                return event, value
+
+    def clear(self) -> None:
+        """Drop pending events (e.g. on state change)"""
+        while True:
+            try:
+                self.events.get_nowait()
+            except queue.Empty:
+                return
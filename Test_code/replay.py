@@ -0,0 +1,126 @@
+import argparse
+import json
+import time
+import numpy as np
+from typing import NamedTuple, Optional
+
+from flight_recorder import load_session, save_session, RECORD_DTYPE, NUM_HAND_JOINTS
+from pcan_handler import PCANHandler, ServoStatus, ControlMode
+from sim_hand import start_if_virtual
+
+
+class ReplayResult(NamedTuple):
+    session: np.ndarray   # 재생 중 기록 (cmd = 보낸 명령, meas = 재생 중 측정 위치)
+    diff: dict            # 기록된 측정 위치와의 차이 요약
+    duration: float       # 실제 재생 시간 [s]
+    late_ticks: int       # 원래 시각보다 1 ms 이상 늦게 보낸 tick 수 (realtime)
+
+
+def diff_sessions(recorded: np.ndarray, replayed: np.ndarray) -> dict:
+    """Compare measured positions tick by tick (same length and order)"""
+    err = replayed['meas'].astype(np.int32) - recorded['meas'].astype(np.int32)
+    if len(err) == 0:
+        # 빈 세션: 관절별 값은 0, worst_tick 은 -1
+        zeros = np.zeros(err.shape[1:], dtype=int).tolist()
+        return {'ticks': 0, 'rms_per_joint': zeros, 'max_abs_per_joint': zeros,
+                'mean_abs': 0.0, 'max_abs': 0, 'worst_tick': -1}
+    abs_err = np.abs(err)
+    return {
+        'ticks': int(len(err)),
+        'rms_per_joint': np.sqrt((err.astype(float) ** 2).mean(axis=0)).round(1).tolist(),
+        'max_abs_per_joint': abs_err.max(axis=0).tolist(),
+        'mean_abs': float(abs_err.mean()),
+        'max_abs': int(abs_err.max()),
+        'worst_tick': int(abs_err.max(axis=1).argmax()),
+    }
+
+
+class ReplayEngine:
+    """Stream a recorded session's commands back onto the bus
+
+    Args:
+        pcan: PCANHandler with the reader thread started (for measured feedback)
+        time_scale: Speed factor for original timing (2.0 = twice as fast)
+        realtime: True follows the recorded timestamps, False sends as fast as possible
+        bus_load: Pacing for as-fast-as-possible mode (see set_all_targets)
+        spin_time: Busy-wait tail before each tick [s]
+    """
+
+    def __init__(self, pcan: PCANHandler, time_scale: float = 1.0, realtime: bool = True,
+                 bus_load: Optional[float] = None, spin_time: float = 0.0003) -> None:
+        self.pcan = pcan
+        self.time_scale = time_scale
+        self.realtime = realtime
+        self.bus_load = bus_load
+        self.spin_time = spin_time
+
+    def _wait_until(self, deadline: float) -> None:
+        remain = deadline - time.perf_counter() - self.spin_time
+        if remain > 0:
+            time.sleep(remain)
+        while time.perf_counter() < deadline:
+            pass
+
+    def run(self, session: np.ndarray) -> ReplayResult:
+        """Replay all ticks of session and diff measured vs recorded feedback"""
+        replayed = np.zeros(len(session), dtype=RECORD_DTYPE)
+        replayed['state'] = session['state']
+        replayed['seq'] = session['seq']
+        replayed['cmd'] = session['cmd']
+        cmds = session['cmd'].reshape(-1, 4, 4)
+        offsets = (session['t'] - session['t'][0]) / self.time_scale if len(session) else []
+        late = 0
+
+        t_start = time.perf_counter()
+        for k in range(len(session)):
+            if self.realtime:
+                deadline = t_start + offsets[k]
+                self._wait_until(deadline)
+                if time.perf_counter() - deadline > 0.001:
+                    late += 1
+            self.pcan.set_all_targets(cmds[k], self.bus_load)
+            replayed['t'][k] = time.perf_counter()
+            replayed['meas'][k] = self.pcan.get_hand_positions().reshape(NUM_HAND_JOINTS)
+        duration = time.perf_counter() - t_start
+
+        return ReplayResult(replayed, diff_sessions(session, replayed), duration, late)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded hand session through PCANHandler")
+    parser.add_argument('session', help="session file recorded by FlightRecorder")
+    parser.add_argument('--scale', type=float, default=1.0, help="time scale (2.0 = twice as fast)")
+    parser.add_argument('--fast', action='store_true', help="ignore timing, send as fast as possible")
+    parser.add_argument('--bus-load', type=float, default=None, help="bus load pacing for --fast (0~1)")
+    parser.add_argument('--out', help="save the replayed session (cmd + measured) to this file")
+    args = parser.parse_args()
+
+    session = load_session(args.session)
+    if len(session) == 0:
+        print(f"No samples in {args.session}, nothing to replay")
+        return
+    print(f"Loaded {len(session)} ticks ({session['t'][-1] - session['t'][0]:.2f} s) from {args.session}")
+
+    start_if_virtual() # PCAN_INTERFACE=virtual 이면 시뮬레이션 손 사용
+    pcan = PCANHandler()
+    if not pcan.is_connected():
+        print("Failed to connect to PCAN")
+        return
+    pcan.set_hand_status(ServoStatus.ON, ControlMode.POSITION)
+    time.sleep(0.5)
+    pcan.start_reader()
+
+    try:
+        engine = ReplayEngine(pcan, time_scale=args.scale, realtime=not args.fast, bus_load=args.bus_load)
+        result = engine.run(session)
+        print(f"Replayed in {result.duration:.2f} s ({len(session) / max(result.duration, 1e-9):.0f} ticks/s), "
+              f"late ticks: {result.late_ticks}")
+        print(json.dumps(result.diff))
+        if args.out:
+            save_session(args.out, result.session)
+    finally:
+        pcan.close()
+
+
+if __name__ == "__main__":
+    main()
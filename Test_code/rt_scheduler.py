@@ -0,0 +1,124 @@
+import math
+import time
+from collections import deque
+from enum import Enum
+from typing import Dict
+
+
+##
+# @class CatchUp
+# @brief policy when a deadline was already missed
+#       - SKIP: drop the missed ticks and stay on the original period grid
+#       - BURST: keep every deadline, run missed ticks back-to-back
+#       - RESET: restart the grid from now
+class CatchUp(Enum):
+    SKIP = 0
+    BURST = 1
+    RESET = 2
+
+
+##
+# @class DeadlineScheduler
+# @brief periodic scheduler with absolute deadlines on the monotonic clock
+# @remark
+#       Deadlines are next = start + k * period, so sleep errors do not accumulate.
+#       The last spin_time seconds before a deadline are busy-waited for low jitter.
+#       Usage:
+#           scheduler = DeadlineScheduler(0.002)
+#           scheduler.start()
+#           while running:
+#               do_work()
+#               scheduler.wait()
+class DeadlineScheduler:
+    period: float
+    spin_time: float
+    catch_up: CatchUp
+
+    ##
+    # @param period control period in seconds
+    # @param spin_time busy-wait tail in seconds (0 to disable)
+    # @param catch_up CatchUp policy on overrun
+    # @param stats_size number of recent wake-ups kept for jitter statistics
+    def __init__(self, period: float, spin_time: float = 0.0003, catch_up: CatchUp = CatchUp.SKIP,
+                 stats_size: int = 1000):
+        self.period = period
+        self.spin_time = spin_time
+        self.catch_up = catch_up
+        self._period_ns = int(period * 1e9)
+        self._spin_ns = int(spin_time * 1e9)
+        self._lateness = deque(maxlen=stats_size)  # wake-up time - deadline [ns]
+        self.next_deadline = None
+        self.ticks = 0
+        self.overruns = 0
+        self.skipped = 0
+
+    ##
+    # @brief (re)start the deadline grid from now
+    def start(self):
+        self.next_deadline = time.monotonic_ns() + self._period_ns
+        self.ticks = 0
+        self.overruns = 0
+        self.skipped = 0
+        self._lateness.clear()
+
+    ##
+    # @brief sleep until the next deadline and advance it
+    # @remark a tick is an overrun if the deadline had already passed on entry
+    #       or the wake-up itself overshot past the next deadline (lateness >= period);
+    #       skipped counts the deadlines dropped by CatchUp.SKIP after an overrun
+    # @return False on overrun
+    def wait(self) -> bool:
+        if self.next_deadline is None:
+            self.start()
+        deadline = self.next_deadline
+        now = time.monotonic_ns()
+        on_time = now < deadline
+
+        if on_time:
+            sleep_ns = deadline - now - self._spin_ns
+            if sleep_ns > 0:
+                time.sleep(sleep_ns * 1e-9)
+            while time.monotonic_ns() < deadline:
+                pass
+            now = time.monotonic_ns()
+
+        self._lateness.append(now - deadline)
+        self.ticks += 1
+        self.next_deadline = deadline + self._period_ns
+
+        overshot = now >= self.next_deadline
+        if not on_time or overshot:
+            self.overruns += 1
+        if overshot:
+            if self.catch_up == CatchUp.SKIP:
+                missed = (now - deadline) // self._period_ns
+                self.skipped += missed
+                self.next_deadline = deadline + (missed + 1) * self._period_ns
+            elif self.catch_up == CatchUp.RESET:
+                self.next_deadline = now + self._period_ns
+        return on_time and not overshot
+
+    ##
+    # @brief seconds left until the next deadline (negative if late)
+    def remaining(self) -> float:
+        if self.next_deadline is None:
+            return self.period
+        return (self.next_deadline - time.monotonic_ns()) * 1e-9
+
+    ##
+    # @brief jitter statistics of the recent wake-ups (lateness in microseconds)
+    def get_stats(self) -> Dict[str, float]:
+        samples = sorted(self._lateness)
+        n = len(samples)
+        stats = {"ticks": self.ticks, "overruns": self.overruns, "skipped": self.skipped,
+                 "period_us": self.period * 1e6}
+        if n == 0:
+            return stats
+        mean = sum(samples) / n
+        stats.update({
+            "jitter_mean_us": mean / 1e3,
+            "jitter_std_us": math.sqrt(sum((x - mean) ** 2 for x in samples) / n) / 1e3,
+            "jitter_p99_us": samples[min(n - 1, int(n * 0.99))] / 1e3,
+            "jitter_max_us": samples[-1] / 1e3,
+        })
+        return stats
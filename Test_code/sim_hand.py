@@ -0,0 +1,127 @@
+import heapq
+import itertools
+import threading
+import time
+import can
+import numpy as np
+from typing import Optional
+
+from hand_codec import HandCodec, HAND_IDS, NUM_FINGERS, NUM_JOINTS
+from pcan_handler import PCAN_INTERFACE, ServoStatus, ControlMode
+
+
+class SimHand:
+    """Simulated hand firmware on a python-can virtual bus
+
+    - ID 1 (status): stores servo status / control mode and echoes the status frame
+    - ID 2-5 (targets): in POSITION mode with servo ON the joints move toward
+      the target (first-order lag, speed limited), and every target frame is
+      answered with the current positions of that ID after `latency`
+
+    Args:
+        channel: Virtual channel name (same as PCANHandler channel)
+        tau: Joint time constant [s]
+        max_speed: Max joint speed [units/s]
+        latency: Reply delay [s]
+        noise: Std of position noise added to replies [units]
+        rate: Internal simulation rate [Hz]
+        id_offset: Added to every CAN ID (several hands on one channel, see bus_manager)
+    """
+
+    def __init__(self, channel: str = 'PCAN_USBBUS1', tau: float = 0.05, max_speed: float = 20000.0,
+                 latency: float = 0.0005, noise: float = 0.0, rate: float = 1000.0,
+                 id_offset: int = 0) -> None:
+        self.channel = channel
+        self.id_offset = id_offset
+        self.tau = tau
+        self.max_speed = max_speed
+        self.latency = latency
+        self.noise = noise
+        self.rate = rate
+
+        self.servo = ServoStatus.OFF.value
+        self.mode = ControlMode.VOLTAGE.value
+        self.positions = np.zeros((NUM_FINGERS, NUM_JOINTS))
+        self.targets = np.zeros((NUM_FINGERS, NUM_JOINTS))
+        self.rx_count = 0
+        self.tx_count = 0
+
+        self._codec = HandCodec()
+        self._pending = []              # (due time, order, can.Message) heap
+        self._order = itertools.count()
+        self._bus = None
+        self._thread = None
+        self._running = False
+
+    def start(self) -> "SimHand":
+        if self._running:
+            return self
+        self._bus = can.interface.Bus(interface='virtual', channel=self.channel)
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="sim_hand", daemon=True)
+        self._thread.start()
+        print(f"Simulated hand started: channel={self.channel}, id_offset={self.id_offset}")
+        return self
+
+    def stop(self) -> None:
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        if self._bus is not None:
+            self._bus.shutdown()
+            self._bus = None
+
+    def _run(self) -> None:
+        period = 1.0 / self.rate
+        t_prev = time.perf_counter()
+        while self._running:
+            msg = self._bus.recv(timeout=period)
+            now = time.perf_counter()
+            if msg is not None:
+                self._handle(msg, now)
+
+            self._integrate(now - t_prev)
+            t_prev = now
+
+            # 응답 지연이 지난 프레임 송신
+            while self._pending and self._pending[0][0] <= now:
+                _, _, reply = heapq.heappop(self._pending)
+                self._bus.send(reply)
+                self.tx_count += 1
+
+    def _handle(self, msg: can.Message, now: float) -> None:
+        self.rx_count += 1
+        can_id = msg.arbitration_id - self.id_offset
+        if can_id == 1:
+            self.servo, self.mode = msg.data[0], msg.data[1]
+            if self.servo == ServoStatus.ON.value:
+                self.targets[...] = self.positions  # 서보 ON 시 현재 자세 유지
+            self._reply(can.Message(arbitration_id=msg.arbitration_id, data=msg.data, is_extended_id=False), now)
+        elif can_id in HAND_IDS:
+            i = can_id - HAND_IDS[0]
+            if self.mode == ControlMode.POSITION.value:
+                self.targets[i] = self._codec.decode(can_id, msg.data)
+            position = self.positions[i]
+            if self.noise:
+                position = position + np.random.normal(0.0, self.noise, NUM_JOINTS)
+            self._codec.tx[i] = np.clip(position, -32768, 32767)
+            self._reply(can.Message(arbitration_id=msg.arbitration_id, data=self._codec.frame(can_id),
+                                    is_extended_id=False), now)
+
+    def _integrate(self, dt: float) -> None:
+        if self.servo != ServoStatus.ON.value or self.mode != ControlMode.POSITION.value:
+            return
+        step = (self.targets - self.positions) * min(1.0, dt / self.tau)
+        max_step = self.max_speed * dt
+        self.positions += np.clip(step, -max_step, max_step)
+
+    def _reply(self, msg: can.Message, now: float) -> None:
+        heapq.heappush(self._pending, (now + self.latency, next(self._order), msg))
+
+
+def start_if_virtual(channel: str = 'PCAN_USBBUS1', **kwargs) -> Optional[SimHand]:
+    """Start a SimHand when PCANHandler uses the virtual interface (PCAN_INTERFACE=virtual)"""
+    if PCAN_INTERFACE != 'virtual':
+        return None
+    return SimHand(channel, **kwargs).start()
@@ -1,120 +1,10 @@
 import time
 from pcan_handler import PCANHandler, ServoStatus, ControlMode
+from gesture_library import GestureLibrary
 import keyboard 
 
-# Predefined positions for rock-paper-scissors gestures
-GESTURES = {
-    
-    # Grasping Motions
-    # 1
-    'Side Grasp': {
-        # 원통형 물체 옆으로 잡기 (측정 데이터 반영)
-        2: [3672, -3745, 1155, 2402],  # Thumb
-        3: [142, 1471, 2624, 1298],    # Index
-        4: [133, 2385, 1541, 2263],    # Middle
-        5: [214, 2235, 2106, 1523]     # Ring/Little
-    },
-
-    # 2
-    'Top Grasp': {
-        # 넓은 원통 물체 위에서 아래로 잡기
-        2: [2405, -2683, 794, 2079],   # Thumb
-        3: [-156, 1232, 2101, 1191],   # Index
-        4: [81, 1288, 1601, 2054],     # Middle
-        5: [1903, 3039, 1841, 893]     # Ring/Little
-    },
-
-    # 3
-    'Pinch_2pt': {
-        # 2점 핀치: 엄지와 검지 끝을 맞댐
-        2: [2828, -3215, 1986, 1687],  # Thumb
-        3: [-92, 1925, 2768, 1286],    # Index
-        4: [82, -110, 765, 1843],      # Middle
-        5: [78, -175, 1416, 816]       # Ring/Little
-    },
-
-    # 4
-    'Pinch_3pt': {
-        # 2점 핀치: 엄지와 검지 끝을 맞댐
-        2: [3532, -3110, 890, 3608],   # Thumb
-        3: [-594, 1971, 3615, 1200],   # Index
-        4: [900, 2162, 2650, 2028],    # Middle
-        5: [1160, -678, 1229, 732]     # Ring/Little
-    },
-
-    # 5
-    'Card Grasp': {
-        2: [2351, -3774, 2720, 2235],  # Thumb
-        3: [867, 1335, 4699, 1094],    # Index
-        4: [600, 3680, 4190, 2352],    # Middle
-        5: [149, 4148, 4500, 726]      # Ring/Little
-    },
-
-    # Task Specific Motions
-
-    # 6
-    'grip_pencil': {
-        # 연필 잡기: 엄지, 검지, 중지의 삼각지지
-        2: [2000, -2600, 2500, 2500], 
-        3: [-900, 2000, 2500, 2500], 
-        4: [-1200, 3000, 2500, 2500], 
-        5: [-1200, 3000, 3000, 3000]
-    },
-
-    # 7
-    'rock': { 
-        2: [2500, -1000, 2500, 3000],  # 엄지: 안쪽 접기
-        3: [0, 3000, 3000, 3000],     # 검지: 완전히 접기
-        4: [0, 3000, 3000, 3000],     # 중지: 완전히 접기
-        5: [0, 3000, 3000, 3000]      # 약지/소지: 완전히 접기
-    },
-
-    # 8
-    'scissors': {
-        2: [2500, -1000, 2500, 3000], 
-        3: [0, 0, 0, 0],              # 검지: 펴기
-        4: [0, 0, 0, 0],              # 중지: 펴기
-        5: [0, 3000, 3000, 3000]
-    },
-
-    # 9
-    'paper': {
-        2: [0, 0, 0, 0], 
-        3: [0, 0, 0, 0], 
-        4: [0, 0, 0, 0], 
-        5: [0, 0, 0, 0] 
-    },
-    
-    # # 10
-    # 'push_start': {
-    #     2: [2500, -1000, 2500, 3000],  # 엄지: 안쪽 접기
-    #     3: [0, 3000, 3000, 3000],     # 검지: 완전히 접기
-    #     4: [0, 3000, 3000, 3000],     # 중지: 완전히 접기
-    #     5: [0, 3000, 3000, 3000]      # 약지/소지: 완전히 접기
-    # },
-
-    # 'push_end':   {
-    #     2: [2500, -1000, 2500, 3000],  # 엄지: 안쪽 접기
-    #     3: [0, 3000, 3000, 3000],     # 검지: 완전히 접기
-    #     4: [0, 3000, 3000, 3000],     # 중지: 완전히 접기
-    #     5: [0, 3000, 3000, 3000]      # 약지/소지: 완전히 접기
-    # }, # 검지만 최대로 폄 (혹은 굽힘)
-
-    # 11
-    # 'hook_start': {
-    #     2:, 
-    #     3:, 
-    #     4:, 
-    #     5:
-    # },
-
-    # 'hook_end':   {
-    #     2:, 
-    #     3:[0,2000,2000,0], 
-    #     4:, 
-    #     5:
-    # }, # 검지만 갈고리 모양
-}
+# Predefined gestures (gestures.json)
+gestures = GestureLibrary()
 
 
 
@@ -154,7 +44,7 @@ def test_Hand():
     while pcan.receive_frame(timeout=.01): pass
     is_emergency = False
 
-    # 매핑 확장 (1~9번까지 GESTURES 키와 연결)
+    # 매핑 확장 (1~9번까지 gestures.json 제스처 이름과 연결)
     gesture_map = {
         '1': 'Side Grasp',
         '2': 'Top Grasp',
@@ -183,7 +73,7 @@ def test_Hand():
         # 2. update target buf
         if choice in gesture_map:
             gesture_key = gesture_map[choice]
-            target_update = GESTURES[gesture_key]
+            target_update = gestures.get_dict(gesture_key)
             for can_id in range(2, 6):
                 target_positions[can_id] = target_update[can_id]
             print(f"\nMoving to [{gesture_key}]... (Press 'ESC' to Stop)")
@@ -247,18 +137,30 @@ def test_read_positions():
 
         # Receive buf를 초기화
         while pcan.receive_frame(timeout=0.01): pass
+        # 이후 수신은 reader thread가 CAN ID별 최신 프레임으로 저장
+        pcan.start_reader()
 
         input("\nPress Enter to send voltage 0 to all joints and read positions...")
 
         # 각 손가락별로 voltage 0 보내고 바로 포지션 읽기
         print("\nSending voltage 0 and reading positions for each finger:")
         for can_id in range(2, 6):
+            prev = pcan.get_latest(can_id)
+            prev_seq = prev.seq if prev else 0
+
             # voltage 0 보내기
             pcan.set_target_values(can_id, [0, 0, 0, 0])
-            time.sleep(0.1)
-            
-            # 바로 응답 읽기
-            response = pcan.receive_frame(timeout=1.0)
+
+            # 새 프레임이 들어올 때까지 대기 (최대 1초)
+            response = None
+            t_wait = time.perf_counter()
+            while time.perf_counter() - t_wait < 1.0:
+                latest = pcan.get_latest(can_id)
+                if latest and latest.seq > prev_seq:
+                    response = latest.frame
+                    break
+                time.sleep(0.001)
+
             if response and 'positions' in response:
                 finger_name = {
                     2: "Thumb",
@@ -0,0 +1,132 @@
+import math
+import numpy as np
+from collections import OrderedDict
+from enum import Enum, auto
+from typing import Dict, NamedTuple, Tuple
+
+
+class Profile(Enum):
+    TRAPEZOID = auto()  # 속도/가속도 제한 사다리꼴 (time-optimal)
+    MIN_JERK = auto()   # minimum-jerk 5차 다항식
+
+
+class Trajectory(NamedTuple):
+    table: np.ndarray      # (N, 4, 4) int32 명령값, 마지막 샘플 = 목표 자세
+    remaining: np.ndarray  # (N,) 각 샘플의 sum(|goal - cmd|) (수렴 판단용)
+    duration: float        # [s]
+
+
+def _trapezoid(distance: float, v_max: float, a_max: float, t: np.ndarray) -> Tuple[np.ndarray, float]:
+    """Normalized (0~1) time-optimal trapezoidal profile for the given distance"""
+    if distance * a_max >= v_max * v_max:
+        t_acc = v_max / a_max
+        duration = distance / v_max + t_acc
+    else:
+        # 최고 속도에 도달하지 못하는 삼각형 프로파일
+        t_acc = math.sqrt(distance / a_max)
+        duration = 2 * t_acc
+    v_peak = a_max * t_acc
+
+    t = np.minimum(t, duration)
+    s = np.where(t < t_acc, 0.5 * a_max * t * t,
+        np.where(t < duration - t_acc, v_peak * (t - 0.5 * t_acc),
+                 distance - 0.5 * a_max * (duration - t) ** 2))
+    return s / distance, duration
+
+
+def _min_jerk(distance: float, v_max: float, a_max: float, t: np.ndarray) -> Tuple[np.ndarray, float]:
+    """Normalized (0~1) minimum-jerk profile, as short as v_max/a_max allow"""
+    # peak velocity = 1.875 D/T, peak acceleration = 5.7735 D/T^2
+    duration = max(1.875 * distance / v_max, math.sqrt(5.7735 * distance / a_max))
+    tau = np.minimum(t / duration, 1.0)
+    return tau ** 3 * (10 - 15 * tau + 6 * tau * tau), duration
+
+
+class TrajectoryCompiler:
+    """Compile gesture poses into sample tables at the control rate
+
+    All joints are synchronized to the joint with the largest travel,
+    so every joint respects v_max/a_max and the motion has a fixed duration.
+    Tables are cached per (gesture, pose, start pose).
+
+    Args:
+        gestures: {name: {'ready'/'set': (4, 4) array}}
+        freq: Control rate [Hz]
+        v_max: Max joint speed [units/s]
+        a_max: Max joint acceleration [units/s^2]
+        profile: Profile.TRAPEZOID or Profile.MIN_JERK
+        cache_size: Max number of cached tables
+    """
+
+    def __init__(self, gestures: Dict[str, Dict[str, np.ndarray]], freq: float,
+                 v_max: float = 5000.0, a_max: float = 20000.0,
+                 profile: Profile = Profile.TRAPEZOID, cache_size: int = 64) -> None:
+        self.gestures = gestures
+        self.freq = freq
+        self.v_max = v_max
+        self.a_max = a_max
+        self.profile = profile
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+
+    def compile(self, name: str, pose: str, start: np.ndarray) -> Trajectory:
+        """Get the table from start to gestures[name][pose] (cached)"""
+        start = np.asarray(start, dtype=np.int32)
+        goal = np.asarray(self.gestures[name][pose], dtype=np.int32)
+        # 목표값도 key에 포함 → 제스처 값이 바뀌면 (hot reload) 자동으로 새로 계산
+        key = (name, pose, goal.tobytes(), start.tobytes())
+        traj = self._cache.get(key)
+        if traj is not None:
+            self._cache.move_to_end(key)
+            return traj
+
+        traj = self.compile_to(goal, start)
+        self._cache[key] = traj
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return traj
+
+    def compile_to(self, goal: np.ndarray, start: np.ndarray) -> Trajectory:
+        """Build the table from start to goal (not cached)"""
+        start = np.asarray(start, dtype=float)
+        delta = np.asarray(goal, dtype=float) - start
+        distance = float(np.abs(delta).max())
+        if distance == 0:
+            table = np.asarray(goal, dtype=np.int32)[None].copy()
+            return Trajectory(table, np.zeros(1), 0.0)
+
+        profile_fn = _trapezoid if self.profile == Profile.TRAPEZOID else _min_jerk
+        _, duration = profile_fn(distance, self.v_max, self.a_max, np.zeros(1))
+        n = int(math.ceil(duration * self.freq)) + 1
+        s, _ = profile_fn(distance, self.v_max, self.a_max, np.arange(n) / self.freq)
+        s[-1] = 1.0
+
+        table = np.empty((n,) + delta.shape, dtype=np.int32)
+        np.copyto(table, start + s[:, None, None] * delta, casting='unsafe')
+        remaining = np.abs(np.asarray(goal, dtype=float) - table).sum(axis=(1, 2))
+        return Trajectory(table, remaining, duration)
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+
+
+class TrajectoryPlayer:
+    """Step through a Trajectory one sample per control tick (table lookup only)"""
+
+    def __init__(self) -> None:
+        self.traj = None
+        self.index = 0
+
+    def load(self, traj: Trajectory) -> None:
+        self.traj = traj
+        self.index = 0
+
+    def step(self) -> Tuple[np.ndarray, float]:
+        """Return (cmd, remaining error) for the current tick and advance; holds the last sample"""
+        i = self.index
+        if i < len(self.traj.table) - 1:
+            self.index = i + 1
+        return self.traj.table[i], self.traj.remaining[i]
+
+    def done(self) -> bool:
+        return self.traj is None or self.index >= len(self.traj.table) - 1
@@ -1,6 +1,31 @@
+import math
+import time
 import grpc
 import Hand_pb2
 import Hand_pb2_grpc
+from hand_msg import pack_joints, unpack_joints
+
+ACTIVE_STATES = (Hand_pb2.MotionStatus.PENDING, Hand_pb2.MotionStatus.RUNNING)
+
+def command_stream(duration=5.0, freq=100):
+    """예제 setpoint 스트림: 검지~약지 굽힘 관절을 cos 파형으로 접었다 폈다 반복"""
+    t0 = time.perf_counter()
+    while (t := time.perf_counter() - t0) < duration:
+        flex = int(1500 * (1 - math.cos(2 * math.pi * 0.5 * t)))
+        positions = [[0, 0, 0, 0]] + [[0, flex, flex, flex]] * 3  # CAN ID 2~5 x 4 joints
+        yield Hand_pb2.ControlCommand(setpoint=Hand_pb2.JointSetpoint(positions=pack_joints(positions)))
+        time.sleep(1 / freq)
+
+def run_stream(stub):
+    # 하나의 HTTP/2 스트림으로 setpoint 전송 + 피드백 수신
+    count = 0
+    t0 = time.perf_counter()
+    for feedback in stub.StreamControl(command_stream()):
+        count += 1
+        if feedback.seq % 50 == 0:
+            targets, positions = unpack_joints(feedback.targets), unpack_joints(feedback.positions)
+            print(f"  seq={feedback.seq} target={targets[1].tolist()} pos={positions[1].tolist()}")
+    print(f"[결과] 피드백 {count}개, {count / (time.perf_counter() - t0):.1f} Hz")
 
 def run():
     with grpc.insecure_channel('localhost:50051') as channel:
@@ -8,10 +33,21 @@ def run():
         
         while True:
             print("\n=== gRPC Hand Control Menu ===")
-            print("1: Rock / 2: Scissors / 3: Paper / 4: Pencil Grip / 5: Exit")
+            print("1: Rock / 2: Scissors / 3: Paper / 4: Pencil Grip / 5: Exit / 6: Stream Demo")
+            print("7: Emergency Stop / 8: Clear Stop")
             choice = input("Enter choice: ")
 
             if choice == '5': break
+            if choice == '6':
+                run_stream(stub)
+                continue
+            if choice in ('7', '8'):
+                rpc = stub.EmergencyStop if choice == '7' else stub.ClearStop
+                response = rpc(Hand_pb2.StopRequest(all_hands=True))
+                print(f"[결과] {response.message}")
+                if choice == '7':
+                    print(f"  servo-off 송신 {response.sent_us:.0f} us, 응답 {response.confirmed_us:.0f} us")
+                continue
             
             # 매핑 처리
             gesture_type = {
@@ -27,8 +63,18 @@ def run():
                 
                 # 결과 출력
                 print(f"\n[결과] {response.message}")
-                for can_id, pos in response.finger_positions.items():
-                    print(f"  CAN ID {can_id}: {pos}")
+                for i, pos in enumerate(unpack_joints(response.target_positions)):
+                    print(f"  CAN ID {i + 2}: {pos.tolist()}")
+
+                # 실제 수렴할 때까지 대기 (서버 대기 슬롯이 없으면 바로 돌아오므로 끝날 때까지 다시 요청)
+                deadline = time.perf_counter() + 5.0
+                while True:
+                    status = stub.WaitMotion(Hand_pb2.MotionRequest(motion_id=response.motion_id, timeout=5.0))
+                    if status.state not in ACTIVE_STATES or time.perf_counter() > deadline:
+                        break
+                    time.sleep(0.05)
+                print(f"[완료] {Hand_pb2.MotionStatus.State.Name(status.state)} "
+                      f"(max error {status.max_error:.0f}) {status.message}")
             else:
                 print("Invalid input.")
 
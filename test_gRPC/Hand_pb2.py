@@ -24,23 +24,35 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\nHand.proto\x12\x0chand_control\"\x9b\x01\n\x0eGestureRequest\x12\x39\n\x07gesture\x18\x01 \x01(\x0e\x32(.hand_control.GestureRequest.GestureType\"N\n\x0bGestureType\x12\x08\n\x04ROCK\x10\x00\x12\x0c\n\x08SCISSORS\x10\x01\x12\t\n\x05PAPER\x10\x02\x12\x0f\n\x0bPENCIL_GRIP\x10\x03\x12\x0b\n\x07NEUTRAL\x10\x04\"\xb9\x01\n\x0fGestureResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12L\n\x10\x66inger_positions\x18\x03 \x03(\x0b\x32\x32.hand_control.GestureResponse.FingerPositionsEntry\x1a\x36\n\x14\x46ingerPositionsEntry\x12\x0b\n\x03key\x18\x01 \x01(\x05\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\x32P\n\x04Hand\x12H\n\x07Gesture\x12\x1c.hand_control.GestureRequest\x1a\x1d.hand_control.GestureResponse\"\x00\x62\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\nHand.proto\x12\x0chand_control\"\xa9\x01\n\x0eGestureRequest\x12\x39\n\x07gesture\x18\x01 \x01(\x0e\x32(.hand_control.GestureRequest.GestureType\x12\x0c\n\x04hand\x18\x02 \x01(\r\"N\n\x0bGestureType\x12\x08\n\x04ROCK\x10\x00\x12\x0c\n\x08SCISSORS\x10\x01\x12\t\n\x05PAPER\x10\x02\x12\x0f\n\x0bPENCIL_GRIP\x10\x03\x12\x0b\n\x07NEUTRAL\x10\x04\"|\n\x0fGestureResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x11\n\tmotion_id\x18\x04 \x01(\x04\x12\x18\n\x10target_positions\x18\x05 \x03(\x11\x12\x14\n\x0ctimestamp_us\x18\x06 \x01(\x03J\x04\x08\x03\x10\x04\"A\n\rMotionRequest\x12\x11\n\tmotion_id\x18\x01 \x01(\x04\x12\x0f\n\x07timeout\x18\x02 \x01(\x02\x12\x0c\n\x04hand\x18\x03 \x01(\r\"\xd8\x01\n\x0cMotionStatus\x12\x11\n\tmotion_id\x18\x01 \x01(\x04\x12/\n\x05state\x18\x02 \x01(\x0e\x32 .hand_control.MotionStatus.State\x12\x11\n\tmax_error\x18\x03 \x01(\x02\x12\x0f\n\x07message\x18\x04 \x01(\t\"`\n\x05State\x12\x0b\n\x07UNKNOWN\x10\x00\x12\x0b\n\x07PENDING\x10\x01\x12\x0b\n\x07RUNNING\x10\x02\x12\x08\n\x04\x44ONE\x10\x03\x12\n\n\x06\x46\x41ILED\x10\x04\x12\x0b\n\x07TIMEOUT\x10\x05\x12\r\n\tCANCELLED\x10\x06\".\n\x0bStopRequest\x12\x0c\n\x04hand\x18\x01 \x01(\r\x12\x11\n\tall_hands\x18\x02 \x01(\x08\"W\n\x0cStopResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x0f\n\x07sent_us\x18\x03 \x01(\x02\x12\x14\n\x0c\x63onfirmed_us\x18\x04 \x01(\x02\"\"\n\rJointSetpoint\x12\x11\n\tpositions\x18\x01 \x03(\x11\"}\n\x0e\x43ontrolCommand\x12/\n\x08setpoint\x18\x01 \x01(\x0b\x32\x1b.hand_control.JointSetpointH\x00\x12/\n\x07gesture\x18\x02 \x01(\x0b\x32\x1c.hand_control.GestureRequestH\x00\x42\t\n\x07\x63ommand\"V\n\rJointFeedback\x12\x0b\n\x03seq\x18\x01 \x01(\x04\x12\x14\n\x0ctimestamp_us\x18\x02 \x01(\x03\x12\x11\n\tpositions\x18\x03 \x03(\x11\x12\x0f\n\x07targets\x18\x04 \x03(\x11\x32\xc9\x03\n\x04Hand\x12H\n\x07Gesture\x12\x1c.hand_control.GestureRequest\x1a\x1d.hand_control.GestureResponse\"\x00\x12P\n\rStreamControl\x12\x1c.hand_control.ControlCommand\x1a\x1b.hand_control.JointFeedback\"\x00(\x01\x30\x01\x12L\n\x0fGetMotionStatus\x12\x1b.hand_control.MotionRequest\x1a\x1a.hand_control.MotionStatus\"\x00\x12G\n\nWaitMotion\x12\x1b.hand_control.MotionRequest\x1a\x1a.hand_control.MotionStatus\"\x00\x12H\n\rEmergencyStop\x12\x19.hand_control.StopRequest\x1a\x1a.hand_control.StopResponse\"\x00\x12\x44\n\tClearStop\x12\x19.hand_control.StopRequest\x1a\x1a.hand_control.StopResponse\"\x00\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'Hand_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
-  _globals['_GESTURERESPONSE_FINGERPOSITIONSENTRY']._loaded_options = None
-  _globals['_GESTURERESPONSE_FINGERPOSITIONSENTRY']._serialized_options = b'8\001'
   _globals['_GESTUREREQUEST']._serialized_start=29
-  _globals['_GESTUREREQUEST']._serialized_end=184
-  _globals['_GESTUREREQUEST_GESTURETYPE']._serialized_start=106
-  _globals['_GESTUREREQUEST_GESTURETYPE']._serialized_end=184
-  _globals['_GESTURERESPONSE']._serialized_start=187
-  _globals['_GESTURERESPONSE']._serialized_end=372
-  _globals['_GESTURERESPONSE_FINGERPOSITIONSENTRY']._serialized_start=318
-  _globals['_GESTURERESPONSE_FINGERPOSITIONSENTRY']._serialized_end=372
-  _globals['_HAND']._serialized_start=374
-  _globals['_HAND']._serialized_end=454
+  _globals['_GESTUREREQUEST']._serialized_end=198
+  _globals['_GESTUREREQUEST_GESTURETYPE']._serialized_start=120
+  _globals['_GESTUREREQUEST_GESTURETYPE']._serialized_end=198
+  _globals['_GESTURERESPONSE']._serialized_start=200
+  _globals['_GESTURERESPONSE']._serialized_end=324
+  _globals['_MOTIONREQUEST']._serialized_start=326
+  _globals['_MOTIONREQUEST']._serialized_end=391
+  _globals['_MOTIONSTATUS']._serialized_start=394
+  _globals['_MOTIONSTATUS']._serialized_end=610
+  _globals['_MOTIONSTATUS_STATE']._serialized_start=514
+  _globals['_MOTIONSTATUS_STATE']._serialized_end=610
+  _globals['_STOPREQUEST']._serialized_start=612
+  _globals['_STOPREQUEST']._serialized_end=658
+  _globals['_STOPRESPONSE']._serialized_start=660
+  _globals['_STOPRESPONSE']._serialized_end=747
+  _globals['_JOINTSETPOINT']._serialized_start=749
+  _globals['_JOINTSETPOINT']._serialized_end=783
+  _globals['_CONTROLCOMMAND']._serialized_start=785
+  _globals['_CONTROLCOMMAND']._serialized_end=910
+  _globals['_JOINTFEEDBACK']._serialized_start=912
+  _globals['_JOINTFEEDBACK']._serialized_end=998
+  _globals['_HAND']._serialized_start=1001
+  _globals['_HAND']._serialized_end=1458
 # @@protoc_insertion_point(module_scope)
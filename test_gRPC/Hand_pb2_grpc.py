@@ -39,6 +39,31 @@ class HandStub(object):
                 request_serializer=Hand__pb2.GestureRequest.SerializeToString,
                 response_deserializer=Hand__pb2.GestureResponse.FromString,
                 _registered_method=True)
+        self.StreamControl = channel.stream_stream(
+                '/hand_control.Hand/StreamControl',
+                request_serializer=Hand__pb2.ControlCommand.SerializeToString,
+                response_deserializer=Hand__pb2.JointFeedback.FromString,
+                _registered_method=True)
+        self.GetMotionStatus = channel.unary_unary(
+                '/hand_control.Hand/GetMotionStatus',
+                request_serializer=Hand__pb2.MotionRequest.SerializeToString,
+                response_deserializer=Hand__pb2.MotionStatus.FromString,
+                _registered_method=True)
+        self.WaitMotion = channel.unary_unary(
+                '/hand_control.Hand/WaitMotion',
+                request_serializer=Hand__pb2.MotionRequest.SerializeToString,
+                response_deserializer=Hand__pb2.MotionStatus.FromString,
+                _registered_method=True)
+        self.EmergencyStop = channel.unary_unary(
+                '/hand_control.Hand/EmergencyStop',
+                request_serializer=Hand__pb2.StopRequest.SerializeToString,
+                response_deserializer=Hand__pb2.StopResponse.FromString,
+                _registered_method=True)
+        self.ClearStop = channel.unary_unary(
+                '/hand_control.Hand/ClearStop',
+                request_serializer=Hand__pb2.StopRequest.SerializeToString,
+                response_deserializer=Hand__pb2.StopResponse.FromString,
+                _registered_method=True)
 
 
 class HandServicer(object):
@@ -50,6 +75,40 @@ class HandServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def StreamControl(self, request_iterator, context):
+        """연속 제어: setpoint/제스처 명령 스트림을 받고 제어 주기마다 관절 피드백을 스트리밍
+        (대상 손은 metadata 'hand', 기본 0)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetMotionStatus(self, request, context):
+        """Gesture는 motion_id를 즉시 반환, 완료 여부는 아래 RPC로 확인
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def WaitMotion(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def EmergencyStop(self, request, context):
+        """비상 정지: 제어 주기와 무관하게 바로 servo-off, ClearStop 전까지 명령 거부
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ClearStop(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_HandServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -58,6 +117,31 @@ def add_HandServicer_to_server(servicer, server):
                     request_deserializer=Hand__pb2.GestureRequest.FromString,
                     response_serializer=Hand__pb2.GestureResponse.SerializeToString,
             ),
+            'StreamControl': grpc.stream_stream_rpc_method_handler(
+                    servicer.StreamControl,
+                    request_deserializer=Hand__pb2.ControlCommand.FromString,
+                    response_serializer=Hand__pb2.JointFeedback.SerializeToString,
+            ),
+            'GetMotionStatus': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetMotionStatus,
+                    request_deserializer=Hand__pb2.MotionRequest.FromString,
+                    response_serializer=Hand__pb2.MotionStatus.SerializeToString,
+            ),
+            'WaitMotion': grpc.unary_unary_rpc_method_handler(
+                    servicer.WaitMotion,
+                    request_deserializer=Hand__pb2.MotionRequest.FromString,
+                    response_serializer=Hand__pb2.MotionStatus.SerializeToString,
+            ),
+            'EmergencyStop': grpc.unary_unary_rpc_method_handler(
+                    servicer.EmergencyStop,
+                    request_deserializer=Hand__pb2.StopRequest.FromString,
+                    response_serializer=Hand__pb2.StopResponse.SerializeToString,
+            ),
+            'ClearStop': grpc.unary_unary_rpc_method_handler(
+                    servicer.ClearStop,
+                    request_deserializer=Hand__pb2.StopRequest.FromString,
+                    response_serializer=Hand__pb2.StopResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'hand_control.Hand', rpc_method_handlers)
@@ -95,3 +179,138 @@ class Hand(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def StreamControl(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/hand_control.Hand/StreamControl',
+            Hand__pb2.ControlCommand.SerializeToString,
+            Hand__pb2.JointFeedback.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetMotionStatus(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/hand_control.Hand/GetMotionStatus',
+            Hand__pb2.MotionRequest.SerializeToString,
+            Hand__pb2.MotionStatus.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def WaitMotion(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/hand_control.Hand/WaitMotion',
+            Hand__pb2.MotionRequest.SerializeToString,
+            Hand__pb2.MotionStatus.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def EmergencyStop(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/hand_control.Hand/EmergencyStop',
+            Hand__pb2.StopRequest.SerializeToString,
+            Hand__pb2.StopResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ClearStop(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/hand_control.Hand/ClearStop',
+            Hand__pb2.StopRequest.SerializeToString,
+            Hand__pb2.StopResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -1,18 +1,71 @@
 import grpc
 from concurrent import futures
-import time
-from pcan_handler import PCANHandler, ServoStatus, ControlMode 
+import os
+import threading
+from pcan_handler import ServoStatus, ControlMode
+from bus_manager import BusManager
+from hand_filter import HandFilter, FilterMode
+from rt_scheduler import DeadlineScheduler, CatchUp
+from motion_executor import MotionExecutor, MotionState
+from hand_msg import pack_joints, unpack_joints, now_us, NUM_HAND_JOINTS
+from sim_hand import start_if_virtual
+from gesture_library import GestureLibrary, DEFAULT_PATH
+from estop import EmergencyStop
 from coppeliasim_zmqremoteapi_client import RemoteAPIClient
 import Hand_pb2
 import Hand_pb2_grpc
 
-GESTURES = {
-    'rock': {2: [2500, -1000, 2500, 3000], 3: [0, 3000, 3000, 3000], 4: [0, 3000, 3000, 3000], 5: [0, 3000, 3000, 3000]},
-    'scissors': {2: [2500, -1000, 2500, 3000], 3: [0, 0, 0, 0], 4: [0, 0, 0, 0], 5: [0, 3000, 3000, 3000]},
-    'paper': {2: [0, 0, 0, 0], 3: [0, 0, 0, 0], 4: [0, 0, 0, 0], 5: [0, 0, 0, 0]},
-    'grip_pencil': {2: [2000, -2600, 2500, 2500], 3: [-900, 2000, 2500, 2500], 4: [-1200, 3000, 2500, 2500], 5: [-1200, 3000, 3000, 3000]}
+# 제스처 라이브러리 (StateMachine 과 같은 파일 공유, HAND_GESTURES 로 변경 가능, 수정 시 자동 reload)
+GESTURE_FILE = os.environ.get('HAND_GESTURES', DEFAULT_PATH)
+
+# 요청 enum → 제스처 이름
+GESTURE_TYPE_MAP = {
+    Hand_pb2.GestureRequest.ROCK: 'rock',
+    Hand_pb2.GestureRequest.SCISSORS: 'scissors',
+    Hand_pb2.GestureRequest.PAPER: 'paper',
+    Hand_pb2.GestureRequest.PENCIL_GRIP: 'grip_pencil',
+    Hand_pb2.GestureRequest.NEUTRAL: 'paper'
+}
+
+# 제어할 손 목록 'channel:id_offset,...' (요청의 hand = 목록 순서)
+HAND_BUSES = os.environ.get('HAND_BUSES', 'PCAN_USBBUS1:0')
+
+CONTROL_FREQ = 100         # StreamControl 제어/피드백 주기 [Hz]
+MAX_JOINT_SPEED = 5000.0   # StreamControl 관절 최대 속도 [unit/s]
+MOTION_TOLERANCE = 50.0    # 제스처 완료 판단 관절 오차
+MOTION_TIMEOUT = 5.0       # 제스처 완료 제한 시간 [s]
+MAX_WAIT = 10.0            # WaitMotion 최대 대기 시간 [s]
+SERVER_WORKERS = 10        # gRPC worker thread 수
+MAX_WAITERS = 4            # 동시에 block 하는 WaitMotion 수 (나머지 worker 는 다른 RPC 용)
+
+MOTION_STATE_MAP = {
+    MotionState.PENDING: Hand_pb2.MotionStatus.PENDING,
+    MotionState.RUNNING: Hand_pb2.MotionStatus.RUNNING,
+    MotionState.DONE: Hand_pb2.MotionStatus.DONE,
+    MotionState.FAILED: Hand_pb2.MotionStatus.FAILED,
+    MotionState.TIMEOUT: Hand_pb2.MotionStatus.TIMEOUT,
+    MotionState.CANCELLED: Hand_pb2.MotionStatus.CANCELLED,
 }
 
+
+def parse_hand_index(hand, count):
+    """Validate a hand index from a request field or the 'hand' metadata string
+
+    Args:
+        hand: int or numeric string
+        count: Number of connected hands
+
+    Raises:
+        ValueError: Not an integer or outside 0 ~ count-1 (abort with INVALID_ARGUMENT)
+    """
+    try:
+        index = int(hand)
+    except (TypeError, ValueError):
+        raise ValueError(f"invalid hand {hand!r} (expected 0 ~ {count - 1})") from None
+    if not 0 <= index < count:
+        raise ValueError(f"unknown hand {index} ({count} connected)")
+    return index
+
 # GESTURES = {
 #     'rock': {2: 1.5, 3: 1.5, 4: 1.5, 5: 1.5},
 #     'scissors': {2: 1.5, 3: 0.0, 4: 0.0, 5: 1.5},
@@ -22,12 +75,33 @@ GESTURES = {
 
 class HandServicer(Hand_pb2_grpc.HandServicer):
     def __init__(self):
-        self.pcan = PCANHandler() # 서버 시작 시 하드웨어 연결
-        if self.pcan.is_connected():
-            print("PCAN Connected")
-            self.pcan.set_hand_status(ServoStatus.ON, ControlMode.POSITION)
-        else:
-            print("PCAN Connection Failed")
+        self.gestures = GestureLibrary(GESTURE_FILE, watch=True)
+        # 서버 시작 시 하드웨어 연결: channel 마다 TX/RX thread 1개, 같은 channel 의 손은 CAN ID offset 으로 구분
+        try:
+            self.bus = BusManager.from_spec(HAND_BUSES)
+        except Exception as e:
+            print(f"PCAN Connection Failed: {e}")
+            self.bus = BusManager()
+        self.hands = list(self.bus.hands.values())
+        # PCAN_INTERFACE=virtual 이면 손마다 시뮬레이션 손 사용
+        self.sim_hands = [start_if_virtual(hand.channel.channel, id_offset=hand.id_offset) for hand in self.hands]
+        for i, hand in enumerate(self.hands):
+            print(f"PCAN Connected: hand {i} = {hand.channel.channel} + {hand.id_offset}")
+            hand.set_hand_status(ServoStatus.ON, ControlMode.POSITION)
+        # 제스처는 손마다 전용 thread에서 실행 (gRPC worker는 바로 반환)
+        self.executors = [MotionExecutor(hand, freq=CONTROL_FREQ, max_speed=MAX_JOINT_SPEED) for hand in self.hands]
+        # 비상 정지는 gRPC worker thread 에서 바로 송신 (제어 주기/TX 큐 대기 없음)
+        self.estop = EmergencyStop(self.hands)
+        # 손마다 명령 주체는 하나: StreamControl 이 열려 있으면 제스처는 거부
+        self._streaming = [False] * len(self.hands)
+        self._owner_lock = threading.Lock()
+        self._waiters = threading.BoundedSemaphore(MAX_WAITERS)
+
+    def _hand_index(self, hand, context):
+        try:
+            return parse_hand_index(hand, len(self.hands))
+        except ValueError as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
     
     # def __init__(self):
     #     # 1. 코펠리아심 연결
@@ -63,35 +137,30 @@ class HandServicer(Hand_pb2_grpc.HandServicer):
 
     def Gesture(self, request, context):
     # 1. 요청에 따른 제스처 이름 매핑
-        mapping = {
-            Hand_pb2.GestureRequest.ROCK: 'rock',
-            Hand_pb2.GestureRequest.SCISSORS: 'scissors',
-            Hand_pb2.GestureRequest.PAPER: 'paper',
-            Hand_pb2.GestureRequest.PENCIL_GRIP: 'grip_pencil',
-            Hand_pb2.GestureRequest.NEUTRAL: 'paper'
-        }
+        mapping = GESTURE_TYPE_MAP
         
         # CAN ID와 손가락 이름 매핑 (시뮬레이션 관절 매핑용)
         id_to_finger = {2: 'thumb', 3: 'index', 4: 'middle', 5: 'ring'}
         
         gesture_name = mapping.get(request.gesture, 'paper')
-        target_values = GESTURES[gesture_name]
+        index = self._hand_index(request.hand, context)
+        executor = self.executors[index]
+        target_values = self.gestures.get_dict(gesture_name)
+        target = self.gestures.get(gesture_name)
 
-        print(f"[서버] {gesture_name} 동작 수행 중...")
+        print(f"[서버] hand {request.hand}: {gesture_name} 동작 시작...")
 
-        readings = {}
         # 2. 시뮬레이션 및 하드웨어 명령 전송
         for can_id, target_pos in target_values.items():
             finger_name = id_to_finger[can_id]
-            readings[can_id] = str(target_pos)
             print(f"[{finger_name}] Target Position: {target_pos}")
             
-            # --- 시뮬레이션 제어 추가 ---
+            # --- 시뮬레이션 제어 추가 (코펠리아심 연결 시) ---
             # 각 손가락의 4개 관절(joint_0~3)에 대해 제어 명령 전송
             # 실제 로봇의 구조에 따라 특정 joint에만 값을 주거나 비율을 조정할 수 있습니다.
             for i in range(4):
                 joint_key = f'{finger_name}_joint_{i}'
-                handle = self.joint_handles.get(joint_key)
+                handle = getattr(self, 'joint_handles', {}).get(joint_key)
                 if handle is not None:
                     # joint_0은 회전(Yaw), 1~3은 굽힘(Pitch)일 경우가 많으므로 
                     # 보통 1~3 관절에 굽힘 값(target_pos)을 적용합니다.
@@ -102,22 +171,137 @@ class HandServicer(Hand_pb2_grpc.HandServicer):
                         # joint_1, 2, 3 관절에 동일한 굽힘 각도 적용
                         self.sim.setJointTargetPosition(handle, target_pos)
 
-            # --- 하드웨어 제어 (주석 해제 시 동작) ---
-            # self.pcan.set_target_values(can_id, target_pos)
-        
-        # 시뮬레이션에서 동작이 반영될 시간 대기
-        time.sleep(0.5) 
+        # --- 하드웨어 제어: motion executor에 등록하고 바로 리턴 ---
+        with self._owner_lock:
+            if self._streaming[index]:
+                context.abort(grpc.StatusCode.FAILED_PRECONDITION,
+                              f"hand {index} is controlled by an active StreamControl")
+            motion = executor.submit(gesture_name, target,
+                                     tolerance=MOTION_TOLERANCE, timeout=MOTION_TIMEOUT)
 
-        # 3. 결과 리턴
+        # 3. 결과 리턴 (완료 여부는 WaitMotion / GetMotionStatus 로 확인)
         return Hand_pb2.GestureResponse(
             success=True,
-            message=f"{gesture_name} 시뮬레이션 적용 완료",
-            finger_positions=readings
+            message=f"{gesture_name} 동작 시작 (motion_id={motion.motion_id})",
+            target_positions=pack_joints(target),
+            timestamp_us=now_us(),
+            motion_id=motion.motion_id
         )
 
+    def _motion_status(self, executor, motion_id):
+        motion = executor.get(motion_id)
+        if motion is None:
+            return Hand_pb2.MotionStatus(motion_id=motion_id, state=Hand_pb2.MotionStatus.UNKNOWN,
+                                         message="unknown motion_id")
+        return Hand_pb2.MotionStatus(motion_id=motion_id, state=MOTION_STATE_MAP[motion.state],
+                                     max_error=motion.max_error, message=motion.message)
+
+    def GetMotionStatus(self, request, context):
+        executor = self.executors[self._hand_index(request.hand, context)]
+        return self._motion_status(executor, request.motion_id)
+
+    def WaitMotion(self, request, context):
+        executor = self.executors[self._hand_index(request.hand, context)]
+        motion = executor.get(request.motion_id)
+        # 대기 슬롯이 없으면 기다리지 않고 현재 상태 반환 (클라이언트가 다시 호출)
+        if motion is not None and not motion.future.done() and self._waiters.acquire(blocking=False):
+            try:
+                timeout = min(request.timeout or MAX_WAIT, MAX_WAIT)
+                motion.future.result(timeout=timeout)
+            except Exception:
+                pass # 아직 실행 중이면 현재 상태 반환
+            finally:
+                self._waiters.release()
+        return self._motion_status(executor, request.motion_id)
+
+    def _stop_targets(self, request, context):
+        if request.all_hands:
+            return list(range(len(self.hands)))
+        return [self._hand_index(request.hand, context)]
+
+    def EmergencyStop(self, request, context):
+        indices = self._stop_targets(request, context)
+        records = self.estop.trigger('rpc', [self.hands[i] for i in indices])
+        if not records:
+            return Hand_pb2.StopResponse(success=False, message="no hand connected")
+        sent_us = max(r.sent_us for r in records)
+        confirmed_us = max(r.confirmed_us for r in records)
+        print(f"[서버] !!! EMERGENCY STOP (hand {indices}) sent {sent_us:.0f} us, confirmed {confirmed_us:.0f} us")
+        return Hand_pb2.StopResponse(success=True, message=f"hand {indices} stopped",
+                                     sent_us=sent_us, confirmed_us=confirmed_us)
+
+    def ClearStop(self, request, context):
+        indices = self._stop_targets(request, context)
+        self.estop.clear([self.hands[i] for i in indices])
+        for i in indices:
+            self.executors[i].reset() # 정지 중 움직인 자세에서 다시 시작
+            self.hands[i].set_hand_status(ServoStatus.ON, ControlMode.POSITION)
+        print(f"[서버] emergency stop cleared (hand {indices})")
+        return Hand_pb2.StopResponse(success=True, message=f"hand {indices} servo on")
+
+    def StreamControl(self, request_iterator, context):
+        """Bidirectional stream: setpoint/gesture commands in, joint feedback out at CONTROL_FREQ"""
+        metadata = dict(context.invocation_metadata())
+        index = self._hand_index(metadata.get('hand', 0), context)
+        with self._owner_lock:
+            if self._streaming[index]:
+                context.abort(grpc.StatusCode.FAILED_PRECONDITION,
+                              f"hand {index} already has an active StreamControl")
+            self._streaming[index] = True
+        try:
+            # 실행 중인 제스처는 중단 (executor 가 송신을 멈춘 뒤 스트림 시작)
+            self.executors[index].cancel("superseded by StreamControl")
+            yield from self._stream(self.hands[index], request_iterator, context)
+        finally:
+            with self._owner_lock:
+                self._streaming[index] = False
+
+    def _stream(self, hand, request_iterator, context):
+        latest = [None]          # 최신 목표 자세 (4, 4), 통째로 교체 (latest-wins)
+        done = threading.Event()
+
+        def consume():
+            try:
+                for cmd in request_iterator:
+                    kind = cmd.WhichOneof('command')
+                    if kind == 'setpoint' and len(cmd.setpoint.positions) == NUM_HAND_JOINTS:
+                        latest[0] = unpack_joints(cmd.setpoint.positions)
+                    elif kind == 'gesture':
+                        latest[0] = self.gestures.get(GESTURE_TYPE_MAP.get(cmd.gesture.gesture, 'paper'))
+            except Exception as e:
+                print(f"[서버] StreamControl 수신 종료: {e}")
+            finally:
+                done.set()
+
+        threading.Thread(target=consume, daemon=True).start()
+
+        # 측정 위치에서 시작해서 최대 속도 제한으로 목표를 추종
+        hand_filter = HandFilter(FilterMode.RATE_LIMIT, dt=1/CONTROL_FREQ, max_rate=MAX_JOINT_SPEED)
+        hand_filter.reset(hand.get_hand_positions())
+        scheduler = DeadlineScheduler(1/CONTROL_FREQ, catch_up=CatchUp.SKIP)
+        scheduler.start()
+        seq = 0
+
+        while not done.is_set() and context.is_active():
+            target = latest[0]
+            if target is not None:
+                result = hand_filter.step(target)
+                hand.set_all_targets(result.cmd)
+
+            seq += 1
+            yield Hand_pb2.JointFeedback(
+                seq=seq,
+                timestamp_us=now_us(),
+                positions=pack_joints(hand.get_hand_positions()),
+                targets=pack_joints(hand_filter.cmd)
+            )
+            scheduler.wait()
+
 def serve():
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
-    Hand_pb2_grpc.add_HandServicer_to_server(HandServicer(), server)
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=SERVER_WORKERS))
+    servicer = HandServicer()
+    servicer.estop.install_signal_handler(chain=True) # Ctrl+C: 모든 손 servo-off 후 종료
+    Hand_pb2_grpc.add_HandServicer_to_server(servicer, server)
     server.add_insecure_port('[::]:50051')
     print("gRPC Hand Server started on 50051...")
     server.start()
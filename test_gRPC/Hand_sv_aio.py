@@ -0,0 +1,169 @@
+import asyncio
+import signal
+import grpc
+from async_pcan import AsyncPCANHandler
+from command_arbiter import CommandArbiter
+from pcan_handler import ServoStatus, ControlMode
+from hand_msg import pack_joints, unpack_joints, now_us, NUM_HAND_JOINTS
+from sim_hand import start_if_virtual
+from gesture_library import GestureLibrary
+from Hand_sv import (GESTURE_FILE, GESTURE_TYPE_MAP, HAND_BUSES, CONTROL_FREQ, MAX_JOINT_SPEED,
+                     MOTION_TOLERANCE, MOTION_TIMEOUT, MAX_WAIT, MOTION_STATE_MAP, parse_hand_index)
+import Hand_pb2
+import Hand_pb2_grpc
+
+# Hand_sv.py 와 같은 RPC 를 하나의 event loop 에서 처리하는 grpc.aio 서버
+# 손마다 CommandArbiter 하나가 버스를 소유하고, 모든 RPC 는 arbiter 에 명령만 넣음
+
+
+class AioHandServicer(Hand_pb2_grpc.HandServicer):
+    def __init__(self, arbiters):
+        self.gestures = GestureLibrary(GESTURE_FILE, watch=True)
+        self.arbiters = arbiters
+
+    async def _arbiter(self, hand, context):
+        try:
+            return self.arbiters[parse_hand_index(hand, len(self.arbiters))]
+        except ValueError as e:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+
+    async def Gesture(self, request, context):
+        arbiter = await self._arbiter(request.hand, context)
+        gesture_name = GESTURE_TYPE_MAP.get(request.gesture, 'paper')
+        target = self.gestures.get(gesture_name)
+        print(f"[서버] hand {request.hand}: {gesture_name} 동작 요청")
+
+        motion = arbiter.submit_gesture(gesture_name, target, tolerance=MOTION_TOLERANCE, timeout=MOTION_TIMEOUT)
+        return Hand_pb2.GestureResponse(
+            success=not motion.future.done(),
+            message=f"{gesture_name} 동작 등록 (motion_id={motion.motion_id}) {motion.message}".strip(),
+            target_positions=pack_joints(target),
+            timestamp_us=now_us(),
+            motion_id=motion.motion_id
+        )
+
+    def _motion_status(self, arbiter, motion_id):
+        motion = arbiter.get(motion_id)
+        if motion is None:
+            return Hand_pb2.MotionStatus(motion_id=motion_id, state=Hand_pb2.MotionStatus.UNKNOWN,
+                                         message="unknown motion_id")
+        return Hand_pb2.MotionStatus(motion_id=motion_id, state=MOTION_STATE_MAP[motion.state],
+                                     max_error=motion.max_error, message=motion.message)
+
+    async def GetMotionStatus(self, request, context):
+        arbiter = await self._arbiter(request.hand, context)
+        return self._motion_status(arbiter, request.motion_id)
+
+    async def WaitMotion(self, request, context):
+        arbiter = await self._arbiter(request.hand, context)
+        motion = arbiter.get(request.motion_id)
+        if motion is not None:
+            timeout = min(request.timeout or MAX_WAIT, MAX_WAIT)
+            try:
+                # shield: timeout 이 motion 의 future 까지 cancel 하지 않도록
+                await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(motion.future)), timeout)
+            except asyncio.TimeoutError:
+                pass # 아직 실행 중이면 현재 상태 반환
+        return self._motion_status(arbiter, request.motion_id)
+
+    async def _stop_targets(self, request, context):
+        if request.all_hands:
+            return list(range(len(self.arbiters)))
+        await self._arbiter(request.hand, context)
+        return [request.hand]
+
+    async def EmergencyStop(self, request, context):
+        """arbiter 의 제어 tick 을 기다리지 않고 바로 servo-off"""
+        indices = await self._stop_targets(request, context)
+        if not indices:
+            return Hand_pb2.StopResponse(success=False, message="no hand connected")
+        records = await asyncio.gather(*(self.arbiters[i].estop('rpc') for i in indices))
+        sent_us = max(r.sent_us for r in records)
+        confirmed_us = max(r.confirmed_us for r in records)
+        print(f"[서버] !!! EMERGENCY STOP (hand {indices}) sent {sent_us:.0f} us, confirmed {confirmed_us:.0f} us")
+        return Hand_pb2.StopResponse(success=True, message=f"hand {indices} stopped",
+                                     sent_us=sent_us, confirmed_us=confirmed_us)
+
+    async def ClearStop(self, request, context):
+        indices = await self._stop_targets(request, context)
+        for i in indices:
+            await self.arbiters[i].reset()
+        print(f"[서버] emergency stop cleared (hand {indices})")
+        return Hand_pb2.StopResponse(success=True, message=f"hand {indices} servo on")
+
+    async def StreamControl(self, request_iterator, context):
+        """setpoint 는 arbiter 로 (latest-wins), 피드백은 arbiter 의 제어 tick 마다 전송"""
+        metadata = dict(context.invocation_metadata())
+        arbiter = await self._arbiter(metadata.get('hand', 0), context)
+
+        async def consume():
+            try:
+                async for cmd in request_iterator:
+                    kind = cmd.WhichOneof('command')
+                    if kind == 'setpoint' and len(cmd.setpoint.positions) == NUM_HAND_JOINTS:
+                        arbiter.submit_setpoint(unpack_joints(cmd.setpoint.positions))
+                    elif kind == 'gesture':
+                        name = GESTURE_TYPE_MAP.get(cmd.gesture.gesture, 'paper')
+                        arbiter.submit_gesture(name, self.gestures.get(name),
+                                               tolerance=MOTION_TOLERANCE, timeout=MOTION_TIMEOUT)
+            except Exception as e:
+                print(f"[서버] StreamControl 수신 종료: {e}")
+
+        consumer = asyncio.create_task(consume())
+        try:
+            while not consumer.done():
+                seq = await arbiter.wait_tick()
+                yield Hand_pb2.JointFeedback(
+                    seq=seq,
+                    timestamp_us=now_us(),
+                    positions=pack_joints(arbiter.hand.get_hand_positions()),
+                    targets=pack_joints(arbiter.filter.cmd)
+                )
+        finally:
+            consumer.cancel()
+
+
+async def serve(port: int = 50051):
+    hands, arbiters, sim_hands = [], [], []
+    for item in HAND_BUSES.split(','):
+        channel, _, offset = item.strip().partition(':')
+        # AsyncPCANHandler 는 channel 을 직접 열기 때문에 손마다 다른 channel 이어야 함
+        if any(hand.channel == channel for hand in hands):
+            raise ValueError(f"{channel}: one hand per channel in the asyncio server")
+        sim_hand = start_if_virtual(channel, id_offset=int(offset or 0)) # PCAN_INTERFACE=virtual 이면 시뮬레이션 손
+        sim_hands.append(sim_hand)
+        hand = AsyncPCANHandler(channel, id_offset=int(offset or 0))
+        if not await hand.open():
+            print(f"PCAN Connection Failed ({item})")
+            continue
+        await hand.set_hand_status(ServoStatus.ON, ControlMode.POSITION)
+        await hand.wait_frame(1, timeout=0.5)
+        arbiter = CommandArbiter(hand, freq=CONTROL_FREQ, max_speed=MAX_JOINT_SPEED)
+        await arbiter.start()
+        hands.append(hand)
+        arbiters.append(arbiter)
+
+    server = grpc.aio.server()
+    Hand_pb2_grpc.add_HandServicer_to_server(AioHandServicer(arbiters), server)
+    server.add_insecure_port(f'[::]:{port}')
+    print(f"gRPC Hand Server (asyncio) started on {port}...")
+    await server.start()
+
+    async def shutdown():
+        # Ctrl+C: 모든 손 servo-off 후 종료
+        await asyncio.gather(*(arbiter.estop('signal SIGINT', confirm_timeout=0) for arbiter in arbiters))
+        await server.stop(0.5)
+    asyncio.get_running_loop().add_signal_handler(signal.SIGINT, lambda: asyncio.ensure_future(shutdown()))
+    try:
+        await server.wait_for_termination()
+    finally:
+        for arbiter in arbiters:
+            await arbiter.stop()
+        for hand in hands:
+            await hand.close()
+        for sim_hand in sim_hands:
+            if sim_hand is not None:
+                sim_hand.stop()
+
+if __name__ == "__main__":
+    asyncio.run(serve())
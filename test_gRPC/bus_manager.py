@@ -0,0 +1,351 @@
+import queue
+import threading
+import time
+import can
+import numpy as np
+from typing import Dict, Any, List, Optional, Union
+
+from hand_codec import HandCodec, HAND_IDS, to_array
+from pcan_handler import (PCAN_INTERFACE, CAN_FRAME_BITS, ServoStatus, ControlMode, FeedbackFrame,
+                          parse_frame)
+
+# 손 1개가 쓰는 CAN ID: 1 (status) + 2~5 (손가락), id_offset 만큼 이동
+HAND_ID_SPAN = 6
+
+
+class BusChannel:
+    """One CAN channel (adapter) shared by several hands
+
+    - TX thread: sends queued frames in order, optionally paced to bus_load
+    - RX thread: drains the bus and hands each frame to the hand owning its ID
+
+    Args:
+        channel: PCAN channel name (e.g. 'PCAN_USBBUS1')
+        bitrate: CAN bitrate
+        interface: python-can interface (default: PCAN_INTERFACE)
+        bus_load: Max bus load ratio (0.0 ~ 1.0) for TX pacing, None sends immediately
+        queue_size: Max queued TX batches (a full queue rejects new commands)
+    """
+
+    def __init__(self, channel: str, bitrate: int = 1000000, interface: Optional[str] = None,
+                 bus_load: Optional[float] = None, queue_size: int = 64) -> None:
+        self.channel = channel
+        self.bitrate = bitrate
+        self.interface = interface or PCAN_INTERFACE
+        self.bus_load = bus_load
+        self.hands: Dict[int, "HandPort"] = {}   # id_offset → hand
+        self._routes: Dict[int, tuple] = {}      # CAN ID → (hand, hand-local CAN ID)
+        self._frame_time = CAN_FRAME_BITS / bitrate
+        self._tx_queue = queue.Queue(maxsize=queue_size)
+        # python-can Bus 는 thread-safe 하지 않음: TX thread 와 send_now (e-stop) 가 같은 lock 사용
+        self._send_lock = threading.Lock()
+        self.tx_frames = 0
+        self.tx_errors = 0
+        self.tx_dropped = 0
+        self.rx_frames = 0
+        self.rx_unknown = 0
+        self.rx_errors = 0
+
+        self.bus = can.interface.Bus(interface=self.interface, channel=channel, bitrate=bitrate)
+        print(f"Connected to PCAN: interface={self.interface}, channel={channel}, bitrate={bitrate}")
+        self._running = True
+        self._tx_thread = threading.Thread(target=self._tx_loop, name=f"can_tx_{channel}", daemon=True)
+        self._rx_thread = threading.Thread(target=self._rx_loop, name=f"can_rx_{channel}", daemon=True)
+        self._tx_thread.start()
+        self._rx_thread.start()
+
+    def attach(self, hand: "HandPort") -> None:
+        ids = range(hand.id_offset + 1, hand.id_offset + HAND_ID_SPAN)
+        if any(can_id in self._routes for can_id in ids):
+            raise ValueError(f"{self.channel}: CAN IDs {ids.start}~{ids.stop - 1} already used by another hand")
+        for local_id, can_id in enumerate(ids, 1):
+            self._routes[can_id] = (hand, local_id)
+        self.hands[hand.id_offset] = hand
+
+    def send(self, hand: "HandPort", msgs: List[can.Message]) -> bool:
+        """Queue frames of a hand to be sent back-to-back (non-blocking)"""
+        try:
+            self._tx_queue.put_nowait((hand, msgs))
+            return True
+        except queue.Full:
+            self.tx_dropped += 1
+            return False
+
+    def _tx_loop(self) -> None:
+        tx_next = 0.0
+        while self._running:
+            try:
+                item = self._tx_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if item is None:
+                break
+            hand, msgs = item
+            for msg in msgs:
+                if hand.estopped:
+                    self.tx_dropped += 1  # e-stop 이후 큐에 남은 명령은 버림
+                    break
+                if self.bus_load:
+                    now = time.perf_counter()
+                    while now < tx_next:
+                        now = time.perf_counter()
+                    tx_next = max(now, tx_next) + self._frame_time / self.bus_load
+                try:
+                    with self._send_lock:
+                        self.bus.send(msg)
+                    self.tx_frames += 1
+                except Exception as e:
+                    self.tx_errors += 1
+                    print(f"Error sending frame on {self.channel}: {e}")
+
+    def _rx_loop(self) -> None:
+        while self._running:
+            try:
+                msg = self.bus.recv(timeout=0.1)
+            except Exception as e:
+                print(f"Error receiving frame on {self.channel}: {e}")
+                time.sleep(0.01)
+                continue
+            if msg is None:
+                continue
+
+            self.rx_frames += 1
+            route = self._routes.get(msg.arbitration_id)
+            if route is None:
+                self.rx_unknown += 1
+                continue
+            hand, local_id = route
+            try:
+                hand._on_frame(local_id, msg.data)
+            except Exception as e:
+                # 깨진 프레임 하나로 channel 의 모든 손 RX 가 멈추지 않도록 버리고 계속
+                self.rx_errors += 1
+                print(f"Error parsing frame on {self.channel} (ID {msg.arbitration_id}, {msg.data.hex()}): {e}")
+
+    def send_now(self, msg: can.Message) -> bool:
+        """Send from the caller's thread, ahead of everything queued (e-stop)
+
+        Waits at most for the one frame the TX thread may be sending.
+        """
+        try:
+            with self._send_lock:
+                self.bus.send(msg)
+            self.tx_frames += 1
+            return True
+        except Exception as e:
+            self.tx_errors += 1
+            print(f"Error sending frame on {self.channel}: {e}")
+            return False
+
+    def is_connected(self) -> bool:
+        return self._running
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'tx_frames': self.tx_frames,
+            'tx_errors': self.tx_errors,
+            'tx_dropped': self.tx_dropped,
+            'tx_queued': self._tx_queue.qsize(),
+            'rx_frames': self.rx_frames,
+            'rx_unknown': self.rx_unknown,
+            'rx_errors': self.rx_errors,
+        }
+
+    def close(self) -> None:
+        """Send what is still queued, then stop both threads and the bus"""
+        try:
+            self._tx_queue.put(None, timeout=1.0)
+        except queue.Full:
+            pass
+        self._tx_thread.join(timeout=1.0)
+        self._running = False
+        self._rx_thread.join(timeout=1.0)
+        try:
+            self.bus.shutdown()
+            print(f"PCAN bus closed: {self.channel}")
+        except Exception as e:
+            print(f"Error closing PCAN bus: {e}")
+
+
+class HandPort:
+    """One hand on a BusChannel, with the PCANHandler control/feedback API
+
+    CAN IDs on the bus are the hand's own IDs (1: status, 2-5: fingers)
+    plus id_offset; the API always uses the hand-local IDs 1-5.
+    Commands are queued to the channel's TX thread and return immediately;
+    feedback is filled in by the channel's RX thread (no start_reader needed).
+    """
+
+    def __init__(self, name: str, channel: BusChannel, id_offset: int = 0) -> None:
+        self.name = name
+        self.channel = channel
+        self.id_offset = id_offset
+        self._codec = HandCodec()
+        self._latest = [None] * HAND_ID_SPAN
+        self._seq = [0] * HAND_ID_SPAN
+        self.estopped = False
+        self._tx_lock = threading.Lock()  # 인코딩 버퍼를 여러 thread 가 동시에 쓰지 않도록
+        channel.attach(self)
+
+    def _message(self, can_id: int, data) -> can.Message:
+        return can.Message(arbitration_id=can_id + self.id_offset, data=data, is_extended_id=False)
+
+    def set_hand_status(self, status: ServoStatus, mode: ControlMode) -> bool:
+        """Set both servo status and control mode in a single message"""
+        if self.estopped and status != ServoStatus.OFF:
+            return False
+        data = bytearray(8)
+        data[0] = status.value & 0xFF
+        data[1] = mode.value & 0xFF
+        return self.channel.send(self, [self._message(1, data)])
+
+    def set_target_values(self, can_id: int, targets: list) -> bool:
+        """Set target values of one finger (CAN ID 2-5)"""
+        if not 2 <= can_id <= 5:
+            return False
+        return self.set_all_targets({can_id: targets})
+
+    def set_all_targets(self, targets: Union[Dict[int, list], np.ndarray], bus_load: Optional[float] = None) -> bool:
+        """Queue target values for several fingers as one batch
+
+        Args:
+            targets: {CAN ID (2-5): List of target values for 4 joints}
+                     or (4, 4) array for CAN ID 2-5
+            bus_load: Ignored, pacing is set per channel (BusChannel.bus_load)
+        """
+        if self.estopped:
+            return False
+        if isinstance(targets, dict):
+            if not all(2 <= can_id <= 5 for can_id in targets):
+                return False
+            can_ids = list(targets)
+            targets = to_array(targets)
+        else:
+            can_ids = HAND_IDS
+
+        with self._tx_lock:
+            try:
+                self._codec.encode(targets)
+            except Exception as e:
+                print(f"Error setting target values: {e}")
+                return False
+            # frame() 는 재사용 버퍼의 view → 큐에 넣기 전에 bytes 로 복사
+            msgs = [self._message(can_id, bytes(self._codec.frame(can_id))) for can_id in can_ids]
+        return self.channel.send(self, msgs)
+
+    def emergency_stop(self) -> bool:
+        """Servo off now from the caller's thread; queued target frames of this hand are dropped"""
+        self.estopped = True
+        data = bytearray(8)
+        data[0] = ServoStatus.OFF.value & 0xFF
+        data[1] = ControlMode.POSITION.value & 0xFF
+        return self.channel.send_now(self._message(1, data))
+
+    def clear_stop(self) -> None:
+        """Accept commands again after emergency_stop()"""
+        self.estopped = False
+
+    def is_stopped(self) -> bool:
+        return self.estopped
+
+    def _on_frame(self, can_id: int, data) -> None:
+        frame = parse_frame(self._codec, can_id, data)
+        if frame is None:
+            return
+        self._seq[can_id] += 1
+        self._latest[can_id] = FeedbackFrame(frame, time.perf_counter(), self._seq[can_id])
+
+    def start_reader(self) -> bool:
+        """Feedback always comes from the channel RX thread (kept for PCANHandler compatibility)"""
+        return self.is_connected()
+
+    def stop_reader(self) -> None:
+        pass
+
+    def get_latest(self, can_id: int) -> Optional[FeedbackFrame]:
+        """Get the latest frame received for a CAN ID (1: status, 2-5: positions)"""
+        if not 1 <= can_id <= 5:
+            return None
+        return self._latest[can_id]
+
+    def get_latest_positions(self, max_age: Optional[float] = None) -> Dict[int, list]:
+        """Get the latest joint positions of all fingers (see PCANHandler.get_latest_positions)"""
+        now = time.perf_counter()
+        positions = {}
+        for can_id in HAND_IDS:
+            latest = self._latest[can_id]
+            if latest is None:
+                continue
+            if max_age is not None and now - latest.timestamp > max_age:
+                continue
+            positions[can_id] = latest.frame['positions']
+        return positions
+
+    def get_hand_positions(self) -> np.ndarray:
+        """Get the last decoded positions of the whole hand as a (4, 4) int array (row i = CAN ID 2+i)"""
+        return self._codec.rx.astype(np.int32)
+
+    def is_connected(self) -> bool:
+        return self.channel.is_connected()
+
+    def close(self) -> None:
+        """Channels are closed by BusManager.close()"""
+        pass
+
+
+class BusManager:
+    """Several hands on several CAN channels in one process
+
+    Each channel is opened once and gets its own TX queue/thread and RX thread;
+    hands on the same channel are separated by CAN ID offsets.
+
+        manager = BusManager()
+        left = manager.add_hand('left', 'PCAN_USBBUS1', id_offset=0)
+        right = manager.add_hand('right', 'PCAN_USBBUS1', id_offset=16)
+
+    Args:
+        bitrate: CAN bitrate of every channel
+        interface: python-can interface (default: PCAN_INTERFACE)
+        bus_load: TX pacing of every channel (see BusChannel)
+    """
+
+    def __init__(self, bitrate: int = 1000000, interface: Optional[str] = None,
+                 bus_load: Optional[float] = None) -> None:
+        self.bitrate = bitrate
+        self.interface = interface
+        self.bus_load = bus_load
+        self.channels: Dict[str, BusChannel] = {}
+        self.hands: Dict[str, HandPort] = {}
+
+    @classmethod
+    def from_spec(cls, spec: str, **kwargs) -> "BusManager":
+        """Build from 'channel:offset,...' (e.g. 'PCAN_USBBUS1:0,PCAN_USBBUS1:16,PCAN_USBBUS2:0')
+
+        Hands are named by their index in the spec ('0', '1', ...).
+        """
+        manager = cls(**kwargs)
+        for i, item in enumerate(filter(None, (x.strip() for x in spec.split(',')))):
+            channel, _, offset = item.partition(':')
+            manager.add_hand(str(i), channel, int(offset or 0))
+        return manager
+
+    def add_hand(self, name: str, channel: str = 'PCAN_USBBUS1', id_offset: int = 0) -> HandPort:
+        if name in self.hands:
+            raise ValueError(f"hand '{name}' already exists")
+        if channel not in self.channels:
+            self.channels[channel] = BusChannel(channel, self.bitrate, self.interface, self.bus_load)
+        hand = HandPort(name, self.channels[channel], id_offset)
+        self.hands[name] = hand
+        return hand
+
+    def __getitem__(self, name: str) -> HandPort:
+        return self.hands[name]
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: channel.stats() for name, channel in self.channels.items()}
+
+    def close(self) -> None:
+        for channel in self.channels.values():
+            channel.close()
+        self.channels.clear()
+        self.hands.clear()
@@ -0,0 +1,187 @@
+import asyncio
+import itertools
+import math
+import time
+import numpy as np
+from collections import OrderedDict, deque
+from typing import Optional
+
+from async_pcan import AsyncPCANHandler
+from estop import StopRecord
+from hand_filter import HandFilter, FilterMode
+from motion_executor import Motion, MotionState
+from pcan_handler import ServoStatus, ControlMode
+
+
+class CommandArbiter:
+    """Single owner of one hand's bus; every RPC submits here instead of sending
+
+    - setpoint: latest wins, picked up on the next control tick
+    - gesture: exclusive, one at a time in arrival order; setpoints are
+      ignored while a gesture runs
+    - e-stop: immediate, the servo-off frame is sent from the caller's
+      coroutine, gestures are cancelled and commands are rejected until reset()
+
+    Target frames are only sent by the control-loop task, so commands of
+    different clients are merged per tick and never interleave on the bus.
+
+    Args:
+        hand: Opened AsyncPCANHandler
+        freq: Control rate [Hz]
+        max_speed: Max joint speed [units/s]
+        history: Number of finished motions kept for status queries
+    """
+
+    def __init__(self, hand: AsyncPCANHandler, freq: float = 100, max_speed: float = 5000.0,
+                 history: int = 100) -> None:
+        self.hand = hand
+        self.freq = freq
+        self.history = history
+        self.filter = HandFilter(FilterMode.RATE_LIMIT, dt=1/freq, max_rate=max_speed)
+        self.seq = 0
+        self.estopped = False
+        self.dropped_setpoints = 0
+        self.stop_records = deque(maxlen=history)
+        self._setpoint = None
+        self._motion = None
+        self._pending = deque()
+        self._motions = OrderedDict()
+        self._ids = itertools.count(1)
+        self._tick = None
+        self._task = None
+
+    async def start(self) -> None:
+        self.filter.reset(self.hand.get_hand_positions())
+        self._tick = asyncio.Condition()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    # --- commands ---
+
+    def submit_setpoint(self, target: np.ndarray) -> bool:
+        """Replace the streamed setpoint (False while a gesture runs or after e-stop)"""
+        if self.estopped or self._motion is not None or self._pending:
+            self.dropped_setpoints += 1
+            return False
+        self._setpoint = target
+        return True
+
+    def submit_gesture(self, name: str, target: np.ndarray, tolerance: float = 50.0,
+                       timeout: float = 5.0) -> Motion:
+        """Queue a gesture and return its Motion without waiting"""
+        motion = Motion(next(self._ids), name, np.asarray(target, dtype=float), tolerance, timeout)
+        self._motions[motion.motion_id] = motion
+        while len(self._motions) > self.history:
+            self._motions.popitem(last=False)
+        if self.estopped:
+            motion.finish(MotionState.FAILED, "emergency stop active")
+        else:
+            self._pending.append(motion)
+        return motion
+
+    def get(self, motion_id: int) -> Optional[Motion]:
+        return self._motions.get(motion_id)
+
+    async def estop(self, source: str = 'rpc', confirm_timeout: float = 0.05) -> StopRecord:
+        """Servo off right now, cancel all gestures and hold until reset()
+
+        Runs between two control ticks, so no target batch is half sent;
+        the control task sends nothing more once estopped is set.
+        """
+        t_trigger = time.perf_counter()
+        self.estopped = True
+        latest = self.hand.get_latest(1)
+        seq = latest.seq if latest is not None else 0
+        await self.hand.set_hand_status(ServoStatus.OFF, ControlMode.POSITION)
+        sent_us = (time.perf_counter() - t_trigger) * 1e6
+
+        self._setpoint = None
+        for motion in [self._motion, *self._pending]:
+            if motion is not None:
+                motion.finish(MotionState.CANCELLED, "emergency stop")
+        self._motion = None
+        self._pending.clear()
+
+        # servo-off status 응답까지의 시간
+        confirmed_us = math.nan
+        deadline = t_trigger + confirm_timeout
+        while (remain := deadline - time.perf_counter()) > 0:
+            latest = await self.hand.wait_frame(1, timeout=remain)
+            if latest is None:
+                break
+            if latest.seq > seq and latest.frame['servo_status'] == ServoStatus.OFF.value:
+                confirmed_us = (latest.timestamp - t_trigger) * 1e6
+                break
+        record = StopRecord(source, t_trigger, sent_us, confirmed_us)
+        self.stop_records.append(record)
+        return record
+
+    async def reset(self) -> bool:
+        """Leave e-stop: servo on, hold the measured pose"""
+        self.filter.reset(self.hand.get_hand_positions())
+        self._setpoint = None
+        self.estopped = False
+        return await self.hand.set_hand_status(ServoStatus.ON, ControlMode.POSITION)
+
+    async def wait_tick(self) -> int:
+        """Wait for the next control tick and return its seq"""
+        async with self._tick:
+            await self._tick.wait()
+        return self.seq
+
+    # --- control loop ---
+
+    def _next_motion(self) -> None:
+        if self._motion is None and self._pending:
+            self._motion = self._pending.popleft()
+            self._motion.state = MotionState.RUNNING
+            self._motion.t_start = time.perf_counter()
+
+    def _step_motion(self, motion: Motion, error_max: float) -> None:
+        measured = self.hand.get_latest_positions(max_age=5/self.freq)
+        if len(measured) == 4:
+            motion.max_error = max(float(np.abs(motion.target[can_id - 2] - positions).max())
+                                   for can_id, positions in measured.items())
+            if error_max == 0 and motion.max_error <= motion.tolerance:
+                motion.finish(MotionState.DONE, "converged")
+        if not motion.future.done() and time.perf_counter() - motion.t_start > motion.timeout:
+            motion.finish(MotionState.TIMEOUT, f"not converged (max error {motion.max_error:.0f})")
+        if motion.future.done():
+            self._motion = None
+            self._setpoint = motion.target  # 다음 setpoint 가 올 때까지 제스처 자세 유지
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+        while True:
+            if not self.estopped:
+                self._next_motion()
+                motion = self._motion
+                target = motion.target if motion is not None else self._setpoint
+                if target is not None:
+                    result = self.filter.step(target)
+                    if not await self.hand.send_targets(result.cmd):
+                        if motion is not None:
+                            motion.finish(MotionState.FAILED, "PCAN send failed")
+                            self._motion = None
+                    elif motion is not None:
+                        self._step_motion(motion, result.error_max)
+
+            self.seq += 1
+            async with self._tick:
+                self._tick.notify_all()
+
+            deadline += 1/self.freq
+            delay = deadline - loop.time()
+            if delay < 0:
+                deadline = loop.time()  # 밀린 tick 은 건너뜀
+                delay = 0
+            await asyncio.sleep(delay)
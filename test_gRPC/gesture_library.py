@@ -0,0 +1,162 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+import numpy as np
+from typing import Callable, Dict, List, Optional, Union
+
+from hand_codec import HAND_IDS, NUM_FINGERS, NUM_JOINTS
+
+POSES = ('ready', 'set')
+# Test_code 와 test_gRPC 의 사본 모두 Test_code/gestures.json 하나를 공유
+DEFAULT_PATH = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                             '..', 'Test_code', 'gestures.json'))
+
+
+class GestureTables:
+    """Immutable snapshot of a gesture library file
+
+    - arrays: (n, 2, 4, 4) int32, [gesture index, pose(ready/set), CAN ID 2~5, joint]
+    - has_pose: (n, 2) bool, False if the gesture has no such pose
+    - checksums: CRC32 of each gesture's arrays (changes when values change)
+    """
+
+    def __init__(self, data: dict, digest: str) -> None:
+        gestures = data['gestures']
+        n = len(gestures)
+        self.digest = digest
+        self.names = [g['name'] for g in gestures]
+        self.ids = [int(g['id']) for g in gestures]
+        self.descriptions = [g.get('description', '') for g in gestures]
+        self.arrays = np.zeros((n, len(POSES), NUM_FINGERS, NUM_JOINTS), dtype=np.int32)
+        self.has_pose = np.zeros((n, len(POSES)), dtype=bool)
+
+        for i, g in enumerate(gestures):
+            for p, pose in enumerate(POSES):
+                if pose not in g:
+                    continue
+                for can_id, values in g[pose].items():
+                    if int(can_id) not in HAND_IDS or len(values) != NUM_JOINTS:
+                        raise ValueError(f"{g['name']}/{pose}: invalid CAN ID {can_id} or joint count")
+                    self.arrays[i, p, int(can_id) - HAND_IDS[0]] = values
+                self.has_pose[i, p] = True
+            if not self.has_pose[i, POSES.index('set')]:
+                raise ValueError(f"{g['name']}: 'set' pose is required")
+
+        self.arrays.flags.writeable = False
+        self.checksums = [zlib.crc32(self.arrays[i].tobytes()) for i in range(n)]
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.index.update({gid: i for i, gid in enumerate(self.ids)})
+        if len(set(self.names)) != n or len(set(self.ids)) != n:
+            raise ValueError("gesture names and ids must be unique")
+
+    def lookup(self, key: Union[str, int]) -> int:
+        """Gesture index from name or id (KeyError if unknown)"""
+        return self.index[key]
+
+
+class GestureLibrary:
+    """Gesture store loaded from a JSON file, with file-watch hot reload
+
+    Lookups always go through the current GestureTables snapshot; a reload
+    builds a new snapshot and swaps the reference in one assignment, so the
+    control loop or gRPC handlers never see a half-updated table.
+    A file that fails to parse keeps the previous tables.
+
+    Args:
+        path: Library file (default: Test_code/gestures.json)
+        watch: Start the hot-reload watcher
+        poll_interval: File check period [s]
+    """
+
+    def __init__(self, path: Optional[str] = None, watch: bool = False, poll_interval: float = 0.5) -> None:
+        self.path = path or DEFAULT_PATH
+        self.poll_interval = poll_interval
+        self.tables = self._load()
+        self._mtime = os.path.getmtime(self.path)
+        self._callbacks: List[Callable[[GestureTables], None]] = []
+        self._watcher = None
+        self._watching = False
+        if watch:
+            self.start_watch()
+
+    def _load(self) -> GestureTables:
+        with open(self.path, 'rb') as f:
+            raw = f.read()
+        return GestureTables(json.loads(raw.decode('utf-8')), hashlib.sha256(raw).hexdigest())
+
+    def reload(self) -> bool:
+        """Reload the file now; returns True if the tables changed"""
+        try:
+            tables = self._load()
+        except Exception as e:
+            print(f"Gesture library reload failed (keeping previous tables): {e}")
+            return False
+        if tables.digest == self.tables.digest:
+            return False
+        self.tables = tables
+        print(f"Gesture library reloaded: {len(tables.names)} gestures from {self.path}")
+        for callback in self._callbacks:
+            callback(tables)
+        return True
+
+    def on_reload(self, callback: Callable[[GestureTables], None]) -> None:
+        self._callbacks.append(callback)
+
+    def start_watch(self) -> None:
+        if self._watching:
+            return
+        self._watching = True
+        self._watcher = threading.Thread(target=self._watch, name="gesture_watch", daemon=True)
+        self._watcher.start()
+
+    def stop_watch(self) -> None:
+        self._watching = False
+        if self._watcher is not None:
+            self._watcher.join(timeout=1.0)
+            self._watcher = None
+
+    def _watch(self) -> None:
+        while self._watching:
+            try:
+                mtime = os.path.getmtime(self.path)
+            except OSError:
+                mtime = self._mtime
+            if mtime != self._mtime:
+                self._mtime = mtime
+                self.reload()
+            time.sleep(self.poll_interval)
+
+    # --- lookups (current snapshot) ---
+
+    def names(self) -> List[str]:
+        return list(self.tables.names)
+
+    def has_pose(self, key: Union[str, int], pose: str) -> bool:
+        tables = self.tables
+        return bool(tables.has_pose[tables.lookup(key), POSES.index(pose)])
+
+    def get(self, key: Union[str, int], pose: str = 'set') -> np.ndarray:
+        """(4, 4) read-only int32 array of a gesture pose (row i = CAN ID 2+i)"""
+        tables = self.tables
+        i, p = tables.lookup(key), POSES.index(pose)
+        if not tables.has_pose[i, p]:
+            raise KeyError(f"{key} has no '{pose}' pose")
+        return tables.arrays[i, p]
+
+    def get_dict(self, key: Union[str, int], pose: str = 'set') -> Dict[int, list]:
+        """Pose as {CAN ID: [4 joints]}"""
+        arr = self.get(key, pose)
+        return {can_id: arr[i].tolist() for i, can_id in enumerate(HAND_IDS)}
+
+    def checksum(self, key: Union[str, int]) -> int:
+        tables = self.tables
+        return tables.checksums[tables.lookup(key)]
+
+    def __getitem__(self, key: Union[str, int]) -> Dict[str, np.ndarray]:
+        """{pose: array} of a gesture, for code indexing gestures[name][pose]"""
+        tables = self.tables
+        i = tables.lookup(key)
+        return {pose: tables.arrays[i, p] for p, pose in enumerate(POSES) if tables.has_pose[i, p]}
@@ -0,0 +1,28 @@
+import time
+import numpy as np
+
+from hand_codec import NUM_FINGERS, NUM_JOINTS
+
+# Hand.proto 의 repeated sint32 관절 필드: CAN ID 2~5 x joint 0~3 = 16개
+NUM_HAND_JOINTS = NUM_FINGERS * NUM_JOINTS
+
+
+def pack_joints(positions) -> list:
+    """(4, 4) array (row i = CAN ID 2+i) -> 16 ints for a repeated sint32 field"""
+    return np.asarray(positions, dtype=np.int32).ravel().tolist()
+
+
+def unpack_joints(values) -> np.ndarray:
+    """16 ints from a repeated sint32 field -> (4, 4) int32 array
+
+    Raises:
+        ValueError: if the field does not hold exactly 16 joints
+    """
+    if len(values) != NUM_HAND_JOINTS:
+        raise ValueError(f"expected {NUM_HAND_JOINTS} joints, got {len(values)}")
+    return np.fromiter(values, dtype=np.int32, count=NUM_HAND_JOINTS).reshape(NUM_FINGERS, NUM_JOINTS)
+
+
+def now_us() -> int:
+    """Timestamp for *_us fields (unix time, us)"""
+    return time.time_ns() // 1000
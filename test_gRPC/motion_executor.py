@@ -0,0 +1,162 @@
+import itertools
+import queue
+import threading
+import time
+import numpy as np
+from collections import OrderedDict
+from concurrent.futures import Future
+from enum import Enum
+from typing import NamedTuple, Optional
+
+from hand_filter import HandFilter, FilterMode
+from rt_scheduler import DeadlineScheduler, CatchUp
+
+
+class MotionState(Enum):
+    PENDING = 0
+    RUNNING = 1
+    DONE = 2        # 측정 위치가 tolerance 이내로 수렴
+    FAILED = 3      # PCAN 송신 실패 등
+    TIMEOUT = 4     # timeout 안에 수렴하지 못함
+    CANCELLED = 5   # 다음 제스처에 의해 중단
+
+
+class Motion:
+    """One gesture execution; future resolves with the final MotionState"""
+
+    def __init__(self, motion_id: int, name: str, target: np.ndarray, tolerance: float, timeout: float) -> None:
+        self.motion_id = motion_id
+        self.name = name
+        self.target = target
+        self.tolerance = tolerance
+        self.timeout = timeout
+        self.state = MotionState.PENDING
+        self.max_error = float('nan')  # 최근 측정 위치와 목표의 최대 관절 오차
+        self.message = ""
+        self.future = Future()
+
+    def finish(self, state: MotionState, message: str = "") -> None:
+        self.state = state
+        self.message = message
+        if not self.future.done():
+            self.future.set_result(state)
+
+
+class _CancelRequest(NamedTuple):
+    done: threading.Event
+    message: str
+
+
+class MotionExecutor:
+    """Run gestures on a dedicated thread and resolve them from PCAN feedback
+
+    submit() returns immediately. A newer motion cancels the running one.
+    A motion is DONE when every measured joint (latest frame table of the
+    PCAN reader) is within tolerance of the target.
+
+    Args:
+        pcan: PCANHandler with the reader thread started
+        freq: Control rate [Hz]
+        max_speed: Max joint speed [units/s]
+        history: Number of finished motions kept for status queries
+    """
+
+    def __init__(self, pcan, freq: float = 100, max_speed: float = 5000.0, history: int = 100) -> None:
+        self.pcan = pcan
+        self.freq = freq
+        self.history = history
+        self._filter = HandFilter(FilterMode.RATE_LIMIT, dt=1/freq, max_rate=max_speed)
+        self._filter.reset(pcan.get_hand_positions())
+        self._ids = itertools.count(1)
+        self._motions = OrderedDict()
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="motion_executor", daemon=True)
+        self._thread.start()
+
+    def submit(self, name: str, target: np.ndarray, tolerance: float = 50.0, timeout: float = 5.0) -> Motion:
+        """Queue a motion toward target (4, 4) and return it without waiting"""
+        motion = Motion(next(self._ids), name, np.asarray(target, dtype=float), tolerance, timeout)
+        with self._lock:
+            self._motions[motion.motion_id] = motion
+            while len(self._motions) > self.history:
+                self._motions.popitem(last=False)
+        self._queue.put(motion)
+        return motion
+
+    def get(self, motion_id: int) -> Optional[Motion]:
+        with self._lock:
+            return self._motions.get(motion_id)
+
+    def cancel(self, message: str = "cancelled", timeout: float = 1.0) -> bool:
+        """Cancel the running motion and wait until the executor has stopped sending
+
+        Returns:
+            False if the executor thread did not answer within timeout
+        """
+        request = _CancelRequest(threading.Event(), message)
+        self._queue.put(request)
+        return request.done.wait(timeout)
+
+    def reset(self) -> None:
+        """Restart from the measured pose (e.g. after an emergency stop)"""
+        self._filter.reset(self.pcan.get_hand_positions())
+
+    def stop(self) -> None:
+        self._running = False
+        self._queue.put(None)
+        self._thread.join(timeout=1.0)
+
+    def _run(self) -> None:
+        scheduler = DeadlineScheduler(1/self.freq, catch_up=CatchUp.SKIP)
+        motion = None
+        while self._running:
+            # 대기 중이면 다음 motion까지 block, 실행 중이면 새 motion만 확인
+            try:
+                new_motion = self._queue.get(timeout=0.5) if motion is None else self._queue.get_nowait()
+            except queue.Empty:
+                new_motion = None
+            if isinstance(new_motion, _CancelRequest):
+                if motion is not None:
+                    motion.finish(MotionState.CANCELLED, new_motion.message)
+                motion = None
+                new_motion.done.set()
+                continue
+            if new_motion is not None:
+                if motion is not None:
+                    motion.finish(MotionState.CANCELLED, f"superseded by motion {new_motion.motion_id}")
+                motion = new_motion
+                # 스트림 등으로 손이 움직였을 수 있으므로 매번 측정 위치에서 시작
+                self._filter.reset(self.pcan.get_hand_positions())
+                motion.state = MotionState.RUNNING
+                motion.t_start = time.perf_counter()
+                scheduler.start()
+            if motion is None:
+                continue
+
+            result = self._filter.step(motion.target)
+            if not self.pcan.set_all_targets(result.cmd):
+                if self.pcan.is_stopped():
+                    motion.finish(MotionState.CANCELLED, "emergency stop")
+                else:
+                    motion.finish(MotionState.FAILED, "PCAN send failed")
+                motion = None
+                continue
+
+            # 측정 위치 기준 수렴 판단 (4개 CAN ID 모두 최근 프레임이 있을 때만)
+            measured = self.pcan.get_latest_positions(max_age=5/self.freq)
+            if len(measured) == 4:
+                motion.max_error = max(float(np.abs(motion.target[can_id - 2] - positions).max())
+                                       for can_id, positions in measured.items())
+                if result.error_max == 0 and motion.max_error <= motion.tolerance:
+                    motion.finish(MotionState.DONE, "converged")
+                    motion = None
+                    continue
+
+            if time.perf_counter() - motion.t_start > motion.timeout:
+                motion.finish(MotionState.TIMEOUT, f"not converged (max error {motion.max_error:.0f})")
+                motion = None
+                continue
+
+            scheduler.wait()
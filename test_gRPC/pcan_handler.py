@@ -1,7 +1,11 @@
 import can
+import os
 import time
+import threading
 from enum import Enum
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, NamedTuple, Union
+import numpy as np
+from hand_codec import HandCodec, HAND_IDS, NUM_JOINTS, INT16_MIN, INT16_MAX, to_array
 
 class ControlMode(Enum):
     VOLTAGE = 0x0000
@@ -11,22 +15,61 @@ class ServoStatus(Enum):
     OFF = 0x0000
     ON = 0x00FF
 
+class FeedbackFrame(NamedTuple):
+    """Latest parsed frame of one CAN ID (immutable, swapped as a whole by the reader)"""
+    frame: Dict[str, Any]  # receive_frame 형식의 파싱 결과
+    timestamp: float       # 수신 시각 (time.perf_counter)
+    seq: int               # 해당 CAN ID의 수신 카운터
+
+# python-can interface: 'pcan' (USB adapter) or 'virtual' (hardware-free, see sim_hand.py)
+PCAN_INTERFACE = os.environ.get('PCAN_INTERFACE', 'pcan')
+
+# Worst-case bit length of a standard 8-byte data frame (stuff bits + IFS included)
+CAN_FRAME_BITS = 135
+
+def parse_frame(codec: HandCodec, can_id: int, data) -> Optional[Dict[str, Any]]:
+    """Parse a received frame (CAN ID 1: status, 2-5: positions decoded into codec.rx)"""
+    if can_id == 1:  # Status message
+        # D1: Servo status (1 byte), D2: Control mode (1 byte)
+        return {
+            'can_id': can_id,
+            'servo_status': data[0],
+            'control_mode': data[1]
+        }
+    elif 2 <= can_id <= 5:  # Position feedback
+        # Parse 4 joint positions (big-endian int16 each)
+        return {
+            'can_id': can_id,
+            'positions': codec.decode(can_id, data).tolist()
+        }
+    return None
+
 class PCANHandler:
-    _instance = None
+    """One hand on one CAN channel (single-thread TX on the caller's thread)
 
-    def __new__(cls, *args, **kwargs):
-        if cls._instance is None:
-            cls._instance = super(PCANHandler, cls).__new__(cls)
-        return cls._instance
+    Every PCANHandler() opens its own connection: PCANHandler('PCAN_USBBUS2')
+    opens a second adapter, and an adapter can only be opened once, so share
+    the handler instead of constructing it again for the same channel.
+    For several hands per channel or a TX thread per channel use bus_manager.BusManager.
+    """
 
-    def __init__(self, channel='PCAN_USBBUS1', bitrate=1000000) -> None:
-        if hasattr(self, '_initialized') and self._initialized:
-            return
+    def __init__(self, channel='PCAN_USBBUS1', bitrate=1000000, interface=None) -> None:
         self.bus = None
-        self._initialized = True
         self._is_connected = False
         self._channel = channel
         self._bitrate = bitrate
+        self._interface = interface or PCAN_INTERFACE
+        self._frame_time = CAN_FRAME_BITS / bitrate  # 프레임 1개가 버스를 점유하는 시간 [s]
+        self._tx_next = 0.0                         # pacing 사용 시 다음 프레임 송신 가능 시각
+        self._codec = HandCodec()
+        # set_* 는 여러 thread 에서 호출될 수 있음: 인코딩 버퍼와 bus.send 를 함께 보호
+        self._tx_lock = threading.RLock()
+        # Reader thread: CAN ID(0~5)별 최신 프레임. 슬롯 단위로 통째로 교체하므로 lock 불필요
+        self._latest = [None] * 6
+        self._reader = None
+        self._reader_running = False
+        # E-stop: set from any thread, rejects further target/servo-on frames until clear_stop()
+        self._estop = False
         
         try:
             self._connect_to_bus()
@@ -45,9 +88,9 @@ class PCANHandler:
                 self.bus = None
                 time.sleep(0.1)
             
-            self.bus = can.interface.Bus(bustype='pcan', channel=self._channel, bitrate=self._bitrate)
+            self.bus = can.interface.Bus(interface=self._interface, channel=self._channel, bitrate=self._bitrate)
             self._is_connected = True
-            print(f"Connected to PCAN: channel={self._channel}, bitrate={self._bitrate}")
+            print(f"Connected to PCAN: interface={self._interface}, channel={self._channel}, bitrate={self._bitrate}")
             return True
                 
         except Exception as e:
@@ -64,6 +107,8 @@ class PCANHandler:
         """
         if not self._is_connected or self.bus is None:
             return False
+        if self._estop and status != ServoStatus.OFF:
+            return False
             
         try:
             data = bytearray(8)
@@ -76,13 +121,41 @@ class PCANHandler:
             print("Setting servo status: ", data)
 
             msg = can.Message(arbitration_id=1, data=data, is_extended_id=False)
-            self.bus.send(msg)
+            with self._tx_lock:
+                self.bus.send(msg)
             time.sleep(0.001)
             return True
         except Exception as e:
             print(f"Error setting hand status: {e}")
             return False
 
+    def _encode_targets(self, can_id: int, targets: list) -> can.Message:
+        """Build the CAN message for one finger (4 joints, 2 bytes each)"""
+        # 4 joints x big-endian int16 (D1-D2, D3-D4, D5-D6, D7-D8), saturated to int16
+        n = min(len(targets), NUM_JOINTS)
+        values = np.zeros(NUM_JOINTS, dtype='>i2')
+        np.clip(targets[:n], INT16_MIN, INT16_MAX, out=values[:n], casting='unsafe')
+        data = values.tobytes()
+
+        return can.Message(arbitration_id=can_id, data=data, is_extended_id=False)
+
+    def _send_paced(self, msg: can.Message, bus_load: Optional[float]) -> None:
+        """Send a message, optionally keeping our share of the bus below bus_load
+
+        Args:
+            msg: message to send
+            bus_load: max bus load ratio (0.0 ~ 1.0), None sends immediately
+        """
+        if bus_load:
+            now = time.perf_counter()
+            if now < self._tx_next:
+                # 남은 시간이 짧으므로 sleep 대신 busy-wait
+                while time.perf_counter() < self._tx_next:
+                    pass
+                now = self._tx_next
+            self._tx_next = now + self._frame_time / bus_load
+        self.bus.send(msg)
+
     def set_target_values(self, can_id: int, targets: list) -> bool:
         """Set target values for the actuators
         
@@ -90,22 +163,14 @@ class PCANHandler:
             can_id: CAN ID (2-5)
             targets: List of target values for 4 joints
         """
-        if not 2 <= can_id <= 5 or not self._is_connected or self.bus is None:
+        if not 2 <= can_id <= 5 or not self._is_connected or self.bus is None or self._estop:
             return False
             
         try:
-            data = bytearray(8)  # 8 bytes for 4 joints (2 bytes each)
-            
-            # Pack 4 joint values into the data field
-            # Each joint value uses 2 bytes (high byte and low byte)
-            for i in range(min(len(targets), 4)):
-                target = targets[i]
-                data[i*2] = (target >> 8) & 0xFF     # High byte (D1, D3, D5, D7)
-                data[i*2 + 1] = target & 0xFF        # Low byte (D2, D4, D6, D8)
-            
             # Send message only to the specified CAN ID
-            msg = can.Message(arbitration_id=can_id, data=data, is_extended_id=False)
-            self.bus.send(msg)
+            msg = self._encode_targets(can_id, targets)
+            with self._tx_lock:
+                self.bus.send(msg)
             
             time.sleep(0.001)
             return True
@@ -113,8 +178,85 @@ class PCANHandler:
             print(f"Error setting target values: {e}")
             return False
 
+    def set_all_targets(self, targets: Union[Dict[int, list], np.ndarray], bus_load: Optional[float] = None) -> bool:
+        """Set target values for several fingers in one batch
+
+        The whole hand is encoded in one vectorized call and the frames are
+        queued to the bus back-to-back, without the fixed 1 ms sleep of
+        set_target_values.
+
+        Args:
+            targets: {CAN ID (2-5): List of target values for 4 joints}
+                     or (4, 4) array for CAN ID 2-5
+            bus_load: Max bus load ratio (0.0 ~ 1.0) used for pacing the frames.
+                      None queues all frames immediately.
+        """
+        if not self._is_connected or self.bus is None or self._estop:
+            return False
+        if isinstance(targets, dict):
+            if not all(2 <= can_id <= 5 for can_id in targets):
+                return False
+            can_ids = list(targets)
+            targets = to_array(targets)
+        else:
+            can_ids = HAND_IDS
+
+        try:
+            with self._tx_lock:
+                self._codec.encode(targets)
+                msgs = [can.Message(arbitration_id=can_id, data=self._codec.frame(can_id), is_extended_id=False)
+                        for can_id in can_ids]
+                for msg in msgs:
+                    if self._estop:
+                        return False  # e-stop 이 들어오면 남은 프레임은 보내지 않음
+                    self._send_paced(msg, bus_load)
+            return True
+        except Exception as e:
+            print(f"Error setting target values: {e}")
+            return False
+
+    def emergency_stop(self) -> bool:
+        """Servo off immediately, from any thread
+
+        Target frames not yet sent are dropped (also in the driver queue if the
+        interface supports flushing) and later commands are rejected until clear_stop().
+        """
+        self._estop = True
+        if not self._is_connected or self.bus is None:
+            return False
+        try:
+            self.bus.flush_tx_buffer()
+        except NotImplementedError:
+            pass
+        except Exception as e:
+            print(f"Error flushing TX buffer: {e}")
+        try:
+            data = bytearray(8)
+            data[0] = ServoStatus.OFF.value & 0xFF
+            data[1] = ControlMode.POSITION.value & 0xFF
+            # 진행 중인 batch 는 _estop 을 보고 다음 프레임 전에 멈추므로 오래 기다리지 않음
+            with self._tx_lock:
+                self.bus.send(can.Message(arbitration_id=1, data=data, is_extended_id=False))
+            return True
+        except Exception as e:
+            print(f"Error sending emergency stop: {e}")
+            return False
+
+    def clear_stop(self) -> None:
+        """Accept commands again after emergency_stop()"""
+        self._estop = False
+
+    def is_stopped(self) -> bool:
+        return self._estop
+
+    def _parse_frame(self, msg: can.Message) -> Optional[Dict[str, Any]]:
+        """Parse a received CAN message into a dictionary"""
+        return parse_frame(self._codec, msg.arbitration_id, msg.data)
+
     def receive_frame(self, timeout: float = 0.01) -> Optional[Dict[str, Any]]:
         """Receive and parse a CAN frame
+
+        Do not use while the reader thread is running (frames would be split between both).
         
         Returns:
             Dictionary containing parsed data or None if no data received
@@ -126,41 +268,91 @@ class PCANHandler:
             msg = self.bus.recv(timeout=timeout)
             if msg is None:
                 return None
-                
-            can_id = msg.arbitration_id
-            data = msg.data
-            
-            if can_id == 1:  # Status message
-                # D1: Servo status (1 byte)
-                status1 = data[0]
-                # D2: Control mode (1 byte)
-                status2 = data[1]
-                return {
-                    'can_id': can_id,
-                    'servo_status': status1,
-                    'control_mode': status2
-                }
-            elif 2 <= can_id <= 5:  # Position feedback
-                positions = []
-                # Parse 4 joint positions (2 bytes each)
-                for i in range(4):
-                    position = (data[i*2] << 8) | data[i*2 + 1]
-                    # Convert to signed integer if in position mode
-                    if position > 32767:
-                        position -= 65536
-                    positions.append(position)
-                return {
-                    'can_id': can_id,
-                    'positions': positions
-                }
-            
-            return None
+            return self._parse_frame(msg)
         except Exception as e:
             print(f"Error receiving frame: {e}")
             return None
 
+    def start_reader(self) -> bool:
+        """Start a background thread that drains the bus into the latest-frame table"""
+        if not self._is_connected or self.bus is None:
+            return False
+        if self._reader_running:
+            return True
+
+        self._reader_running = True
+        self._reader = threading.Thread(target=self._reader_loop, name="pcan_reader", daemon=True)
+        self._reader.start()
+        return True
+
+    def stop_reader(self) -> None:
+        """Stop the background reader thread"""
+        self._reader_running = False
+        if self._reader is not None:
+            self._reader.join(timeout=1.0)
+            self._reader = None
+
+    def _reader_loop(self) -> None:
+        seq = [0] * 6
+        while self._reader_running:
+            try:
+                msg = self.bus.recv(timeout=0.1)
+            except Exception as e:
+                print(f"Error receiving frame: {e}")
+                time.sleep(0.01)
+                continue
+            if msg is None:
+                continue
+
+            try:
+                frame = self._parse_frame(msg)
+            except Exception as e:
+                # 짧거나 깨진 프레임 하나로 reader thread 가 죽지 않도록 버리고 계속
+                print(f"Error parsing frame (ID {msg.arbitration_id}, {msg.data.hex()}): {e}")
+                continue
+            if frame is None:
+                continue
+            can_id = frame['can_id']
+            seq[can_id] += 1
+            self._latest[can_id] = FeedbackFrame(frame, time.perf_counter(), seq[can_id])
+
+    def get_latest(self, can_id: int) -> Optional[FeedbackFrame]:
+        """Get the latest frame received for a CAN ID (1: status, 2-5: positions)
+
+        Returns:
+            FeedbackFrame or None if nothing has been received yet
+        """
+        if not 1 <= can_id <= 5:
+            return None
+        return self._latest[can_id]
+
+    def get_latest_positions(self, max_age: Optional[float] = None) -> Dict[int, list]:
+        """Get the latest joint positions of all fingers
+
+        Args:
+            max_age: Ignore frames older than this [s]. None accepts any age.
+
+        Returns:
+            {CAN ID (2-5): List of 4 joint positions} for the IDs received so far
+        """
+        now = time.perf_counter()
+        positions = {}
+        for can_id in range(2, 6):
+            latest = self._latest[can_id]
+            if latest is None:
+                continue
+            if max_age is not None and now - latest.timestamp > max_age:
+                continue
+            positions[can_id] = latest.frame['positions']
+        return positions
+
+    def get_hand_positions(self) -> np.ndarray:
+        """Get the last decoded positions of the whole hand as a (4, 4) int array (row i = CAN ID 2+i)"""
+        return self._codec.rx.astype(np.int32)
+
     def close(self) -> None:
         """Close the CAN bus connection"""
+        self.stop_reader()
         try:
             if self.bus is not None:
                 self.bus.shutdown()
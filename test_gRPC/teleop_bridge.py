@@ -0,0 +1,155 @@
+import threading
+import time
+import numpy as np
+from typing import Dict, Iterator, Optional, Tuple
+
+from hand_codec import NUM_FINGERS, NUM_JOINTS
+from rt_scheduler import DeadlineScheduler, CatchUp
+
+# JoyStick/Joystick_Test/modules/global_data.py 의 JoystickCommand 값
+JOY_ENABLE = 3
+JOY_TILT_U = 6       # 좌우 (left_right)
+JOY_TILT_V = 7       # 상하 (up_down)
+JOY_UPDATE_GAIN = 24 # trigger
+
+# axis command → 손 전체 (4, 4) 속도 방향 (row i = CAN ID 2+i, 1.0 = max_speed)
+DEFAULT_MAPPING = {
+    JOY_TILT_V: np.array([[0, 0, 0, 0],        # 상하: 검지~약지 굽힘/펴기
+                          [0, 1, 1, 1],
+                          [0, 1, 1, 1],
+                          [0, 1, 1, 1]], dtype=float),
+    JOY_TILT_U: np.array([[1, -1, 0, 0],       # 좌우: 엄지 opposition
+                          [0, 0, 0, 0],
+                          [0, 0, 0, 0],
+                          [0, 0, 0, 0]], dtype=float),
+    JOY_UPDATE_GAIN: np.array([[0, 0, 1, 1],   # trigger: 엄지 굽힘
+                               [0, 0, 0, 0],
+                               [0, 0, 0, 0],
+                               [0, 0, 0, 0]], dtype=float),
+}
+
+
+def limits_from_gestures(gestures, margin: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-joint (lower, upper) position range covered by every pose of a GestureLibrary"""
+    poses = [gestures.get(name, pose) for name in gestures.names()
+             for pose in ('ready', 'set') if gestures.has_pose(name, pose)]
+    poses = np.stack(poses)
+    return poses.min(axis=0) - margin, poses.max(axis=0) + margin
+
+
+class TeleopBridge:
+    """Joystick axes → per-joint velocity → rate-limited position targets at a fixed rate
+
+    Every tick the latest joystick snapshot is turned into a desired joint
+    velocity (sum of mapping[axis] * axis / full_scale * max_speed), the
+    commanded velocity follows it within max_accel, and the integrated
+    target is clamped to [lower, upper]. A stale or missing snapshot
+    ramps the hand to a stop, so a dead joystick never keeps the hand moving.
+
+        bridge = TeleopBridge(joystick_manager)
+        bridge.run(pcan)                        # PCANHandler / HandPort
+        for cmd in bridge.setpoints(start): ... # e.g. gRPC StreamControl
+
+    Args:
+        source: Anything with latest() → snapshot with .timestamp (time.perf_counter),
+                .axes {command: value} and .buttons {command: pressed} (JoystickManager)
+        freq: Streaming rate [Hz]
+        max_speed: Joint speed at full deflection [units/s]
+        max_accel: Max change of joint speed [units/s^2]
+        full_scale: Axis value at full deflection (JoystickManager applies its gain, 0.2 by default)
+        mapping: {axis command: (4, 4) velocity direction}, default DEFAULT_MAPPING
+        lower, upper: Joint position limits (scalar or (4, 4)), None for no limit
+        input_timeout: Snapshots older than this [s] count as no input
+        require_enable: Move only while the ENABLE button is held (dead man switch)
+    """
+
+    def __init__(self, source, freq: float = 100.0, max_speed: float = 3000.0, max_accel: float = 20000.0,
+                 full_scale: float = 0.2, mapping: Optional[Dict[int, np.ndarray]] = None,
+                 lower=None, upper=None, input_timeout: float = 0.1, require_enable: bool = False) -> None:
+        self.source = source
+        self.freq = freq
+        self.dt = 1.0 / freq
+        self.max_speed = max_speed
+        self.max_step = max_accel * self.dt
+        self.full_scale = full_scale
+        mapping = DEFAULT_MAPPING if mapping is None else mapping
+        # axis 마다 (4, 4) 방향을 쌓아 두고 tick 마다 tensordot 한 번으로 속도 계산
+        self.commands = list(mapping)
+        self.directions = np.stack([np.asarray(mapping[c], dtype=float) for c in self.commands])
+        self.lower = -np.inf if lower is None else lower
+        self.upper = np.inf if upper is None else upper
+        self.input_timeout = input_timeout
+        self.require_enable = require_enable
+
+        self.target = np.zeros((NUM_FINGERS, NUM_JOINTS))
+        self.vel = np.zeros((NUM_FINGERS, NUM_JOINTS))
+        self.cmd = np.zeros((NUM_FINGERS, NUM_JOINTS), dtype=np.int32)
+        self.ticks = 0
+        self.stale_ticks = 0
+        self.running = False
+
+    def reset(self, positions) -> None:
+        """Start from the given (measured) hand positions at rest"""
+        self.target[...] = np.clip(positions, self.lower, self.upper)
+        self.vel[...] = 0.0
+        np.copyto(self.cmd, self.target, casting='unsafe')
+
+    def desired_velocity(self, snapshot, now: Optional[float] = None) -> np.ndarray:
+        """Joint velocity [units/s] requested by a snapshot (zero if stale, missing or not enabled)"""
+        now = time.perf_counter() if now is None else now
+        if snapshot is None or now - snapshot.timestamp > self.input_timeout:
+            self.stale_ticks += 1
+            return np.zeros_like(self.vel)
+        if self.require_enable and not snapshot.buttons.get(JOY_ENABLE, False):
+            return np.zeros_like(self.vel)
+        u = np.array([snapshot.axes.get(c, 0.0) for c in self.commands]) / self.full_scale
+        np.clip(u, -1.0, 1.0, out=u)
+        return np.tensordot(u, self.directions, axes=1) * self.max_speed
+
+    def step(self, snapshot=None, now: Optional[float] = None) -> np.ndarray:
+        """Advance one tick with a snapshot (default: source.latest()) and return the (4, 4) int targets"""
+        if snapshot is None and self.source is not None:
+            snapshot = self.source.latest()
+        v_des = self.desired_velocity(snapshot, now)
+        self.vel += np.clip(v_des - self.vel, -self.max_step, self.max_step)
+        self.target += self.vel * self.dt
+
+        # limit 에 닿은 관절은 그 방향 속도를 없앰 (반대로 움직일 때 바로 반응)
+        low, high = self.target < self.lower, self.target > self.upper
+        if low.any() or high.any():
+            np.clip(self.target, self.lower, self.upper, out=self.target)
+            self.vel[(low & (self.vel < 0)) | (high & (self.vel > 0))] = 0.0
+        np.copyto(self.cmd, self.target, casting='unsafe')
+        self.ticks += 1
+        return self.cmd
+
+    def setpoints(self, start, duration: Optional[float] = None) -> Iterator[np.ndarray]:
+        """Yield targets at freq starting from `start` positions (stop() or duration ends it)"""
+        self.reset(start)
+        scheduler = DeadlineScheduler(self.dt, catch_up=CatchUp.SKIP)
+        scheduler.start()
+        t_end = None if duration is None else time.perf_counter() + duration
+        self.running = True
+        while self.running and (t_end is None or time.perf_counter() < t_end):
+            yield self.step()
+            scheduler.wait()
+
+    def run(self, hand, duration: Optional[float] = None) -> None:
+        """Stream to a PCANHandler / HandPort from its measured pose until stop() or duration
+
+        Sends are non-blocking; while the hand is e-stopped they are refused
+        and the bridge keeps following the measured pose, so it resumes
+        without a jump after clear_stop().
+        """
+        for cmd in self.setpoints(hand.get_hand_positions(), duration):
+            if not hand.set_all_targets(cmd):
+                self.reset(hand.get_hand_positions())
+
+    def start(self, hand, duration: Optional[float] = None) -> threading.Thread:
+        """run() in a background thread"""
+        thread = threading.Thread(target=self.run, args=(hand, duration), name="teleop_bridge", daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self) -> None:
+        self.running = False
@@ -0,0 +1,87 @@
+import asyncio
+
+import grpc
+
+from async_pcan import AsyncPCANHandler
+from command_arbiter import CommandArbiter
+from pcan_handler import ServoStatus, ControlMode
+from sim_hand import SimHand
+from Hand_sv_aio import AioHandServicer
+import Hand_pb2
+
+# virtual bus + SimHand 위에서 AioHandServicer 를 직접 호출 (python -m pytest test_hand_sv_aio.py)
+
+CHANNEL = 'test_hand_sv_aio'
+
+
+class FakeContext:
+    def __init__(self, metadata=()):
+        self.metadata = tuple(metadata)
+        self.code = None
+
+    def invocation_metadata(self):
+        return self.metadata
+
+    async def abort(self, code, details):
+        self.code = code
+        raise grpc.RpcError(f"{code}: {details}")
+
+
+async def _wait_motion_after_timeout():
+    sim_hand = SimHand(CHANNEL).start()
+    hand = AsyncPCANHandler(CHANNEL, interface='virtual')
+    await hand.open()
+    arbiter = None
+    try:
+        await hand.set_hand_status(ServoStatus.ON, ControlMode.POSITION)
+        await hand.wait_frame(1, timeout=0.5)
+        arbiter = CommandArbiter(hand)
+        await arbiter.start()
+        servicer = AioHandServicer([arbiter])
+        context = FakeContext()
+
+        response = await servicer.Gesture(Hand_pb2.GestureRequest(gesture=Hand_pb2.GestureRequest.PAPER), context)
+        request = Hand_pb2.MotionRequest(motion_id=response.motion_id, timeout=0.001)
+        status = await servicer.WaitMotion(request, context)
+        assert status.state == Hand_pb2.MotionStatus.RUNNING
+
+        # timeout 뒤에도 motion 은 계속 실행되고, 다음 WaitMotion 이 완료를 받아야 함
+        motion = arbiter.get(response.motion_id)
+        assert not motion.future.cancelled()
+        request = Hand_pb2.MotionRequest(motion_id=response.motion_id, timeout=5.0)
+        status = await servicer.WaitMotion(request, context)
+        assert status.state == Hand_pb2.MotionStatus.DONE, status.message
+    finally:
+        if arbiter is not None:
+            await arbiter.stop()
+        await hand.close()
+        sim_hand.stop()
+
+
+async def _stream_control_bad_hand():
+    # 음수 / 숫자가 아닌 hand metadata 는 다른 손을 움직이지 않고 INVALID_ARGUMENT
+    servicer = AioHandServicer([object(), object()])
+    try:
+        for hand in ('-1', '2', 'left'):
+            context = FakeContext((('hand', hand),))
+            try:
+                await servicer.StreamControl(iter(()), context).__anext__()
+            except grpc.RpcError:
+                pass
+            assert context.code == grpc.StatusCode.INVALID_ARGUMENT, hand
+    finally:
+        servicer.gestures.stop_watch()
+
+
+def test_wait_motion_after_timeout():
+    asyncio.run(_wait_motion_after_timeout())
+
+
+def test_stream_control_bad_hand():
+    asyncio.run(_stream_control_bad_hand())
+
+
+if __name__ == "__main__":
+    test_wait_motion_after_timeout()
+    test_stream_control_bad_hand()
+    print("ok")